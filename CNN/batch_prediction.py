@@ -1,19 +1,72 @@
 import streamlit as st
+import numpy as np
 from pathlib import Path
-from CNN.predict_sign import predict_sign
+from CNN.predict_sign import BATCH_SIZE, classify_crops
 from CNN.components.prediction_card import prediction_card
+from common.crop_store import cached_crops
+from common.hand_detectors import get_hand_detector
+from common.prediction_cache import cache_stats_text, iter_cached_predictions
+from common.result_gallery import page_selector, stream_results
+from common.warmup import wait_for_warmup
 
 
-def get_top3_string(outputs, learn):
-    """Return top-3 predictions as a string."""
-    top3_idx = outputs.argsort(descending=True)[:3]
-    return ", ".join(
-        f"{learn.dls.vocab[i]} ({outputs[i]:.1%})"
-        for i in top3_idx
-    )
+def get_top3(outputs, learn):
+    """Return top-3 (label, probability) pairs."""
+    top3_idx = np.argsort(-np.asarray(outputs))[:3]
+    return [(str(learn.dls.vocab[i]), float(outputs[i])) for i in top3_idx]
 
 
-def batch_prediction(learn):
+def get_top3_string(top3):
+    """Return top-3 predictions as a string."""
+    return ", ".join(f"{label} ({prob:.1%})" for label, prob in top3)
+
+
+def _iter_predict_files(image_files, learn, batch_size, detector):
+    """JSON-serialisable prediction per file (None on failure), batch by batch."""
+    hand_detector = get_hand_detector(detector)
+    for start in range(0, len(image_files), batch_size):
+        # Detections come from the crop store shared with the HOG pipeline
+        crops = cached_crops(
+            image_files[start:start + batch_size], hand_detector,
+            on_error=lambda path, e: st.error(f"Error during prediction: {e}")
+        )
+        for res in classify_crops(crops, learn, batch_size):
+            yield {
+                "prediction": str(res["prediction"]),
+                "confidence": res["confidence"],
+                "top3": get_top3(res["all_probs"], learn),
+                "hand_detected": bool(res["hand_detected"])
+            } if res else None
+
+
+def _result_row(img_path, res, detector):
+    if res:
+        pred = res["prediction"]
+        conf = res["confidence"]
+        top3 = get_top3_string(res["top3"])
+        true_label = img_path.stem.split("_")[0].lower()
+        is_correct = true_label == pred.lower()
+    else:
+        pred, conf, top3 = "ERROR", 0, "N/A"
+        is_correct = False
+
+    return {
+        "path": img_path,
+        "Prediction": pred,
+        "Confidence": f"{conf:.2%}",
+        "Top-3": top3,
+        "is_correct": is_correct,
+        "detector": detector
+    }
+
+
+def batch_prediction(learn, batch_size=BATCH_SIZE, detector="yolo", model_file=None,
+                     warmup=None):
+    """
+    model_file: path of the learner's weights; when given, per-image results
+    are served from / stored in the on-disk prediction cache.
+    warmup: name of a common.warmup warm-up to wait for before the first batch
+    """
 
     # ============================
     # Paths & validation
@@ -34,46 +87,46 @@ def batch_prediction(learn):
         return
 
     # ============================
-    # Batch prediction
+    # Layout: header and cache info are filled in once the run finishes
     # ============================
-    results = []
-    correct_count = 0
-
-    for img_path in image_files:
-        res = predict_sign(img_path, learn)
-
-        if res:
-            pred = res["prediction"]
-            conf = res["confidence"]
-            top3 = get_top3_string(res["all_probs"], learn)
-            true_label = img_path.stem.split("_")[0].lower()
-            is_correct = true_label == pred.lower()
-            if is_correct:
-                correct_count += 1
-        else:
-            pred, conf, top3 = "ERROR", 0, "N/A"
-            is_correct = False
-
-        results.append({
-            "path": img_path,
-            "Prediction": pred,
-            "Confidence": f"{conf:.2%}",
-            "Top-3": top3,
-            "is_correct": is_correct
-        })
+    header = st.empty()
+    cache_caption = st.empty()
+    st.divider()
+    page = page_selector(len(image_files), key="cnn_batch_page")
+
+    # ============================
+    # Batch prediction (streamed into the current page)
+    # ============================
+    def compute(paths):
+        # Not before: the page is drawn while the model warms up
+        if warmup:
+            wait_for_warmup(warmup)
+        return _iter_predict_files(paths, learn, batch_size, detector)
+
+    cache_stats = {}
+    if model_file:
+        detector_key = get_hand_detector(detector).cache_key()
+        pairs = iter_cached_predictions(image_files, model_file, detector_key, compute,
+                                        stats=cache_stats)
+    else:
+        pairs = enumerate(compute(image_files))
+
+    results = stream_results(
+        pairs, len(image_files),
+        lambda i, res: _result_row(image_files[i], res, detector),
+        prediction_card, page
+    )
 
     # ============================
     # Accuracy
     # ============================
+    correct_count = sum(r["is_correct"] for r in results)
     acc = correct_count / len(image_files) * 100
 
-    
-
     # ============================
     # Header row (space-between)
     # ============================
-    
-    st.html(f"""
+    header.html(f"""
 <div style="
     display: flex;
     align-items: center;
@@ -111,10 +164,5 @@ def batch_prediction(learn):
 </div>
 """)
 
-    st.divider()
-
-    # ============================
-    # Display predictions
-    # ============================
-    for idx, result in enumerate(results):
-        prediction_card(result)
\ No newline at end of file
+    if cache_stats:
+        cache_caption.caption(cache_stats_text(cache_stats))
@@ -1,9 +1,30 @@
 import streamlit as st
 import cv2
-import numpy as np
 from CNN.predict_sign import predict_sign
+from common.frame_display import FrameDisplay
+from common.hand_detectors import create_hand_detector
+from common.gesture_smoother import CAMERA_SMOOTHING, GestureSmoother
+from common.motion_gate import MotionGate
+from common.stage_timing import StageTimer
+from common.threaded_capture import LatestFrameCapture
+from common.warmup import wait_for_warmup
+
+# Refresh the capture counters every N processed frames
+STATS_EVERY = 15
+
+def camera(learn, tracking=True, warmup=None):
+    """
+    warmup: name of a common.warmup warm-up to wait for before the first frame
+    """
+    # Per-stage latencies, kept across reruns of this session
+    if "cnn_stage_timer" not in st.session_state:
+        st.session_state.cnn_stage_timer = StageTimer()
+    timer = st.session_state.cnn_stage_timer
+    if "cnn_gesture_smoother" not in st.session_state:
+        st.session_state.cnn_gesture_smoother = GestureSmoother(
+            classes=learn.dls.vocab, **CAMERA_SMOOTHING)
+    smoother = st.session_state.cnn_gesture_smoother
 
-def camera(learn):
     # Create two columns: one for video, one for predictions
     col_video, col_predictions = st.columns([2, 1])
     
@@ -17,126 +38,161 @@ def camera(learn):
         alt_predictions = st.empty()
     
     status_text = st.empty()
+    stats_text = st.empty()
+    with st.expander("⏱ Stage latency"):
+        perf_panel = st.empty()
 
     if st.session_state.camera_running:
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        if warmup:
+            wait_for_warmup(warmup)
+        # Capture runs on its own thread and only hands over the newest frame
+        cap = LatestFrameCapture(0, width=1280, height=720)
         status_text.info("📹 Camera running... Press 'Stop Camera' to exit.")
+        frame_count = 0
+        # Frames go out at most at the display FPS cap, downscaled and JPEG-encoded
+        display = FrameDisplay(FRAME_WINDOW)
+        # Reuse the last prediction while the signer holds still
+        gate = MotionGate()
+        # The tracked hand ROI belongs to this stream only
+        detector = create_hand_detector("mediapipe_track" if tracking else "mediapipe")
+
+        # Streamlit stops a rerun by raising inside the loop; always free the camera
+        try:
+            timer.activate()
+            while st.session_state.camera_running and cap.isOpened():
+                ret, frame, captured_at = cap.read()
+                timer.lap("capture")
+                if not ret:
+                    status_text.error("Failed to read from camera")
+                    break
+
+                # --- Prediction ---
+                inferred = gate.inferred
+                res = gate.run(
+                    frame,
+                    lambda f: predict_sign(f, learn, detector=detector)
+                )
+                timer.lap("predict")
+
+                pred_class = "N/A"
+                confidence = 0
+                hand_bbox = None
+                hand_detected = False
+                top_predictions = []
+                all_probs = None
+
+                if res:
+                    pred_class = res.get("prediction", "N/A")
+                    confidence = res.get("confidence", 0) * 100
+                    hand_detected = res.get("hand_detected", True)
+                    hand_bbox = res.get("hand_bbox", None)
+                    # Get top predictions if available
+                    top_predictions = res.get("top_predictions", [])
+                    all_probs = res.get("all_probs")
+
+                # --- Gesture lock over the last frames (CAMERA_SMOOTHING) ---
+                locked_pred, locked_conf = smoother.push(pred_class, confidence, all_probs)
+
+                frame_count += 1
+                if frame_count % STATS_EVERY == 0:
+                    stats_text.caption(
+                        f"{cap.stats_text()} · {gate.stats_text()} · {display.stats_text()}"
+                    )
+                    perf_panel.markdown(timer.panel_markdown())
+
+                # Inference keeps its own rate; the display is throttled
+                if not display.due():
+                    timer.frame_done(hand=bool(hand_detected), reused=gate.inferred == inferred,
+                                     shown=False)
+                    continue
+
+                # --- Hand-centered framing ---
+                if hand_bbox:
+                    x, y, w, h = hand_bbox
+                    pad = 30
+                    x1 = max(0, x - pad)
+                    y1 = max(0, y - pad)
+                    x2 = min(frame.shape[1], x + w + pad)
+                    y2 = min(frame.shape[0], y + h + pad)
+                    frame_cropped = frame[y1:y2, x1:x2]
+                else:
+                    frame_cropped = frame
+
+                # Mirror for user
+                frame_display = cv2.flip(frame_cropped, 1)
+
+                # --- Draw overlay ---
+                color = (
+                    (0, 255, 0) if locked_conf >= 90
+                    else (0, 165, 255) if locked_conf >= 75
+                    else (255, 0, 0)
+                )
+                status_icon = "✓" if hand_detected else "⚠"
+                cv2.putText(frame_display,
+                            f"{status_icon} {locked_pred} ({locked_conf:.1f}%)",
+                            (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+
+                # Confidence bar
+                bar_width = int(frame_display.shape[1] * locked_conf / 100)
+                cv2.rectangle(frame_display, (0, frame_display.shape[0]-20),
+                              (bar_width, frame_display.shape[0]-10),
+                              color, -1)
+                cv2.rectangle(frame_display, (0, frame_display.shape[0]-20),
+                              (frame_display.shape[1], frame_display.shape[0]-10),
+                              (200, 200, 200), 2)
+                timer.lap("overlay")
+
+                display.show(frame_display)
+                cap.record_display(captured_at)
+                timer.lap("display")
+
+                # --- Update predictions display ---
+                # Main prediction
+                conf_color = "green" if locked_conf >= 90 else "orange" if locked_conf >= 75 else "red"
+                main_prediction.markdown(f"""
+                <div style="
+                    border: 3px solid {conf_color};
+                    border-radius: 10px;
+                    padding: 20px;
+                    text-align: center;
+                    background-color: #f8f9fa;
+                    margin-bottom: 20px;
+                ">
+                    <h1 style="margin: 0; color: #333;">{locked_pred}</h1>
+                    <h3 style="margin: 10px 0 0 0; color: {conf_color};">{locked_conf:.1f}%</h3>
+                </div>
+                """, unsafe_allow_html=True)
+
+                # Top 3 alternatives
+                if top_predictions and len(top_predictions) > 1:
+                    alt_html = ""
+                    for i, (label, conf) in enumerate(top_predictions[1:4], 1):  # Skip first (main), take next 3
+                        alt_html += f"""
+                        <div style="
+                            border: 1px solid #ddd;
+                            border-radius: 8px;
+                            padding: 12px;
+                            margin-bottom: 10px;
+                            background-color: white;
+                            display: flex;
+                            justify-content: space-between;
+                            align-items: center;
+                        ">
+                            <span style="font-weight: 600; font-size: 1.1rem;">{i}. {label}</span>
+                            <span style="color: #666; font-size: 0.95rem;">{conf * 100:.1f}%</span>
+                        </div>
+                        """
+                    alt_predictions.markdown(alt_html, unsafe_allow_html=True)
+                else:
+                    alt_predictions.markdown("*No alternative predictions available*")
+                timer.lap("ui")
+                timer.frame_done(hand=bool(hand_detected), reused=gate.inferred == inferred,
+                                 shown=True)
+        finally:
+            timer.deactivate()
+            detector.close()
+            cap.release()
 
-        while st.session_state.camera_running and cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                status_text.error("Failed to read from camera")
-                break
-
-            # --- Prediction ---
-            res = predict_sign(frame, learn, "cam")
-
-            pred_class = "N/A"
-            confidence = 0
-            hand_bbox = None
-            hand_detected = False
-            top_predictions = []
-
-            if res:
-                pred_class = res.get("prediction", "N/A")
-                confidence = res.get("confidence", 0) * 100
-                hand_detected = res.get("hand_detected", True)
-                hand_bbox = res.get("hand_bbox", None)
-                # Get top predictions if available
-                top_predictions = res.get("top_predictions", [])
-
-            # --- Gesture lock buffer (last 5 frames) ---
-            buffer = st.session_state.gesture_buffer
-            buffer.append((pred_class, confidence))
-            if len(buffer) > 5:
-                buffer.pop(0)
-
-            # Take the most frequent prediction in buffer
-            locked_pred = max(set([p[0] for p in buffer]), key=[p[0] for p in buffer].count)
-            locked_conf = np.mean([p[1] for p in buffer])
-
-            # --- Hand-centered framing ---
-            if hand_bbox:
-                x, y, w, h = hand_bbox
-                pad = 30
-                x1 = max(0, x - pad)
-                y1 = max(0, y - pad)
-                x2 = min(frame.shape[1], x + w + pad)
-                y2 = min(frame.shape[0], y + h + pad)
-                frame_cropped = frame[y1:y2, x1:x2]
-            else:
-                frame_cropped = frame
-
-            # Mirror for user
-            frame_display = cv2.flip(frame_cropped, 1)
-
-            # --- Draw overlay ---
-            color = (
-                (0, 255, 0) if locked_conf >= 90
-                else (0, 165, 255) if locked_conf >= 75
-                else (255, 0, 0)
-            )
-            status_icon = "✓" if hand_detected else "⚠"
-            cv2.putText(frame_display,
-                        f"{status_icon} {locked_pred} ({locked_conf:.1f}%)",
-                        (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
-
-            # Confidence bar
-            bar_width = int(frame_display.shape[1] * locked_conf / 100)
-            cv2.rectangle(frame_display, (0, frame_display.shape[0]-20),
-                          (bar_width, frame_display.shape[0]-10),
-                          color, -1)
-            cv2.rectangle(frame_display, (0, frame_display.shape[0]-20),
-                          (frame_display.shape[1], frame_display.shape[0]-10),
-                          (200, 200, 200), 2)
-
-            FRAME_WINDOW.image(cv2.cvtColor(frame_display, cv2.COLOR_BGR2RGB),
-                               channels="RGB",
-                               use_container_width=True)
-
-            # --- Update predictions display ---
-            # Main prediction
-            conf_color = "green" if locked_conf >= 90 else "orange" if locked_conf >= 75 else "red"
-            main_prediction.markdown(f"""
-            <div style="
-                border: 3px solid {conf_color};
-                border-radius: 10px;
-                padding: 20px;
-                text-align: center;
-                background-color: #f8f9fa;
-                margin-bottom: 20px;
-            ">
-                <h1 style="margin: 0; color: #333;">{locked_pred}</h1>
-                <h3 style="margin: 10px 0 0 0; color: {conf_color};">{locked_conf:.1f}%</h3>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Top 3 alternatives
-            if top_predictions and len(top_predictions) > 1:
-                alt_html = ""
-                for i, (label, conf) in enumerate(top_predictions[1:4], 1):  # Skip first (main), take next 3
-                    alt_html += f"""
-                    <div style="
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        padding: 12px;
-                        margin-bottom: 10px;
-                        background-color: white;
-                        display: flex;
-                        justify-content: space-between;
-                        align-items: center;
-                    ">
-                        <span style="font-weight: 600; font-size: 1.1rem;">{i}. {label}</span>
-                        <span style="color: #666; font-size: 0.95rem;">{conf * 100:.1f}%</span>
-                    </div>
-                    """
-                alt_predictions.markdown(alt_html, unsafe_allow_html=True)
-            else:
-                alt_predictions.markdown("*No alternative predictions available*")
-
-        cap.release()
         st.session_state.camera_running = False
     else:
         status_text.success("Click 'Start Camera' to begin.")
\ No newline at end of file
@@ -1,4 +1,6 @@
 import streamlit as st
+from common.thumbnails import hand_preview, thumbnail
+
 
 def prediction_card(result):
     status = "Correct" if result["is_correct"] else "Incorrect"
@@ -20,8 +22,9 @@ def prediction_card(result):
                 justify-content: center;
             ">
             """)
-            st.image(result["path"], width=190)
+            st.image(thumbnail(result["path"]), width=190)
             st.html("</div>")
+            hand_preview(result)
 
         # 📄 CONTENT
         with col_content:
@@ -1,102 +1,129 @@
 from pathlib import Path
 import cv2
 import numpy as np
+import threading
 import time
 
 # ===========================================
 # YOLOv8 HAND DETECTOR
 # ===========================================
 class YOLOv8HandDetector:
-    def __init__(self, model_path="hand_detection_yolo/yolo11n.pt"):
+    def __init__(self, model_path="hand_detection_yolo/yolo11n.pt", imgsz=640):
+        """
+        model_path: .pt weights or a model exported by CNN.yolo_export
+                    (.onnx file / *_openvino_model folder)
+        imgsz: inference input size; exported models only accept the size
+               they were exported at
+        """
+        self.imgsz = imgsz
+        # Exported models have a fixed batch size of 1
+        self.batched = str(model_path).endswith(".pt")
         try:
             from ultralytics import YOLO
-            self.model = YOLO(model_path)
+            # Exported models do not record their task
+            self.model = YOLO(model_path, task="detect")
             self.available = True
             print(f"✓ YOLOv8 Hand Detection loaded: {model_path}")
         except Exception as e:
             self.available = False
             print(f"✗ YOLOv8 Hand Detection not available: {e}")
-    
-    def detect(self, image_input):
-        """
-        image_input: either file path (str/Path) or numpy array
-        """
-        if not self.available:
-            return None
 
-        # --- accept path or array ---
+    @staticmethod
+    def _read(image_input):
+        """Path or array -> BGR array (arrays are used as-is, not copied)."""
         if isinstance(image_input, (str, Path)):
             img = cv2.imread(str(image_input))
             if img is None:
                 raise FileNotFoundError(f"Could not read image: {image_input}")
-        else:
-            img = image_input.copy()
-            if img is None or img.size == 0:
-                raise ValueError("Empty image array provided")
-
-        start_time = time.time()
-        results = self.model(img, conf=0.25, verbose=False)
-        inference_time = time.time() - start_time
-
-        hand_boxes = []
-        output_img = img.copy()
-        for result in results:
-            if result.boxes is not None:
-                for box in result.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                    conf = float(box.conf[0].cpu().numpy())
-
-                    cv2.rectangle(output_img, (x1, y1), (x2, y2), (0, 255, 255), 2)
-                    cv2.putText(output_img, f"Hand: {conf:.2f}", 
-                                (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                0.6, (0, 255, 255), 2)
-
-                    hand_boxes.append({
-                        'bbox': [x1, y1, x2, y2],
-                        'confidence': conf
-                    })
-
-
-     
+            return img
+        if image_input is None or image_input.size == 0:
+            raise ValueError("Empty image array provided")
+        return image_input
 
+    def _result(self, result, inference_time):
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            xyxy = np.empty((0, 4), dtype=np.int32)
+            conf = np.empty(0, dtype=np.float32)
+        else:
+            # One device->host copy per image, not per box
+            xyxy = boxes.xyxy.cpu().numpy().astype(np.int32)
+            conf = boxes.conf.cpu().numpy().astype(np.float32)
         return {
             'model': 'YOLOv8 Hand Detection',
-            'num_hands_detected': len(hand_boxes),
-            'hands': hand_boxes,
+            'num_hands_detected': len(xyxy),
+            'boxes': xyxy,                   # (N, 4) x1, y1, x2, y2
+            'confidences': conf,             # (N,)
             'inference_time': inference_time,
         }
 
+    def detect(self, image_input):
+        """
+        image_input: either file path (str/Path) or numpy array (BGR)
+        """
+        if not self.available:
+            return None
+
+        img = self._read(image_input)
+        start_time = time.perf_counter()
+        results = self.model(img, conf=0.25, imgsz=self.imgsz, verbose=False)
+        inference_time = time.perf_counter() - start_time
+        return self._result(results[0], inference_time)
+
+    def detect_batch(self, images):
+        """
+        detect() for a list of paths / arrays with one model call; each
+        result gets an equal share of the batch's inference time.
+        """
+        if not self.available:
+            return [None] * len(images)
+        if not self.batched:
+            return [self.detect(image) for image in images]
+
+        imgs = [self._read(image) for image in images]
+        if not imgs:
+            return []
+        start_time = time.perf_counter()
+        results = self.model(imgs, conf=0.25, imgsz=self.imgsz, verbose=False)
+        per_image = (time.perf_counter() - start_time) / len(imgs)
+        return [self._result(r, per_image) for r in results]
+
 # ===========================================
 # CROPPING FUNCTION
 # ===========================================
-detector = YOLOv8HandDetector("hand_detection_yolo/yolo11n.pt")
+YOLO_MODEL_FILE = "hand_detection_yolo/yolo11n.pt"
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector():
+    """Shared YOLO detector, loaded on first use rather than at import."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = YOLOv8HandDetector(YOLO_MODEL_FILE)
+    return _detector
 
-def crop_hand(image, detector=detector, pad=20, output_path=None):
+
+def crop_hand(image, detector=None, pad=20, output_path=None):
     """
     Detect and crop hand from image using YOLO.
-    Returns cropped BGR image and hand_detected flag.
+    Returns cropped BGR image and hand_detected flag. Array inputs are not
+    copied: the crop is a view of the caller's image.
 
     Picks the hand with the highest confidence if multiple hands are detected.
     """
     if detector is None:
-        raise ValueError("A YOLO hand detector instance is required.")
-
-    # Load image if path
-    if isinstance(image, (str, Path)):
-        img = cv2.imread(str(image))
-        if img is None:
-            raise FileNotFoundError(f"Could not read image: {image}")
-    else:
-        img = image.copy()
-        if img is None or img.size == 0:
-            raise ValueError("Empty image array provided")
+        detector = get_detector()
 
+    img = YOLOv8HandDetector._read(image)
     result = detector.detect(img)
 
     if result and result['num_hands_detected'] > 0:
         # Pick the hand with the highest confidence
-        best_hand = max(result['hands'], key=lambda h: h['confidence'])
-        x1, y1, x2, y2 = best_hand['bbox']
+        x1, y1, x2, y2 = result['boxes'][result['confidences'].argmax()].tolist()
 
         # Add padding & clamp to image dimensions
         h, w, _ = img.shape
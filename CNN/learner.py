@@ -0,0 +1,23 @@
+import pathlib
+import platform
+
+CNN_MODEL_FILE = "CNN/weights/arabic_sign_resnet342.pkl"
+
+
+def read_learner(path=CNN_MODEL_FILE):
+    """
+    load_learner on CPU (no Streamlit dependency).
+    An exported .onnx model loads as CNN.onnx_model.OnnxLearner instead.
+    """
+    if str(path).endswith(".onnx"):
+        from CNN.onnx_model import OnnxLearner
+        return OnnxLearner(path)
+
+    # Learners exported on Linux pickle PosixPath objects
+    if platform.system() == "Windows":
+        pathlib.PosixPath = pathlib.WindowsPath
+
+    # fastai/torch are only imported once the CNN model is actually needed
+    from fastai.vision.all import load_learner
+
+    return load_learner(path, cpu=True)
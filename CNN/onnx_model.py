@@ -0,0 +1,207 @@
+"""
+ONNX export of the fastai sign classifier and an ONNX Runtime (CPU)
+learner that stands in for it.
+
+    python -m CNN.onnx_model [--model-file CNN/weights/arabic_sign_resnet342.pkl]
+                             [--output CNN/weights/arabic_sign_resnet342.onnx]
+
+The exported graph takes a uint8 (N, H, W, 3) batch at the learner's input
+size and returns class probabilities: the /255, the ImageNet normalization
+and the softmax are part of the graph. The resize stays in Python (PIL, the
+same calls fastai's Resize makes) and is described, with dls.vocab, in a
+JSON sidecar next to the .onnx file.
+
+OnnxLearner has the parts of the fastai Learner the app uses (dls.vocab,
+predict) plus predict_batch, so CNN.predict_sign runs on either.
+"""
+import argparse
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from CNN.learner import CNN_MODEL_FILE
+
+ONNX_MODEL_FILE = str(Path(CNN_MODEL_FILE).with_suffix(".onnx"))
+# Written by python -m CNN.quantize
+INT8_MODEL_FILE = str(Path(CNN_MODEL_FILE).with_suffix(".int8.onnx"))
+OPSET = 17
+
+# fastai PadMode -> numpy.pad mode (torchvision's "reflect" is numpy's)
+PAD_MODES = {"zeros": "constant", "border": "edge", "reflection": "reflect"}
+
+
+def sidecar_path(onnx_path):
+    return str(Path(onnx_path).with_suffix(".json"))
+
+
+# ===========================================
+# PREPROCESSING
+# ===========================================
+def preprocessing_config(learn):
+    """Inference-time preprocessing of a fastai learner as plain values."""
+    from fastai.vision.all import IntToFloatTensor, Normalize, Resize, ToTensor
+
+    resize = [t for t in learn.dls.after_item.fs if isinstance(t, Resize)]
+    if not resize:
+        raise ValueError("the learner has no Resize item transform to export")
+    resize = resize[0]
+    normalize = [t for t in learn.dls.after_batch.fs if isinstance(t, Normalize)]
+
+    known = (Resize, ToTensor, IntToFloatTensor, Normalize)
+    others = [type(t).__name__ for t in (*learn.dls.after_item.fs, *learn.dls.after_batch.fs)
+              if not isinstance(t, known)]
+
+    return {
+        "size": [int(s) for s in resize.size],          # (width, height)
+        "method": str(resize.method),                   # crop / pad / squish
+        "pad_mode": str(resize.pad_mode),
+        "resample": int(resize.mode),                   # PIL resampling filter
+        "mean": normalize[0].mean.flatten().tolist() if normalize else [0.0, 0.0, 0.0],
+        "std": normalize[0].std.flatten().tolist() if normalize else [1.0, 1.0, 1.0],
+        # Not reproduced; the parity benchmark shows whether that matters
+        "ignored_transforms": others,
+    }
+
+
+def _crop_pad(img, sz, tl, pad_mode):
+    """fastai's crop_pad for a PIL image: crop to the box, pad what lies outside."""
+    w, h = img.size
+    x1, y1 = max(tl[0], 0), max(tl[1], 0)
+    x2, y2 = min(tl[0] + sz[0], w), min(tl[1] + sz[1], h)
+    if (x1, y1, x2, y2) != (0, 0, w, h):
+        img = img.crop((x1, y1, x2, y2))
+
+    pads = (max(-tl[0], 0), max(-tl[1], 0),
+            max(tl[0] + sz[0] - w, 0), max(tl[1] + sz[1] - h, 0))
+    if any(pads):
+        left, top, right, bottom = pads
+        arr = np.asarray(img)
+        widths = ((top, bottom), (left, right)) + ((0, 0),) * (arr.ndim - 2)
+        img = Image.fromarray(np.pad(arr, widths, mode=PAD_MODES[pad_mode]))
+    return img
+
+
+def fastai_resize(img, size, method="crop", pad_mode="reflection", resample=Image.BILINEAR):
+    """Resize exactly as fastai's Resize does at inference (centre crop / pad / squish)."""
+    w, h = img.size
+    sw, sh = size
+    if method == "squish":
+        return img.resize((sw, sh), resample)
+
+    # crop keeps the smaller ratio (fills the target), pad the larger (fits it)
+    pick = max if method == "pad" else min
+    m = pick(w / sw, h / sh)
+    cp = (int(m * sw), int(m * sh))
+    tl = (int(0.5 * (w - cp[0])), int(0.5 * (h - cp[1])))
+    return _crop_pad(img, cp, tl, pad_mode).resize((sw, sh), resample)
+
+
+def to_pil(item):
+    """What PILImage.create does with the inputs the app passes in."""
+    if isinstance(item, Image.Image):
+        return item
+    if isinstance(item, np.ndarray):
+        return Image.fromarray(item)
+    return Image.open(item).convert("RGB")
+
+
+# ===========================================
+# EXPORT
+# ===========================================
+def export_onnx(learn, output=ONNX_MODEL_FILE, opset=OPSET):
+    """Write the learner's model (+ normalization and softmax) and its sidecar."""
+    import torch
+
+    config = preprocessing_config(learn)
+
+    class Exported(torch.nn.Module):
+        def __init__(self, model, mean, std):
+            super().__init__()
+            self.model = model
+            # Folds the /255 of IntToFloatTensor into the normalization
+            self.register_buffer("mean", torch.tensor(mean).view(1, 3, 1, 1) * 255.0)
+            self.register_buffer("std", torch.tensor(std).view(1, 3, 1, 1) * 255.0)
+
+        def forward(self, x):
+            x = x.permute(0, 3, 1, 2).float()
+            return torch.softmax(self.model((x - self.mean) / self.std), dim=1)
+
+    model = Exported(learn.model.eval().cpu(), config["mean"], config["std"]).eval()
+    w, h = config["size"]
+    dummy = torch.zeros(1, h, w, 3, dtype=torch.uint8)
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        model, dummy, output,
+        input_names=["image"], output_names=["probs"],
+        dynamic_axes={"image": {0: "batch"}, "probs": {0: "batch"}},
+        opset_version=opset,
+    )
+
+    with open(sidecar_path(output), "w", encoding="utf-8") as f:
+        json.dump({**config, "vocab": [str(v) for v in learn.dls.vocab],
+                   "input": "uint8 NHWC, RGB as given", "opset": opset}, f, indent=2)
+    return output
+
+
+# ===========================================
+# ONNX RUNTIME LEARNER
+# ===========================================
+class OnnxLearner:
+    """Duck-typed stand-in for the fastai Learner, running on ONNX Runtime (CPU)."""
+    backend = "onnxruntime"
+
+    def __init__(self, path=ONNX_MODEL_FILE, threads=None, sidecar=None):
+        import onnxruntime as ort
+
+        with open(sidecar or sidecar_path(path), encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.dls = SimpleNamespace(vocab=self.config["vocab"])
+        self.path = str(path)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(self.path, options,
+                                            providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def preprocess(self, items):
+        """uint8 (N, H, W, 3) batch at the model's input size."""
+        c = self.config
+        return np.stack([
+            np.asarray(fastai_resize(to_pil(item), c["size"], c["method"],
+                                     c["pad_mode"], c["resample"]).convert("RGB"))
+            for item in items
+        ])
+
+    def predict_batch(self, items):
+        """(N, n_classes) float32 probabilities."""
+        return self.session.run(None, {self.input_name: self.preprocess(items)})[0]
+
+    def predict(self, item):
+        """Same triple as Learner.predict: (label, index, probabilities)."""
+        probs = self.predict_batch([item])[0]
+        idx = int(probs.argmax())
+        return self.dls.vocab[idx], idx, probs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-file", default=CNN_MODEL_FILE)
+    parser.add_argument("--output", default=ONNX_MODEL_FILE)
+    parser.add_argument("--opset", type=int, default=OPSET)
+    args = parser.parse_args()
+
+    from CNN.learner import read_learner
+
+    output = export_onnx(read_learner(args.model_file), args.output, args.opset)
+    print(f"✓ Exported {args.model_file} → {output} (+ {sidecar_path(output)})")
+
+
+if __name__ == "__main__":
+    main()
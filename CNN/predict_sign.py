@@ -1,20 +1,39 @@
 
-from CNN.crop_hand import crop_hand
-from CNN.crop_hand_cam import crop_hand_cam
-from fastai.vision.all import PILImage
+import time
+
+from common.hand_detectors import resolve_detector
+from common.stage_timing import timed
 import streamlit as st
 
+# Images per forward pass in predict_sign_batch
+BATCH_SIZE = 16
+
+
+def _crop(image, mode, detector=None):
+    return resolve_detector(detector, mode).crop(image)
+
 
-def predict_sign(image, learn, mode="batch"):
-    """Predict sign language from image or frame"""
+def predict_crop(crop, learn):
+    """learn.predict on one crop: (label, index, probabilities)."""
+    if hasattr(learn, "predict_batch"):
+        # ONNX Runtime learner (CNN.onnx_model): takes arrays, no fastai needed
+        return learn.predict(crop)
+    from fastai.vision.all import PILImage
+    return learn.predict(PILImage.create(crop))
+
+
+def predict_sign(image, learn, mode="batch", detector=None):
+    """
+    Predict sign language from image or frame.
+    mode: "batch" (YOLO) or "cam" (MediaPipe per frame)
+    detector: name of a registered hand detector backend, or a backend
+              instance (a stream's own tracker); overrides mode
+    """
     try:
-        if mode == "batch":
-            cropped_img, hand_detected = crop_hand(image)
-        if mode == "cam":
-            cropped_img, hand_detected = crop_hand_cam(image)
-        
-        pil_img = PILImage.create(cropped_img)
-        pred_class, pred_idx, outputs = learn.predict(pil_img)
+        cropped_img, hand_detected = _crop(image, mode, detector)
+
+        with timed("classify"):
+            pred_class, pred_idx, outputs = predict_crop(cropped_img, learn)
         return {
             'prediction': pred_class,
             'confidence': float(outputs[pred_idx]),
@@ -25,3 +44,103 @@ def predict_sign(image, learn, mode="batch"):
     except Exception as e:
         st.error(f"Error during prediction: {e}")
         return None
+
+
+def _forward(crops, learn):
+    """One forward pass over a list of crops; returns the (N, n_classes) probabilities."""
+    if hasattr(learn, "predict_batch"):
+        return learn.predict_batch(crops)
+
+    from fastai.vision.all import PILImage
+    pil_imgs = [PILImage.create(c) for c in crops]
+    # test_dl applies the same item/batch transforms learn.predict uses
+    dl = learn.dls.test_dl(pil_imgs, bs=len(pil_imgs), num_workers=0)
+    with learn.no_bar():
+        probs, _ = learn.get_preds(dl=dl)
+    return probs
+
+
+def predict_sign_batch(images, learn, mode="batch", batch_size=BATCH_SIZE, detector=None):
+    """
+    Batched counterpart of predict_sign for many images.
+    Crops every image, then classifies the crops batch_size at a time with a
+    single forward pass per batch. Returns one result per input, in order,
+    with the same keys as predict_sign (None where the image failed).
+    """
+    if batch_size == "auto":
+        batch_size = auto_batch_size(learn, images, mode, detector=detector)
+
+    results = []
+    for start in range(0, len(images), batch_size):
+        chunk = images[start:start + batch_size]
+
+        crops = []
+        for image in chunk:
+            try:
+                crops.append(_crop(image, mode, detector))
+            except Exception as e:
+                st.error(f"Error during prediction: {e}")
+                crops.append(None)
+
+        results.extend(classify_crops(crops, learn, batch_size))
+
+    return results
+
+
+def classify_crops(crops, learn, batch_size=BATCH_SIZE):
+    """
+    Second half of predict_sign_batch for crops that are already available
+    (e.g. from the crop store): crops is a list of (crop, hand_detected) or
+    None, results are aligned with it.
+    """
+    results = []
+    for start in range(0, len(crops), batch_size):
+        chunk = crops[start:start + batch_size]
+
+        valid = [c for c in chunk if c is not None]
+        if not valid:
+            results.extend(chunk)
+            continue
+
+        try:
+            probs = _forward([c[0] for c in valid], learn)
+        except Exception as e:
+            st.error(f"Error during prediction: {e}")
+            results.extend([None] * len(chunk))
+            continue
+
+        row = 0
+        for crop in chunk:
+            if crop is None:
+                results.append(None)
+                continue
+            outputs = probs[row]
+            row += 1
+            pred_idx = int(outputs.argmax())
+            results.append({
+                'prediction': learn.dls.vocab[pred_idx],
+                'confidence': float(outputs[pred_idx]),
+                'all_probs': outputs,
+                'cropped_image': crop[0],
+                'hand_detected': crop[1]
+            })
+
+    return results
+
+
+def auto_batch_size(learn, images, mode="batch", candidates=(1, 4, 8, 16, 32, 64),
+                    detector=None):
+    """Pick the batch size with the best images/sec on a sample of the input."""
+    if not images:
+        return candidates[0]
+    sample = [_crop(images[0], mode, detector)[0]] * max(candidates)
+    _forward(sample[:1], learn)  # warm-up
+
+    best, best_rate = candidates[0], 0.0
+    for bs in candidates:
+        start = time.perf_counter()
+        _forward(sample[:bs], learn)
+        rate = bs / (time.perf_counter() - start)
+        if rate > best_rate:
+            best, best_rate = bs, rate
+    return best
@@ -0,0 +1,108 @@
+"""
+Post-training INT8 quantization of the exported CNN (ONNX Runtime).
+
+    python -m CNN.quantize [--onnx CNN/weights/arabic_sign_resnet342.onnx]
+                           [--output CNN/weights/arabic_sign_resnet342.int8.onnx]
+                           [--mode static|dynamic] [--calibration example_signs]
+                           [--detector yolo] [--max-images 300]
+
+static (default) calibrates activation ranges on cropped hands: the images
+in --calibration go through the hand detector (served from the crop store
+when possible) and the learner's own preprocessing. Weights are quantized
+per channel, in QDQ format. dynamic needs no calibration data but only
+quantizes the weights of the convolutions and the final linear layer.
+
+The quantized model takes the same input as the FP32 one and gets a copy of
+its sidecar, so it loads with read_learner / OnnxLearner like any .onnx file.
+"""
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from CNN.onnx_model import INT8_MODEL_FILE, ONNX_MODEL_FILE, OnnxLearner, sidecar_path
+from common.crop_store import cached_crops
+from common.hand_detectors import available_detectors, get_hand_detector
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+# Crops per calibration batch
+CALIBRATION_BATCH = 8
+
+
+def calibration_crops(folder, detector="yolo", max_images=300):
+    """Cropped hands from a folder (images without a detected hand are left out)."""
+    paths = sorted(str(p) for p in Path(folder).rglob("*")
+                   if p.suffix.lower() in IMAGE_SUFFIXES)[:max_images]
+    crops = cached_crops(paths, get_hand_detector(detector))
+    return [c[0] for c in crops if c is not None and c[1]]
+
+
+class CropCalibrationReader:
+    """CalibrationDataReader over preprocessed crop batches."""
+
+    def __init__(self, learn, crops, batch_size=CALIBRATION_BATCH):
+        self._batches = iter([
+            {learn.input_name: learn.preprocess(crops[i:i + batch_size])}
+            for i in range(0, len(crops), batch_size)
+        ])
+
+    def get_next(self):
+        return next(self._batches, None)
+
+
+def quantize(onnx_path=ONNX_MODEL_FILE, output=INT8_MODEL_FILE, mode="static",
+             calibration="example_signs", detector="yolo", max_images=300):
+    """Write an INT8 copy of onnx_path (and its sidecar); returns the output path."""
+    from onnxruntime.quantization import (QuantFormat, QuantType, quantize_dynamic,
+                                          quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    if mode == "dynamic":
+        quantize_dynamic(onnx_path, output, weight_type=QuantType.QInt8)
+    else:
+        crops = calibration_crops(calibration, detector, max_images)
+        if not crops:
+            raise ValueError(f"no hands found in {calibration} to calibrate on")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Shape inference + graph cleanup give better quantized graphs
+            prepared = os.path.join(tmp, "prepared.onnx")
+            quant_pre_process(onnx_path, prepared)
+            quantize_static(
+                prepared, output,
+                CropCalibrationReader(OnnxLearner(onnx_path), crops),
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+            )
+
+    with open(sidecar_path(onnx_path), encoding="utf-8") as f:
+        config = json.load(f)
+    config["quantization"] = {"mode": mode, "source": str(onnx_path),
+                              "calibration": None if mode == "dynamic" else str(calibration)}
+    with open(sidecar_path(output), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--onnx", default=ONNX_MODEL_FILE, help="FP32 model (python -m CNN.onnx_model)")
+    parser.add_argument("--output", default=INT8_MODEL_FILE)
+    parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+    parser.add_argument("--calibration", default="example_signs", help="folder of images")
+    parser.add_argument("--detector", choices=available_detectors(), default="yolo")
+    parser.add_argument("--max-images", type=int, default=300)
+    args = parser.parse_args()
+
+    output = quantize(args.onnx, args.output, args.mode, args.calibration,
+                      args.detector, args.max_images)
+    size = os.path.getsize(output) / 1e6
+    print(f"✓ {args.mode} INT8 model written to {output} ({size:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
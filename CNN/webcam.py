@@ -1,10 +1,8 @@
 import streamlit as st
 from CNN.components.camera import camera
-def webcam(learn):
+def webcam(learn, warmup=None):
     if "camera_running" not in st.session_state:
         st.session_state.camera_running = False
-    if "gesture_buffer" not in st.session_state:
-        st.session_state.gesture_buffer = []
 
     col1, col2 = st.columns([3, 1])
     
@@ -26,5 +24,5 @@ def webcam(learn):
         if st.button(button_label, type=button_type, width="stretch"):
             st.session_state.camera_running = not st.session_state.camera_running
             st.rerun()
-    camera(learn)
+    camera(learn, warmup=warmup)
     
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+CPU exports of the YOLO hand detector: ONNX or OpenVINO IR, at a chosen
+input size, optionally INT8.
+
+    python -m CNN.yolo_export --format onnx --imgsz 320 [--int8]
+    python -m CNN.yolo_export --format openvino --imgsz 416 [--int8 --data hands.yaml]
+
+Exports are written next to the .pt weights as yolo11n_<imgsz>[_int8].onnx
+or yolo11n_<imgsz>[_int8]_openvino_model/. The "yolo_export" hand detector
+backend loads one of them, picked by YOLO_EXPORT_FORMAT (onnx), YOLO_IMGSZ
+(320) and YOLO_INT8 (0).
+
+A smaller input size trades detection recall for latency; see
+benchmarks/bench_yolo_export.py. For INT8, OpenVINO uses ultralytics' own
+NNCF calibration (on --data, a dataset YAML). ONNX is quantized with ONNX
+Runtime instead: static, convolutions only, calibrated on letterboxed
+frames from --calibration.
+
+OpenVINO is not part of requirements.txt: pip install -r requirements-export.txt
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from CNN.crop_hand import YOLO_MODEL_FILE
+
+EXPORT_FORMATS = ("onnx", "openvino")
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+# Which export the "yolo_export" detector backend loads
+YOLO_EXPORT_FORMAT = os.environ.get("YOLO_EXPORT_FORMAT", "onnx")
+YOLO_IMGSZ = int(os.environ.get("YOLO_IMGSZ", "320"))
+YOLO_INT8 = os.environ.get("YOLO_INT8", "0") == "1"
+
+
+def exported_model_path(fmt, imgsz, int8=False, weights=YOLO_MODEL_FILE):
+    name = f"{Path(weights).with_suffix('')}_{imgsz}{'_int8' if int8 else ''}"
+    return f"{name}.onnx" if fmt == "onnx" else f"{name}_openvino_model"
+
+
+# ===========================================
+# ONNX INT8 (ONNX Runtime)
+# ===========================================
+def letterbox(img, imgsz):
+    """ultralytics' LetterBox for a square input: float32 RGB CHW in [0, 1]."""
+    h, w = img.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    nh, nw = round(h * r), round(w * r)
+    img = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    img = cv2.copyMakeBorder(img, top, imgsz - nh - top, left, imgsz - nw - left,
+                             cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return np.ascontiguousarray(img[..., ::-1].transpose(2, 0, 1), dtype=np.float32) / 255.0
+
+
+class FrameCalibrationReader:
+    """CalibrationDataReader over letterboxed frames, one per batch."""
+
+    def __init__(self, input_name, paths, imgsz):
+        self._frames = (
+            {input_name: letterbox(img, imgsz)[None]}
+            for img in (cv2.imread(str(p)) for p in paths) if img is not None
+        )
+
+    def get_next(self):
+        return next(self._frames, None)
+
+
+def quantize_onnx(fp32_path, output, imgsz, calibration="example_signs", max_images=200):
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    paths = sorted(p for p in Path(calibration).rglob("*")
+                   if p.suffix.lower() in IMAGE_SUFFIXES)[:max_images]
+    if not paths:
+        raise ValueError(f"no calibration images in {calibration}")
+    input_name = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]) \
+        .get_inputs()[0].name
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = os.path.join(tmp, "prepared.onnx")
+        quant_pre_process(fp32_path, prepared)
+        quantize_static(
+            prepared, output, FrameCalibrationReader(input_name, paths, imgsz),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            # The box decoding after the last convolutions stays in float
+            op_types_to_quantize=["Conv"],
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+    return output
+
+
+# ===========================================
+# EXPORT
+# ===========================================
+def export(fmt="onnx", imgsz=YOLO_IMGSZ, int8=False, weights=YOLO_MODEL_FILE,
+           data=None, calibration="example_signs"):
+    """Export the .pt weights; returns the path the yolo_export backend loads."""
+    from ultralytics import YOLO
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Available: {EXPORT_FORMATS}")
+    target = exported_model_path(fmt, imgsz, int8, weights)
+
+    if fmt == "onnx":
+        fp32 = exported_model_path(fmt, imgsz, False, weights)
+        if not Path(fp32).exists():
+            shutil.move(YOLO(weights).export(format="onnx", imgsz=imgsz), fp32)
+        return quantize_onnx(fp32, target, imgsz, calibration) if int8 else fp32
+
+    options = {"format": "openvino", "imgsz": imgsz, "int8": int8}
+    if int8 and data:
+        options["data"] = data
+    out = YOLO(weights).export(**options)
+    if Path(target).exists():
+        shutil.rmtree(target)
+    shutil.move(out, target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="onnx")
+    parser.add_argument("--imgsz", type=int, default=YOLO_IMGSZ)
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--weights", default=YOLO_MODEL_FILE)
+    parser.add_argument("--data", help="dataset YAML for OpenVINO INT8 calibration")
+    parser.add_argument("--calibration", default="example_signs",
+                        help="image folder for ONNX INT8 calibration")
+    args = parser.parse_args()
+
+    out = export(args.format, args.imgsz, args.int8, args.weights, args.data, args.calibration)
+    print(f"✓ Exported {args.weights} → {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,21 @@ import streamlit as st
 import cv2
 import numpy as np
 from HOG_SVM.predict_sign import predict_sign_hog
+from common.frame_display import FrameDisplay
+from common.hand_detectors import create_hand_detector
+from common.gesture_smoother import CAMERA_SMOOTHING, GestureSmoother
+from common.motion_gate import MotionGate
+from common.stage_timing import StageTimer
+from common.threaded_capture import LatestFrameCapture
 
+# Refresh the capture counters every N processed frames
+STATS_EVERY = 15
 
-def camera(hog_bundle):
+
+def camera(hog_bundle, tracking=True):
     """
     Real-time HOG + LinearSVM webcam inference
+    tracking=True follows the hand across frames instead of re-detecting it
     """
 
     # =========================
@@ -21,8 +31,19 @@ def camera(hog_bundle):
     # =========================
     # Session state
     # =========================
-    if "gesture_buffer" not in st.session_state:
-        st.session_state.gesture_buffer = []
+    if "hog_gesture_smoother" not in st.session_state:
+        # With mode="ema" the SVM margins are averaged and shown as sigmoid(margin)
+        fused = hog_bundle.get("fused")
+        st.session_state.hog_gesture_smoother = GestureSmoother(
+            classes=fused["inv_label_map"] if fused else inv_label_map,
+            confidence_fn=lambda m: 100.0 / (1.0 + np.exp(-m)),
+            **CAMERA_SMOOTHING
+        )
+    smoother = st.session_state.hog_gesture_smoother
+    # Per-stage latencies, kept across reruns of this session
+    if "hog_stage_timer" not in st.session_state:
+        st.session_state.hog_stage_timer = StageTimer()
+    timer = st.session_state.hog_stage_timer
 
     # =========================
     # Layout
@@ -39,6 +60,9 @@ def camera(hog_bundle):
         alt_predictions = st.empty()
 
     status_text = st.empty()
+    stats_text = st.empty()
+    with st.expander("⏱ Stage latency"):
+        perf_panel = st.empty()
 
     # =========================
     # Camera loop
@@ -47,172 +71,203 @@ def camera(hog_bundle):
         status_text.success("Click **Start Camera** to begin.")
         return
 
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    # Capture runs on its own thread and only hands over the newest frame
+    cap = LatestFrameCapture(0, width=1280, height=720)
 
     status_text.info("📹 Camera running — show a hand to get predictions")
+    frame_count = 0
+    shown = False
+    # Frames go out at most at the display FPS cap, downscaled and JPEG-encoded
+    display = FrameDisplay(FRAME_WINDOW)
+    # Reuse the last prediction while the signer holds still
+    gate = MotionGate()
+    # The tracked hand ROI belongs to this stream only
+    detector = create_hand_detector("mediapipe_track" if tracking else "mediapipe")
+
+    # Streamlit stops a rerun by raising inside the loop; always free the camera
+    try:
+        timer.activate()
+        while st.session_state.camera_running and cap.isOpened():
+            # Close the previous frame here: the no-hand branch continues early
+            if frame_count:
+                if shown:
+                    timer.lap("ui")
+                timer.frame_done(hand=bool(hand_detected), reused=gate.inferred == inferred,
+                                 shown=shown)
+
+            ret, frame, captured_at = cap.read()
+            timer.lap("capture")
+            if not ret:
+                status_text.error("Failed to read from camera")
+                break
+
+            # -------------------------
+            # Prediction
+            # -------------------------
+            inferred = gate.inferred
+            res = gate.run(frame, lambda f: predict_sign_hog(
+                f,
+                svm_clf,
+                scaler,
+                selector,
+                inv_label_map,
+                hog_params,
+                detector=detector,
+                fused=hog_bundle.get("fused")
+            ))
+            timer.lap("predict")
+
+            hand_detected = res and res["hand_detected"]
+
+            frame_count += 1
+            if frame_count % STATS_EVERY == 0:
+                stats_text.caption(
+                    f"{cap.stats_text()} · {gate.stats_text()} · {display.stats_text()}"
+                )
+                perf_panel.markdown(timer.panel_markdown())
+
+            # -------------------------
+            # NO HAND → NO PREDICTION
+            # -------------------------
+            if not hand_detected:
+                smoother.clear()
+
+                # Inference keeps its own rate; the display is throttled
+                shown = display.due()
+                if not shown:
+                    continue
+
+                frame_display = cv2.flip(frame, 1)
+                cv2.putText(
+                    frame_display,
+                    "⚠ No hand detected",
+                    (10, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    1,
+                    (0, 0, 255),
+                    2
+                )
+                timer.lap("overlay")
+
+                display.show(frame_display)
+                cap.record_display(captured_at)
+                timer.lap("display")
+
+                main_prediction.markdown(
+                    "<div style='color:#dc2626; font-weight:600;'>No hand detected</div>",
+                    unsafe_allow_html=True
+                )
+                alt_predictions.markdown("*—*")
+
+                continue
+
+            # -------------------------
+            # VALID HAND PREDICTION
+            # -------------------------
+            pred_class = res["prediction"]
+            margin = res["svm_margin"]
+            top3 = res["top3"]
+
+            # Margin → UI confidence (visual only)
+            pseudo_conf = 1 / (1 + np.exp(-margin))
+            pseudo_conf *= 100
+
+            # -------------------------
+            # Gesture lock over the last frames (CAMERA_SMOOTHING)
+            # -------------------------
+            locked_pred, locked_conf = smoother.push(
+                pred_class, pseudo_conf, res["decision_scores"]
+            )
 
-    while st.session_state.camera_running and cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            status_text.error("Failed to read from camera")
-            break
-
-        # -------------------------
-        # Prediction
-        # -------------------------
-        res = predict_sign_hog(
-            frame,
-            svm_clf,
-            scaler,
-            selector,
-            inv_label_map,
-            hog_params,
-            mode="cam"
-        )
+            # -------------------------
+            # Frame display
+            # -------------------------
+            shown = display.due()
+            if not shown:
+                continue
 
-        hand_detected = res and res["hand_detected"]
+            frame_display = cv2.flip(frame, 1)
 
-        # -------------------------
-        # NO HAND → NO PREDICTION
-        # -------------------------
-        if not hand_detected:
-            st.session_state.gesture_buffer.clear()
+            color = (
+                (0, 255, 0) if locked_conf >= 85
+                else (0, 165, 255) if locked_conf >= 65
+                else (255, 0, 0)
+            )
 
-            frame_display = cv2.flip(frame, 1)
             cv2.putText(
                 frame_display,
-                "⚠ No hand detected",
+                f"✓ {locked_pred} ({locked_conf:.1f}%)",
                 (10, 40),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 1,
-                (0, 0, 255),
+                color,
                 2
             )
 
-            FRAME_WINDOW.image(
-                cv2.cvtColor(frame_display, cv2.COLOR_BGR2RGB),
-                channels="RGB",
-                use_container_width=True
+            # Confidence bar
+            bar_width = int(frame_display.shape[1] * locked_conf / 100)
+            cv2.rectangle(
+                frame_display,
+                (0, frame_display.shape[0] - 18),
+                (bar_width, frame_display.shape[0] - 8),
+                color,
+                -1
             )
-
-            main_prediction.markdown(
-                "<div style='color:#dc2626; font-weight:600;'>No hand detected</div>",
-                unsafe_allow_html=True
+            timer.lap("overlay")
+
+            display.show(frame_display)
+            cap.record_display(captured_at)
+            timer.lap("display")
+
+            # -------------------------
+            # Prediction card
+            # -------------------------
+            conf_color = (
+                "green" if locked_conf >= 85
+                else "orange" if locked_conf >= 65
+                else "red"
             )
-            alt_predictions.markdown("*—*")
-
-            continue
-
-        # -------------------------
-        # VALID HAND PREDICTION
-        # -------------------------
-        pred_class = res["prediction"]
-        margin = res["svm_margin"]
-        top3 = res["top3"]
-
-        # Margin → UI confidence (visual only)
-        pseudo_conf = 1 / (1 + np.exp(-margin))
-        pseudo_conf *= 100
-
-        # -------------------------
-        # Gesture lock buffer
-        # -------------------------
-        buffer = st.session_state.gesture_buffer
-        buffer.append((pred_class, pseudo_conf))
-        if len(buffer) > 5:
-            buffer.pop(0)
-
-        locked_pred = max(
-            set(p[0] for p in buffer),
-            key=[p[0] for p in buffer].count
-        )
-        locked_conf = np.mean([p[1] for p in buffer])
-
-        # -------------------------
-        # Frame display
-        # -------------------------
-        frame_display = cv2.flip(frame, 1)
 
-        color = (
-            (0, 255, 0) if locked_conf >= 85
-            else (0, 165, 255) if locked_conf >= 65
-            else (255, 0, 0)
-        )
-
-        cv2.putText(
-            frame_display,
-            f"✓ {locked_pred} ({locked_conf:.1f}%)",
-            (10, 40),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            color,
-            2
-        )
-
-        # Confidence bar
-        bar_width = int(frame_display.shape[1] * locked_conf / 100)
-        cv2.rectangle(
-            frame_display,
-            (0, frame_display.shape[0] - 18),
-            (bar_width, frame_display.shape[0] - 8),
-            color,
-            -1
-        )
-
-        FRAME_WINDOW.image(
-            cv2.cvtColor(frame_display, cv2.COLOR_BGR2RGB),
-            channels="RGB",
-            use_container_width=True
-        )
-
-        # -------------------------
-        # Prediction card
-        # -------------------------
-        conf_color = (
-            "green" if locked_conf >= 85
-            else "orange" if locked_conf >= 65
-            else "red"
-        )
-
-        main_prediction.markdown(f"""
-        <div style="
-            border: 3px solid {conf_color};
-            border-radius: 10px;
-            padding: 20px;
-            text-align: center;
-            background-color: #f8f9fa;
-            margin-bottom: 20px;
-        ">
-            <h1 style="margin: 0; color: #333;">{locked_pred}</h1>
-                <h3 style="margin: 10px 0 0 0; color: {conf_color};">{locked_conf:.1f}%</h3>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # -------------------------
-        # Top-3 (decision margins)
-        # -------------------------
-        alt_html = ""
-        for i, (label, score) in enumerate(top3[1:], 1):
-            conf = 1 / (1 + np.exp(-score)) * 100
-            alt_html += f"""
+            main_prediction.markdown(f"""
             <div style="
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        padding: 12px;
-                        margin-bottom: 10px;
-                        background-color: white;
-                        display: flex;
-                        justify-content: space-between;
-                        align-items: center;
-                    ">
-                <span style=" color: #666; font-weight: 600; font-size: 1.1rem;" ><b>{i}. {label}</b></span>
-                <span style="color: #666; font-size: 0.95rem;">{conf:.1f}%</span>
+                border: 3px solid {conf_color};
+                border-radius: 10px;
+                padding: 20px;
+                text-align: center;
+                background-color: #f8f9fa;
+                margin-bottom: 20px;
+            ">
+                <h1 style="margin: 0; color: #333;">{locked_pred}</h1>
+                    <h3 style="margin: 10px 0 0 0; color: {conf_color};">{locked_conf:.1f}%</h3>
             </div>
-            """
-
-        alt_predictions.markdown(alt_html or "*—*", unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
+
+            # -------------------------
+            # Top-3 (decision margins)
+            # -------------------------
+            alt_html = ""
+            for i, (label, score) in enumerate(top3[1:], 1):
+                conf = 1 / (1 + np.exp(-score)) * 100
+                alt_html += f"""
+                <div style="
+                            border: 1px solid #ddd;
+                            border-radius: 8px;
+                            padding: 12px;
+                            margin-bottom: 10px;
+                            background-color: white;
+                            display: flex;
+                            justify-content: space-between;
+                            align-items: center;
+                        ">
+                    <span style=" color: #666; font-weight: 600; font-size: 1.1rem;" ><b>{i}. {label}</b></span>
+                    <span style="color: #666; font-size: 0.95rem;">{conf:.1f}%</span>
+                </div>
+                """
+
+            alt_predictions.markdown(alt_html or "*—*", unsafe_allow_html=True)
+    finally:
+        timer.deactivate()
+        detector.close()
+        cap.release()
 
-    cap.release()
     st.session_state.camera_running = False
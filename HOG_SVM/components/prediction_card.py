@@ -1,7 +1,5 @@
 import streamlit as st
-import cv2
-import numpy as np
-from pathlib import Path
+from common.thumbnails import hand_preview, thumbnail
 
 
 # =============================
@@ -21,7 +19,8 @@ def prediction_card(result):
         col_img, col_content = st.columns([1.2, 3], gap="medium")
 
         with col_img:
-            st.image(result["path"], width=190)
+            st.image(thumbnail(result["path"]), width=190)
+            hand_preview(result)
 
         with col_content:
             st.html(f"""
@@ -0,0 +1,179 @@
+"""
+Vectorized NumPy re-implementation of skimage.feature.hog for batches of
+equally sized grayscale crops.
+
+It follows skimage's algorithm step by step: central-difference gradients,
+unsigned orientation binning with half-open [start, end) bins summed over
+each cell, then per-block L1 / L1-sqrt / L2 / L2-Hys normalisation. The
+output matches hog(img, **hog_params) to floating-point rounding.
+cv2.HOGDescriptor is not used because it interpolates votes between bins
+and Gaussian-weights blocks, so its features differ from what the SVM was
+trained on.
+"""
+import json
+import threading
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EPS = 1e-5
+
+# Crops per vectorized chunk; bounds the size of the float64 temporaries
+CHUNK_SIZE = 256
+
+_extractors = {}
+
+
+class FastHOGExtractor:
+    def __init__(self, hog_params, size=(64, 64)):
+        params = dict(hog_params)
+        if params.pop("visualize", False) or params.pop("channel_axis", None) is not None:
+            raise ValueError("FastHOGExtractor only supports grayscale, non-visualized HOG")
+        if not params.pop("feature_vector", True):
+            raise ValueError("FastHOGExtractor only produces feature vectors")
+
+        self.size = tuple(size)
+        self.orientations = int(params.pop("orientations", 9))
+        self.c_row, self.c_col = params.pop("pixels_per_cell", (8, 8))
+        self.b_row, self.b_col = params.pop("cells_per_block", (3, 3))
+        self.block_norm = params.pop("block_norm", "L2-Hys")
+        self.transform_sqrt = params.pop("transform_sqrt", False)
+        if params:
+            raise ValueError(f"Unsupported HOG parameters: {sorted(params)}")
+        if self.block_norm not in {"L1", "L1-sqrt", "L2", "L2-Hys"}:
+            raise ValueError(f"Unknown block_norm: {self.block_norm}")
+
+        width, height = self.size  # cv2 sizes are (w, h)
+        self.n_cells_row = height // self.c_row
+        self.n_cells_col = width // self.c_col
+        n_blocks_row = self.n_cells_row - self.b_row + 1
+        n_blocks_col = self.n_cells_col - self.b_col + 1
+        self.n_features = (n_blocks_row * n_blocks_col
+                           * self.b_row * self.b_col * self.orientations)
+
+        # Same bin edges skimage compares against: per_180 * i
+        per_180 = 180.0 / self.orientations
+        self._edges = per_180 * np.arange(self.orientations + 1)
+
+        # Cell id of every pixel inside the region covered by whole cells
+        self._rows = self.n_cells_row * self.c_row
+        self._cols = self.n_cells_col * self.c_col
+        cell_r = np.arange(self._rows) // self.c_row
+        cell_c = np.arange(self._cols) // self.c_col
+        self._cell_index = (cell_r[:, None] * self.n_cells_col + cell_c[None, :]).ravel()
+
+        # Extractors are shared between Streamlit session threads
+        self._local = threading.local()
+
+    # -----------------------------
+    # Preprocessing
+    # -----------------------------
+    def _to_gray(self, crops):
+        """Resize + grayscale every crop into a reused uint8 buffer."""
+        n = len(crops)
+        buf = getattr(self._local, "gray", None)
+        if buf is None or buf.shape[0] < n:
+            width, height = self.size
+            buf = self._local.gray = np.empty((n, height, width), dtype=np.uint8)
+        gray = buf[:n]
+        for i, crop in enumerate(crops):
+            gray[i] = cv2.cvtColor(cv2.resize(crop, self.size), cv2.COLOR_RGB2GRAY)
+        return gray
+
+    # -----------------------------
+    # HOG core
+    # -----------------------------
+    def _histograms(self, gray):
+        n = gray.shape[0]
+        image = gray.astype(np.float64)
+        if self.transform_sqrt:
+            image = np.sqrt(image)
+
+        g_row = np.zeros_like(image)
+        g_row[:, 1:-1, :] = image[:, 2:, :] - image[:, :-2, :]
+        g_col = np.zeros_like(image)
+        g_col[:, :, 1:-1] = image[:, :, 2:] - image[:, :, :-2]
+
+        g_row = g_row[:, :self._rows, :self._cols]
+        g_col = g_col[:, :self._rows, :self._cols]
+        magnitude = np.hypot(g_col, g_row)
+        orientation = np.rad2deg(np.arctan2(g_row, g_col)) % 180
+
+        # bin i holds edges[i] <= o < edges[i + 1]; o past the last edge is dropped
+        bins = np.searchsorted(self._edges, orientation, side="right") - 1
+        valid = bins < self.orientations
+        magnitude = np.where(valid, magnitude, 0.0)
+        bins = np.where(valid, bins, 0)
+
+        n_cells = self.n_cells_row * self.n_cells_col
+        sample = np.arange(n)[:, None] * n_cells
+        flat = ((sample + self._cell_index[None, :]) * self.orientations
+                + bins.reshape(n, -1))
+        hist = np.bincount(flat.ravel(), weights=magnitude.ravel(),
+                           minlength=n * n_cells * self.orientations)
+        hist /= self.c_row * self.c_col
+        return hist.reshape(n, self.n_cells_row, self.n_cells_col, self.orientations)
+
+    def _normalize_blocks(self, hist):
+        # (N, blocks_r, blocks_c, orient, b_r, b_c) -> skimage's (..., b_r, b_c, orient)
+        blocks = sliding_window_view(hist, (self.b_row, self.b_col), axis=(1, 2))
+        blocks = blocks.transpose(0, 1, 2, 4, 5, 3)
+        axes = (3, 4, 5)
+
+        if self.block_norm in ("L1", "L1-sqrt"):
+            out = blocks / (np.abs(blocks).sum(axis=axes, keepdims=True) + EPS)
+            if self.block_norm == "L1-sqrt":
+                out = np.sqrt(out)
+            return out
+
+        out = blocks / np.sqrt((blocks ** 2).sum(axis=axes, keepdims=True) + EPS ** 2)
+        if self.block_norm == "L2-Hys":
+            out = np.minimum(out, 0.2)
+            out = out / np.sqrt((out ** 2).sum(axis=axes, keepdims=True) + EPS ** 2)
+        return out
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def extract_batch(self, crops, out=None):
+        """
+        HOG features of many RGB crops as an (N, n_features) float32 matrix.
+        Pass a preallocated out buffer to avoid allocating one per call.
+        """
+        n = len(crops)
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float32)
+        elif out.shape != (n, self.n_features) or out.dtype != np.float32:
+            raise ValueError(f"out must be float32 of shape {(n, self.n_features)}")
+
+        for start in range(0, n, CHUNK_SIZE):
+            chunk = crops[start:start + CHUNK_SIZE]
+            hist = self._histograms(self._to_gray(chunk))
+            out[start:start + len(chunk)] = self._normalize_blocks(hist).reshape(len(chunk), -1)
+        return out
+
+    def extract(self, crop, out=None):
+        """HOG features of a single RGB crop as a float32 vector."""
+        if out is not None:
+            self.extract_batch([crop], out=out.reshape(1, -1))
+            return out
+        return self.extract_batch([crop])[0]
+
+
+def get_extractor(hog_params, size=(64, 64)):
+    """Cached FastHOGExtractor for a hog_params dict."""
+    key = (json.dumps(hog_params, sort_keys=True, default=list), tuple(size))
+    extractor = _extractors.get(key)
+    if extractor is None:
+        extractor = _extractors[key] = FastHOGExtractor(hog_params, size)
+    return extractor
+
+
+def extract_hog_features_fast(img_rgb, hog_params, size=(64, 64)):
+    """Drop-in for hog_features.extract_hog_features returning float32."""
+    return get_extractor(hog_params, size).extract(img_rgb)
+
+
+def extract_hog_features_batch(crops, hog_params, size=(64, 64), out=None):
+    return get_extractor(hog_params, size).extract_batch(crops, out=out)
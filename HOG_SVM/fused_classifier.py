@@ -0,0 +1,181 @@
+"""
+Fused HOG classifier: StandardScaler -> feature selector -> LinearSVC are all
+affine or index operations, so they collapse into one weight matrix and bias
+over the raw HOG vector:
+
+    scores = ((x - mean) / scale)[support] @ coef.T + intercept
+           = x @ W + b
+
+Compile once with
+
+    python -m HOG_SVM.fused_classifier [--check example_signs [--detector mediapipe]]
+
+and inference becomes a single float32 GEMV per frame (GEMM per batch)
+with no sklearn calls.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from common.file_hash import file_sha256
+from HOG_SVM.hog_bundle import HOG_MODEL_FILE, read_hog_bundle
+
+FUSED_MODEL_FILE = "HOG_SVM/weights/svm_hog_fused.npz"
+
+
+def compile_fused_classifier(bundle):
+    """Fold scaler, selector and SVM of a HOG bundle into (W, b)."""
+    scaler, selector, svm = bundle["scaler"], bundle["selector"], bundle["svm"]
+
+    n_features = scaler.n_features_in_
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+
+    if not hasattr(selector, "get_support"):
+        raise TypeError(
+            f"{type(selector).__name__} is not an index selector; cannot fuse"
+        )
+    support = selector.get_support(indices=True)
+
+    coef = np.atleast_2d(svm.coef_).astype(np.float64)
+    if coef.shape[0] == 1:
+        raise ValueError("Binary LinearSVC bundles are not supported")
+    intercept = np.atleast_1d(svm.intercept_).astype(np.float64)
+
+    weights = np.zeros((n_features, coef.shape[0]), dtype=np.float64)
+    weights[support] = (coef / scale[support]).T
+    bias = intercept - coef @ (mean[support] / scale[support])
+
+    return {
+        "weights": np.ascontiguousarray(weights, dtype=np.float32),
+        "bias": bias.astype(np.float32),
+        # column j of the scores belongs to svm.classes_[j]
+        "inv_label_map": {j: bundle["inv_label_map"][int(c)]
+                          for j, c in enumerate(svm.classes_)},
+        "hog_params": bundle["hog_params"],
+    }
+
+
+def save_fused_classifier(fused, path=FUSED_MODEL_FILE, source_hash=""):
+    labels = [fused["inv_label_map"][j] for j in range(len(fused["bias"]))]
+    np.savez_compressed(
+        path,
+        weights=fused["weights"],
+        bias=fused["bias"],
+        labels=np.array(labels),
+        hog_params=np.array(json.dumps(fused["hog_params"])),
+        source_sha256=np.array(source_hash),
+    )
+
+
+def load_fused_classifier(path=FUSED_MODEL_FILE, source_path=HOG_MODEL_FILE):
+    """
+    Load a compiled .npz artifact. Returns None when it is missing or was
+    compiled from a different pickle than source_path.
+    """
+    if not Path(path).exists():
+        return None
+
+    with np.load(path) as data:
+        if source_path and str(data["source_sha256"]) != file_sha256(source_path):
+            return None
+        hog_params = json.loads(str(data["hog_params"]))
+        return {
+            "weights": data["weights"],
+            "bias": data["bias"],
+            "inv_label_map": {j: str(lbl) for j, lbl in enumerate(data["labels"])},
+            "hog_params": hog_params,
+        }
+
+
+def load_hog_bundle(path=HOG_MODEL_FILE, fused_path=FUSED_MODEL_FILE):
+    """read_hog_bundle() plus bundle["fused"], without Streamlit."""
+    bundle = read_hog_bundle(path)
+
+    # Prefer the compiled artifact; fall back to folding the pickle in memory
+    bundle["fused"] = (
+        load_fused_classifier(fused_path, path)
+        or compile_fused_classifier(bundle)
+    )
+    return bundle
+
+
+def fused_decision_function(fused, feats):
+    """Decision scores for one HOG vector (C,) or a matrix of them (N, C)."""
+    feats = np.asarray(feats, dtype=np.float32)
+    return feats @ fused["weights"] + fused["bias"]
+
+
+def sklearn_decision_function(bundle, feats):
+    """The unfused scaler -> selector -> SVM scores, (N, n_classes)."""
+    feats = np.atleast_2d(feats)
+    return bundle["svm"].decision_function(
+        bundle["selector"].transform(bundle["scaler"].transform(feats))
+    )
+
+
+def check_parity(bundle, fused, folder, detector="yolo"):
+    """
+    Compare fused and sklearn decision scores on the images of a folder:
+    the hand crop where `detector` finds one, the full image otherwise
+    (parity does not depend on a hand being in view).
+    """
+    import cv2
+
+    from common.hand_detectors import get_hand_detector
+    from HOG_SVM.hog_features import extract_hog_features
+
+    hand_detector = get_hand_detector(detector)
+    max_diff, mismatches, n, hands = 0.0, 0, 0, 0
+    for img_path in sorted(Path(folder).iterdir()):
+        if img_path.suffix.lower() not in {".jpg", ".jpeg", ".png", ".bmp"}:
+            continue
+        img = cv2.imread(str(img_path))
+        if img is None:
+            continue
+        crop, detected = hand_detector.crop(img)
+
+        feat = extract_hog_features(crop, bundle["hog_params"])
+        ref = sklearn_decision_function(bundle, feat).ravel()
+        got = fused_decision_function(fused, feat)
+
+        max_diff = max(max_diff, float(np.abs(ref - got).max()))
+        mismatches += int(np.argmax(ref) != np.argmax(got))
+        n += 1
+        hands += bool(detected)
+
+    return {"images": n, "hand_crops": hands, "max_abs_diff": max_diff,
+            "top1_mismatches": mismatches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=HOG_MODEL_FILE)
+    parser.add_argument("--out", default=FUSED_MODEL_FILE)
+    parser.add_argument("--check", metavar="FOLDER",
+                        help="verify decision-score parity on a folder of images")
+    parser.add_argument("--detector", default="yolo",
+                        help="hand detector used to crop the --check images")
+    parser.add_argument("--atol", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    bundle = read_hog_bundle(args.model)
+    fused = compile_fused_classifier(bundle)
+    save_fused_classifier(fused, args.out, source_hash=file_sha256(args.model))
+    print(f"✓ Fused classifier written to {args.out} "
+          f"({fused['weights'].shape[0]} features x {fused['weights'].shape[1]} classes)")
+
+    if args.check:
+        report = check_parity(bundle, fused, args.check, args.detector)
+        print(json.dumps(report, indent=2))
+        if not report["images"]:
+            raise SystemExit(f"✗ No images checked in {args.check}")
+        if report["top1_mismatches"] or report["max_abs_diff"] > args.atol:
+            raise SystemExit("✗ Fused scores diverge from the sklearn pipeline")
+
+
+if __name__ == "__main__":
+    main()
@@ -146,19 +146,56 @@ import cv2
 import numpy as np
 
 from HOG_SVM.components.prediction_card import prediction_card
-from HOG_SVM.predict_sign import predict_sign_hog
-
-
-def hog_batch_prediction(hog_bundle, folder_path="example_signs"):
-    # ============================
-    # Unpack model bundle
-    # ============================
-    svm = hog_bundle["svm"]
-    scaler = hog_bundle["scaler"]
-    selector = hog_bundle["selector"]
-    inv_label_map = hog_bundle["inv_label_map"]
-    hog_params = hog_bundle["hog_params"]
-
+from common.hand_detectors import get_hand_detector
+from common.prediction_cache import cache_stats_text, iter_cached_predictions
+from common.result_gallery import page_selector, stream_results
+from HOG_SVM.hog_pool import DEFAULT_WORKERS, iter_predict_files
+
+
+def _result_row(img_path, res, detector):
+    # ----------------------------
+    # NO HAND DETECTED
+    # ----------------------------
+    if res is None or not res["hand_detected"]:
+        return {
+            "path": img_path,
+            "Prediction": "NO HAND",
+            "SVM Margin": None,
+            "Top-3 (Margins)": "N/A",
+            "is_correct": False,
+            "model_type": "hog+svm",
+            "detector": detector
+        }
+
+    # ----------------------------
+    # VALID PREDICTION
+    # ----------------------------
+    pred = res["prediction"]
+
+    top3_str = ", ".join(
+        f"{lbl} ({score:.2f})"
+        for lbl, score in res["top3"]
+    )
+
+    true_label = img_path.stem.split("_")[0].lower()
+
+    return {
+        "path": img_path,
+        "Prediction": pred,
+        "SVM Margin": res["svm_margin"],
+        "Top-3 (Margins)": top3_str,
+        "is_correct": pred.lower() == true_label,
+        "model_type": "hog+svm",
+        "detector": detector
+    }
+
+
+def hog_batch_prediction(hog_bundle, folder_path="example_signs", detector="yolo",
+                         workers=DEFAULT_WORKERS):
+    """
+    workers: processes used for detection + HOG + SVM (1 = in-process);
+             defaults to the HOG_WORKERS environment variable.
+    """
     # ============================
     # Validate folder
     # ============================
@@ -178,77 +215,45 @@ def hog_batch_prediction(hog_bundle, folder_path="example_signs"):
         return
 
     # ============================
-    # Batch prediction
+    # Layout: header and cache info are filled in once the run finishes
     # ============================
-    results = []
-    correct_count = 0
-
-    for img_path in image_files:
-        img_bgr = cv2.imread(str(img_path))
-        if img_bgr is None:
-            continue
-
-        res = predict_sign_hog(
-            img_bgr,
-            svm_clf=svm,
-            scaler=scaler,
-            selector=selector,
-            inv_label_map=inv_label_map,
-            hog_params=hog_params,
-            mode="batch"
-        )
-
-        # ----------------------------
-        # NO HAND DETECTED
-        # ----------------------------
-        if res is None or not res["hand_detected"]:
-            results.append({
-                "path": img_path,
-                "Prediction": "NO HAND",
-                "SVM Margin": None,
-                "Top-3 (Margins)": "N/A",
-                "is_correct": False,
-                "cropped_image": None,
-                "model_type": "hog+svm"
-            })
-            continue
-
-        # ----------------------------
-        # VALID PREDICTION
-        # ----------------------------
-        pred = res["prediction"]
-        margin = res["svm_margin"]
-
-        top3_str = ", ".join(
-            f"{lbl} ({score:.2f})"
-            for lbl, score in res["top3"]
-        )
-
-        true_label = img_path.stem.split("_")[0].lower()
-        is_correct = pred.lower() == true_label
-
-        if is_correct:
-            correct_count += 1
-
-        results.append({
-            "path": img_path,
-            "Prediction": pred,
-            "SVM Margin": margin,
-            "Top-3 (Margins)": top3_str,
-            "is_correct": is_correct,
-            "cropped_image": res["cropped_image"],
-            "model_type": "hog+svm"
-        })
+    header = st.empty()
+    cache_caption = st.empty()
+    st.divider()
+    page = page_selector(len(image_files), key="hog_batch_page")
+
+    # ============================
+    # Batch prediction (unchanged images come from the on-disk cache,
+    # the rest is streamed into the current page as it completes)
+    # ============================
+    cache_stats = {}
+    pairs = iter_cached_predictions(
+        image_files,
+        hog_bundle["model_file"],
+        get_hand_detector(detector).cache_key(),
+        lambda paths: iter_predict_files(
+            paths, hog_bundle, detector, workers,
+            on_error=lambda path, e: st.error(f"Error during HOG prediction: {e}")
+        ),
+        stats=cache_stats
+    )
+
+    results = stream_results(
+        pairs, len(image_files),
+        lambda i, res: _result_row(image_files[i], res, detector),
+        prediction_card, page
+    )
 
     # ============================
     # Accuracy
     # ============================
+    correct_count = sum(r["is_correct"] for r in results)
     acc = (correct_count / len(image_files)) * 100
 
     # ============================
     # Header
     # ============================
-    st.html(f"""
+    header.html(f"""
 <div style="
     display: flex;
     align-items: center;
@@ -286,10 +291,4 @@ def hog_batch_prediction(hog_bundle, folder_path="example_signs"):
 </div>
 """)
 
-    st.divider()
-
-    # ============================
-    # Display results
-    # ============================
-    for result in results:
-        prediction_card(result)
+    cache_caption.caption(cache_stats_text(cache_stats))
@@ -0,0 +1,19 @@
+import pickle
+
+HOG_MODEL_FILE = "HOG_SVM/weights/svm_hog_selected.pkl"
+
+
+def read_hog_bundle(path=HOG_MODEL_FILE):
+    """Unpickle the HOG + LinearSVC bundle (no Streamlit dependency)."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+
+    return {
+        "svm": data["model"],
+        "scaler": data["scaler"],
+        "selector": data["selector"],
+        "label_map": data["label_map"],
+        "inv_label_map": {v: k for k, v in data["label_map"].items()},
+        "hog_params": data["hog_params"],
+        "model_file": str(path)
+    }
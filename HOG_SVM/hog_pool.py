@@ -0,0 +1,251 @@
+"""
+HOG batch pipeline over image files, serial or on a process pool.
+
+Decode -> hand detection -> HOG -> SVM is CPU-bound and independent per
+image, so with workers > 1 the paths are split into chunks and spread over
+worker processes. Each worker loads the model bundle and the hand detector
+once (pool initializer). Results stream back in input order as chunks
+complete.
+
+Detections are still shared through the crop store. The parent looks the
+images up in its index, workers read stored crops from the memory-mapped
+data file, and new crops are sent back so that only the parent writes to
+the store.
+
+A spawned child normally starts from the parent's sys.path and re-runs the
+parent's __main__ before the pool initializer. Under `streamlit run` the
+repository root comes first on that path, so the app's streamlit.py would
+shadow the installed package. __main__ is also the app script itself.
+Workers are therefore started with their own preparation data: the path
+with the root behind site-packages, and no __main__ to re-run. The parent's
+sys.path is left as it is.
+"""
+import atexit
+import multiprocessing
+import multiprocessing.context
+import multiprocessing.spawn
+import os
+import threading
+
+import cv2
+
+from common.crop_store import CROP_DATA_FILE, CropReader, get_crop_store, load_crops
+from common.entrypoint import installed_streamlit_path
+from common.file_hash import file_sha256
+from common.hand_detectors import get_hand_detector
+
+# HOG_WORKERS=N runs batch prediction on N processes (1 = in-process)
+DEFAULT_WORKERS = int(os.environ.get("HOG_WORKERS", "1"))
+# Images per task sent to a worker
+CHUNK_SIZE = 16
+# New crops buffered in the parent before they are appended to the store
+STORE_FLUSH_EVERY = 256
+
+
+def crop_payloads(cropped, hog_bundle):
+    """
+    Classify (crop, hand_detected) entries (None = failed image) in one
+    vectorized pass. Returns one JSON-serialisable result per entry.
+    """
+    from HOG_SVM.predict_sign import predict_sign_hog_batch
+
+    hands = [c[0] for c in cropped if c is not None and c[1]]
+    predictions = iter(predict_sign_hog_batch(
+        hands,
+        svm_clf=hog_bundle["svm"],
+        scaler=hog_bundle["scaler"],
+        selector=hog_bundle["selector"],
+        inv_label_map=hog_bundle["inv_label_map"],
+        hog_params=hog_bundle["hog_params"],
+        fused=hog_bundle.get("fused")
+    ))
+
+    payloads = []
+    for entry in cropped:
+        if entry is None:
+            payloads.append(None)
+        elif not entry[1]:
+            payloads.append({"hand_detected": False})
+        else:
+            res = next(predictions)
+            payloads.append({
+                "hand_detected": True,
+                "prediction": str(res["prediction"]),
+                "svm_margin": float(res["svm_margin"]),
+                "top3": [(str(lbl), float(score)) for lbl, score in res["top3"]]
+            } if res else None)
+    return payloads
+
+
+# ===========================================
+# WORKER SIDE
+# ===========================================
+_worker = {}
+
+
+def _init_worker(model_file, detector_name, crop_data_file):
+    from HOG_SVM.fused_classifier import load_hog_bundle
+
+    # The pool is the parallelism; keep OpenCV from oversubscribing cores
+    cv2.setNumThreads(1)
+    _worker["bundle"] = load_hog_bundle(model_file)
+    _worker["detector"] = get_hand_detector(detector_name)
+    _worker["reader"] = CropReader(crop_data_file)
+
+
+def _process_chunk(items):
+    return _run_chunk(items, _worker["bundle"], _worker["detector"], _worker["reader"])
+
+
+def _run_chunk(items, hog_bundle, detector, reader):
+    """
+    items: list of (path, CropRecord or None).
+    Returns one (payload, new crop entry or None, error or None) per item.
+    """
+    cropped, entries, errors = [], [], []
+    paths, records = zip(*items)
+    # Misses are detected as one batch
+    for record, (loaded, error) in zip(records, load_crops(paths, records, detector, reader)):
+        cropped.append(loaded and loaded[:2])
+        if loaded is None or record is not None:
+            entries.append(None)
+        elif loaded[1]:
+            entries.append(loaded)
+        else:
+            entries.append((None, False, None))  # don't ship the full frame back
+        errors.append(error and str(error))
+
+    payloads = crop_payloads(cropped, hog_bundle)
+    return list(zip(payloads, entries, errors))
+
+
+# ===========================================
+# SPAWNING
+# ===========================================
+_spawning = threading.local()
+_get_preparation_data = multiprocessing.spawn.get_preparation_data
+
+
+def _preparation_data(name):
+    data = _get_preparation_data(name)
+    if getattr(_spawning, "worker", False):
+        # Everything a worker runs is importable from HOG_SVM.hog_pool
+        data["sys_path"] = installed_streamlit_path(data["sys_path"])
+        data.pop("init_main_from_path", None)
+        data.pop("init_main_from_name", None)
+    return data
+
+
+# Only changes the data of processes started by _WorkerProcess
+multiprocessing.spawn.get_preparation_data = _preparation_data
+
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        _spawning.worker = True
+        try:
+            return multiprocessing.context.SpawnProcess._Popen(process_obj)
+        finally:
+            _spawning.worker = False
+
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    Process = _WorkerProcess
+
+
+# ===========================================
+# PARENT SIDE
+# ===========================================
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _new_pool(model_file, detector, workers, crop_data_file):
+    return _WorkerContext().Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(str(model_file), detector, crop_data_file)
+    )
+
+
+def get_pool(model_file, detector, workers, crop_data_file=CROP_DATA_FILE):
+    """
+    Worker pool for (model file, detector, size), created on first use and
+    reused by later runs while the weights are unchanged. Spawned rather than
+    forked: the parent may hold MediaPipe/PyTorch threads that do not survive
+    a fork.
+    """
+    key = (str(model_file), detector, workers, crop_data_file)
+    weights = file_sha256(model_file)
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is not None and entry[0] != weights:
+            # Retrained weights: the workers hold the old bundle. close()
+            # lets a run still iterating the old pool finish.
+            entry[1].close()
+            entry = None
+        if entry is None:
+            entry = _pools[key] = (weights, _new_pool(model_file, detector, workers,
+                                                      crop_data_file))
+    return entry[1]
+
+
+def shutdown_pools():
+    with _pools_lock:
+        for _, pool in _pools.values():
+            pool.terminate()
+        _pools.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+def iter_predict_files(image_files, hog_bundle, detector="yolo", workers=DEFAULT_WORKERS,
+                       chunk_size=CHUNK_SIZE, store=None, on_error=None):
+    """
+    Yield one JSON-serialisable prediction per file, in order (None where the
+    image could not be processed). on_error(path, message) is called for
+    failed detections.
+    """
+    store = store or get_crop_store()
+    hand_detector = get_hand_detector(detector)
+    key = hand_detector.cache_key()
+    hashes = [file_sha256(p) for p in image_files]
+    records = store.get_many(hashes, key)
+    items = [(str(p), records.get(h)) for p, h in zip(image_files, hashes)]
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        pool = get_pool(hog_bundle["model_file"], detector, workers, store.data_path)
+        results = pool.imap(_process_chunk, chunks)
+    else:
+        # Same code path in-process, without the pickling round trip
+        results = (_run_chunk(chunk, hog_bundle, hand_detector, store.reader)
+                   for chunk in chunks)
+
+    fresh = {}
+    try:
+        position = 0
+        for chunk in results:
+            for payload, entry, error in chunk:
+                path, h = items[position][0], hashes[position]
+                position += 1
+                if error and on_error:
+                    on_error(path, error)
+                if entry is not None:
+                    fresh[h] = (h, *entry)
+                yield payload
+
+            # Write new crops as we go instead of holding them all in RAM
+            if len(fresh) >= STORE_FLUSH_EVERY:
+                store.put_many(fresh.values(), key)
+                fresh.clear()
+    finally:
+        if fresh:
+            store.put_many(fresh.values(), key)
+
+
+def predict_files(image_files, hog_bundle, detector="yolo", workers=DEFAULT_WORKERS, **kwargs):
+    """List form of iter_predict_files."""
+    return list(iter_predict_files(image_files, hog_bundle, detector, workers, **kwargs))
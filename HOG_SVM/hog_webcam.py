@@ -3,8 +3,6 @@ from HOG_SVM.components.camera import camera
 def hog_webcam(learn):
     if "camera_running" not in st.session_state:
         st.session_state.camera_running = False
-    if "gesture_buffer" not in st.session_state:
-        st.session_state.gesture_buffer = []
 
     col1, col2 = st.columns([3, 1])
     
@@ -1,8 +1,9 @@
 import streamlit as st
 import numpy as np
-from CNN.crop_hand import crop_hand
-from CNN.crop_hand_cam import crop_hand_cam
-from HOG_SVM.hog_features import extract_hog_features
+from common.hand_detectors import resolve_detector
+from HOG_SVM.fused_classifier import fused_decision_function
+from HOG_SVM.fast_hog import extract_hog_features_batch, extract_hog_features_fast
+from common.stage_timing import timed
 def predict_sign_hog(
     image,
     svm_clf,
@@ -10,18 +11,23 @@ def predict_sign_hog(
     selector,
     inv_label_map,
     hog_params,
-    mode="batch"
+    mode="batch",
+    fused=None,
+    detector=None
 ):
     """
     Predict sign language using HOG + LinearSVC
     Returns SVM-specific decision information (NOT probabilities)
+    mode: "batch" (YOLO) or "cam" (MediaPipe per frame)
+    fused: compiled classifier from HOG_SVM.fused_classifier; when given the
+           scaler/selector/SVM stages run as one GEMV instead of sklearn calls
+    detector: name of a registered hand detector backend, or a backend
+              instance (a stream's own tracker); overrides mode
     """
     try:
         # 1️⃣ Crop hand
-        if mode == "batch":
-            cropped_img, hand_detected = crop_hand(image)
-        else:
-            cropped_img, hand_detected = crop_hand_cam(image)
+        hand_detector = resolve_detector(detector, mode)
+        cropped_img, hand_detected = hand_detector.crop(image)
 
         if not hand_detected:
             return {
@@ -35,12 +41,18 @@ def predict_sign_hog(
             }
 
         # 2️⃣ HOG features
-        feat = extract_hog_features(cropped_img, hog_params)
-        feat_scaled = scaler.transform([feat])
-        feat_sel = selector.transform(feat_scaled)
+        with timed("hog"):
+            feat = extract_hog_features_fast(cropped_img, hog_params)
 
         # 3️⃣ Decision function (CORE of LinearSVC)
-        scores = svm_clf.decision_function(feat_sel).flatten()
+        with timed("svm"):
+            if fused is not None:
+                scores = fused_decision_function(fused, feat)
+                inv_label_map = fused["inv_label_map"]
+            else:
+                feat_scaled = scaler.transform([feat])
+                feat_sel = selector.transform(feat_scaled)
+                scores = svm_clf.decision_function(feat_sel).flatten()
 
         pred_idx = np.argmax(scores)
         pred_class = inv_label_map[pred_idx]
@@ -63,3 +75,63 @@ def predict_sign_hog(
     except Exception as e:
         st.error(f"Error during HOG prediction: {e}")
         return None
+
+
+def top_k_indices(scores, k=3):
+    """Row-wise indices of the k largest scores, best first (vectorized)."""
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def predict_sign_hog_batch(
+    crops,
+    svm_clf,
+    scaler,
+    selector,
+    inv_label_map,
+    hog_params,
+    fused=None
+):
+    """
+    Vectorized predict_sign_hog for many already-cropped hands.
+    Builds one float32 HOG matrix and runs scaler, selector and
+    decision_function once over it (or a single GEMM with fused). Returns one
+    result per crop, in order, with the same keys and values as predict_sign_hog.
+    """
+    if len(crops) == 0:
+        return []
+
+    try:
+        # 1️⃣ HOG feature matrix
+        feats = extract_hog_features_batch(crops, hog_params)
+
+        # 2️⃣ One pass through each sklearn stage
+        if fused is not None:
+            scores = fused_decision_function(fused, feats)
+            inv_label_map = fused["inv_label_map"]
+        else:
+            feat_sel = selector.transform(scaler.transform(feats))
+            scores = np.asarray(svm_clf.decision_function(feat_sel)).reshape(len(crops), -1)
+
+        # 3️⃣ Top-3 without a full sort
+        top_idx = top_k_indices(scores, 3)
+
+    except Exception as e:
+        st.error(f"Error during HOG prediction: {e}")
+        return [None] * len(crops)
+
+    results = []
+    for row, crop in enumerate(crops):
+        pred_idx = int(top_idx[row, 0])
+        results.append({
+            'prediction': inv_label_map[pred_idx],
+            'svm_margin': float(scores[row, pred_idx]),
+            'top3': [(inv_label_map[int(i)], float(scores[row, i])) for i in top_idx[row]],
+            'decision_scores': scores[row],
+            'cropped_image': crop,
+            'hand_detected': True,
+            'model_type': 'hog+svm'
+        })
+    return results
@@ -6,9 +6,10 @@ import cv2
 import pickle
 from pathlib import Path
 import numpy as np
-import mediapipe as mp
 from skimage.feature import hog
 
+from common.mediapipe_hands import crop_hand_mediapipe
+
 # -----------------------------
 # Load trained model
 # -----------------------------
@@ -24,45 +25,11 @@ label_map = data["label_map"]
 inv_label_map = {v: k for k, v in label_map.items()}
 hog_params = data["hog_params"]
 
-# -----------------------------
-# MediaPipe Hands detector
-# -----------------------------
-mp_hands = mp.solutions.hands
-hands_detector = mp_hands.Hands(
-    static_image_mode=True,
-    max_num_hands=1,
-    min_detection_confidence=0.5
-)
-
 # -----------------------------
 # Hand cropping function
 # -----------------------------
 def crop_hand(img, padding=20):
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = hands_detector.process(img_rgb)
-    if not results.multi_hand_landmarks:
-        return img_rgb, False
-
-    h, w, _ = img.shape
-    x_min, y_min = w, h
-    x_max, y_max = 0, 0
-    for lm in results.multi_hand_landmarks[0].landmark:
-        x, y = int(lm.x * w), int(lm.y * h)
-        x_min = min(x_min, x)
-        y_min = min(y_min, y)
-        x_max = max(x_max, x)
-        y_max = max(y_max, y)
-
-    x_min = max(0, x_min - padding)
-    y_min = max(0, y_min - padding)
-    x_max = min(w, x_max + padding)
-    y_max = min(h, y_max + padding)
-
-    cropped = img[y_min:y_max, x_min:x_max]
-    if cropped.size == 0:
-        return img_rgb, False
-
-    return cv2.cvtColor(cropped, cv2.COLOR_BGR2RGB), True
+    return crop_hand_mediapipe(img, min_detection_confidence=0.5, pad=padding)
 
 # -----------------------------
 # HOG feature extraction
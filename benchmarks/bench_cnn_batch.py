@@ -0,0 +1,64 @@
+"""
+Images/sec of the CNN folder path: one learn.predict per file (previous
+behaviour) versus predict_sign_batch at several batch sizes. Also checks
+that both paths agree on the top-1 label.
+
+    python -m benchmarks.bench_cnn_batch [--folder example_signs] [--batch-sizes 1 8 16 32]
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import time
+from pathlib import Path
+
+from fastai.vision.all import load_learner
+
+from benchmarks.timing import print_report
+
+MODEL_FILE = "CNN/weights/arabic_sign_resnet342.pkl"
+
+
+def main():
+    from CNN.predict_sign import predict_sign, predict_sign_batch
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    learn = load_learner(args.model, cpu=True)
+    images = sorted(
+        p for p in Path(args.folder).iterdir()
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ) * args.repeat
+
+    predict_sign(images[0], learn)  # warm-up (model + detector)
+
+    start = time.perf_counter()
+    loop = [predict_sign(p, learn) for p in images]
+    loop_rate = len(images) / (time.perf_counter() - start)
+
+    report = {"images": len(images), "per_file_loop_img_per_s": loop_rate, "batched": {}}
+    for bs in args.batch_sizes:
+        start = time.perf_counter()
+        batched = predict_sign_batch(images, learn, batch_size=bs)
+        rate = len(images) / (time.perf_counter() - start)
+        agree = sum(
+            a is not None and b is not None and a["prediction"] == b["prediction"]
+            for a, b in zip(loop, batched)
+        )
+        report["batched"][bs] = {
+            "img_per_s": rate,
+            "speedup": rate / loop_rate,
+            "top1_agreement": agree / len(images),
+        }
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Cold vs warm crop store: the second pass over a folder should skip
+detection entirely and read the crops back from the memory-mapped file.
+
+    python -m benchmarks.bench_crop_store [--folder example_signs] [--detector yolo]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.timing import print_report
+from common.crop_store import CropStore, cached_crops
+from common.hand_detectors import available_detectors, get_hand_detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--detector", default="yolo", choices=available_detectors())
+    args = parser.parse_args()
+
+    paths = [
+        p for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+    detector = get_hand_detector(args.detector)
+    detector.detect(str(paths[0]))  # load the model outside the timings
+
+    report = {"images": len(paths), "detector": detector.cache_key()}
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in ("cold", "warm"):
+            # Fresh store object per run, as in a new process
+            store = CropStore(f"{tmp}/crops.bin", f"{tmp}/crops.sqlite")
+            start = time.perf_counter()
+            crops = cached_crops(paths, detector, store=store)
+            elapsed = time.perf_counter() - start
+            report[run] = {
+                "total_s": elapsed,
+                "ms_per_image": elapsed * 1000.0 / len(paths),
+                "hits": store.hits,
+                "hands": sum(bool(c and c[1]) for c in crops),
+            }
+        report["store_bytes"] = Path(f"{tmp}/crops.bin").stat().st_size
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Latency and detection rate of every registered hand detector backend on the
+same images, to pick the cheapest backend that still finds the hands.
+
+    python -m benchmarks.bench_detectors [--folder example_signs] [--backends yolo mediapipe]
+"""
+import argparse
+from pathlib import Path
+
+import cv2
+
+from benchmarks.timing import print_report
+from common.hand_detectors import available_detectors, get_hand_detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--backends", nargs="+", default=available_detectors())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = [
+        cv2.imread(str(p)) for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+
+    report = {"images": len(frames), "backends": {}}
+    for name in args.backends:
+        detector = get_hand_detector(name)
+        detector.detect(frames[0])  # warm-up, not recorded below
+        detector.reset_timings()
+
+        found = 0
+        for _ in range(args.repeat):
+            found += sum(bool(detector.detect(f).hands) for f in frames)
+
+        report["backends"][name] = {
+            "detection_rate": found / (len(frames) * args.repeat),
+            **detector.timing_stats(),
+        }
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Server-side cost and size of one webcam frame sent to the browser: the old
+st.image(RGB array) path against FrameDisplay at a few widths / qualities.
+
+    python -m benchmarks.bench_display [--folder example_signs] [--fps 15 --inference-fps 30]
+
+Frames are the example images scaled to 1280x720. "server ms" is the time
+spent in Streamlit's image_to_url (plus FrameDisplay's resize and encode),
+"KB/frame" what ends up in the media file, and "KB/s" that size at the
+rate each path sends frames: every inferred frame before, the display FPS
+cap now.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+from pathlib import Path
+
+import cv2
+from streamlit.elements.lib import image_utils
+from streamlit.elements.lib.layout_utils import LayoutConfig
+
+from benchmarks.timing import print_report, summarize, time_calls
+from common.frame_display import FrameDisplay
+
+STRETCH = LayoutConfig(width="stretch")
+
+
+def sent_bytes(image, channels="RGB", output_format="auto"):
+    """What Streamlit stores for st.image(image): its image_to_url minus the media manager."""
+    if not isinstance(image, bytes):
+        image = image_utils._np_array_to_bytes(
+            image_utils._clip_image(image, clamp=False), output_format)
+    fmt = image_utils._validate_image_format_string(image, output_format)
+    return image_utils._ensure_image_size_and_format(image, STRETCH, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--fps", type=float, default=15, help="display FPS cap")
+    parser.add_argument("--inference-fps", type=float, default=30,
+                        help="rate the old path sent frames at")
+    args = parser.parse_args()
+
+    frames = [cv2.resize(cv2.imread(str(p)), (1280, 720))
+              for p in sorted(Path(args.folder).iterdir())
+              if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}]
+
+    def legacy(frame):
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image_utils.image_to_url(rgb, STRETCH, False, "RGB", "auto", "bench")
+
+    rows = [{
+        "path": "st.image(RGB array)",
+        "kb_per_frame": sum(len(sent_bytes(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)))
+                            for f in frames) / len(frames) / 1024,
+        "sent_fps": args.inference_fps,
+        **summarize(time_calls(legacy, frames)),
+    }]
+
+    for width, quality in ((1280, 75), (960, 75), (960, 60), (640, 75)):
+        display = FrameDisplay(None, args.fps, width, quality)
+
+        def send(frame):
+            data = display.encode(frame)
+            image_utils.image_to_url(data, STRETCH, False, "RGB", "JPEG", "bench")
+
+        rows.append({
+            "path": f"FrameDisplay {width}px q{quality}",
+            "kb_per_frame": sum(len(sent_bytes(display.encode(f), output_format="JPEG"))
+                                for f in frames) / len(frames) / 1024,
+            "sent_fps": args.fps,
+            **summarize(time_calls(send, frames)),
+        })
+
+    print("| path | server ms p50 | KB/frame | frames/s sent | KB/s |")
+    print("|---|---:|---:|---:|---:|")
+    for r in rows:
+        print(f"| {r['path']} | {r['p50_ms']:.1f} | {r['kb_per_frame']:.0f} "
+              f"| {r['sent_fps']:.0f} | {r['kb_per_frame'] * r['sent_fps']:.0f} |")
+    print_report({"frames": len(frames), "results": rows})
+
+
+if __name__ == "__main__":
+    main()
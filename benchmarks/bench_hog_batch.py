@@ -0,0 +1,86 @@
+"""
+Parity and throughput of predict_sign_hog_batch against the per-image
+scaler -> selector -> decision_function path on the same crops.
+
+    python -m benchmarks.bench_hog_batch [--folder example_signs] [--repeat 10] [--detector yolo]
+
+Images where the detector finds no hand are scored on the full frame, so
+parity is still checked without a hand detector installed.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.timing import print_report
+
+
+def main():
+    import cv2
+
+    from common.hand_detectors import get_hand_detector
+    from HOG_SVM.hog_features import extract_hog_features
+    from HOG_SVM.load_hog_model import load_hog_model
+    from HOG_SVM.predict_sign import predict_sign_hog_batch
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--detector", default="yolo", help="hand detector used to crop the images")
+    args = parser.parse_args()
+
+    bundle = load_hog_model()
+    svm, scaler, selector = bundle["svm"], bundle["scaler"], bundle["selector"]
+
+    hand_detector = get_hand_detector(args.detector)
+    crops, hands = [], 0
+    for p in sorted(Path(args.folder).iterdir()):
+        if p.suffix.lower() not in {".jpg", ".jpeg", ".png", ".bmp"}:
+            continue
+        img = cv2.imread(str(p))
+        if img is None:
+            continue
+        crop, detected = hand_detector.crop(img)
+        crops.append(crop)
+        hands += bool(detected)
+    if not crops:
+        raise SystemExit(f"✗ No images found in {args.folder}")
+    crops = crops * args.repeat
+
+    start = time.perf_counter()
+    single_scores = [
+        svm.decision_function(selector.transform(scaler.transform(
+            [extract_hog_features(c, bundle["hog_params"])]))).flatten()
+        for c in crops
+    ]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = predict_sign_hog_batch(crops, svm, scaler, selector,
+                                   bundle["inv_label_map"], bundle["hog_params"])
+    batch_s = time.perf_counter() - start
+
+    single_pred = [int(np.argmax(s)) for s in single_scores]
+    batch_pred = [bundle["label_map"][r["prediction"]] for r in batch]
+    max_diff = max(
+        float(np.abs(s - r["decision_scores"]).max())
+        for s, r in zip(single_scores, batch)
+    )
+
+    print_report({
+        "crops": len(crops),
+        "hand_crops": hands * args.repeat,
+        "single_img_per_s": len(crops) / single_s,
+        "batch_img_per_s": len(crops) / batch_s,
+        "top1_match": single_pred == batch_pred,
+        "max_abs_score_diff": max_diff,
+    })
+
+
+if __name__ == "__main__":
+    main()
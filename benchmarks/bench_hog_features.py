@@ -0,0 +1,70 @@
+"""
+Numerical parity and microbenchmark of HOG_SVM.fast_hog against
+skimage.feature.hog with the hog_params stored in the model bundle.
+
+    python -m benchmarks.bench_hog_features [--folder example_signs] [--random 200]
+
+Exits non-zero when any feature differs by more than --atol.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.timing import print_report, summarize, time_calls
+from HOG_SVM.fast_hog import extract_hog_features_batch, extract_hog_features_fast
+from HOG_SVM.hog_bundle import read_hog_bundle
+from HOG_SVM.hog_features import extract_hog_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--random", type=int, default=200,
+                        help="extra random crops of varying size")
+    parser.add_argument("--atol", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    hog_params = read_hog_bundle()["hog_params"]
+
+    crops = [
+        cv2.cvtColor(cv2.imread(str(p)), cv2.COLOR_BGR2RGB)
+        for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+    rng = np.random.default_rng(0)
+    crops += [
+        rng.integers(0, 256, (rng.integers(24, 256), rng.integers(24, 256), 3), dtype=np.uint8)
+        for _ in range(args.random)
+    ]
+
+    ref = np.stack([extract_hog_features(c, hog_params) for c in crops])
+    got = extract_hog_features_batch(crops, hog_params)
+    max_diff = float(np.abs(ref - got).max())
+
+    skimage_times = time_calls(lambda c: extract_hog_features(c, hog_params), crops)
+    fast_times = time_calls(lambda c: extract_hog_features_fast(c, hog_params), crops)
+
+    out = np.empty((len(crops), got.shape[1]), dtype=np.float32)
+    extract_hog_features_batch(crops, hog_params, out=out)  # warm-up
+    start = time.perf_counter()
+    extract_hog_features_batch(crops, hog_params, out=out)
+    batch_s = time.perf_counter() - start
+
+    print_report({
+        "crops": len(crops),
+        "hog_params": hog_params,
+        "max_abs_diff": max_diff,
+        "skimage_single": summarize(skimage_times),
+        "fast_single": summarize(fast_times),
+        "fast_batch_crops_per_s": len(crops) / batch_s,
+    })
+
+    if max_diff > args.atol:
+        raise SystemExit(f"✗ fast HOG differs from skimage by {max_diff:g}")
+
+
+if __name__ == "__main__":
+    main()
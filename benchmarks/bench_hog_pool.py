@@ -0,0 +1,78 @@
+"""
+Scaling of the HOG batch pipeline (decode -> detection -> HOG -> SVM) with
+the number of worker processes. The example folder is repeated up to
+--images files, each run starts with an empty crop store so every image is
+detected, and results must match the single-process run.
+
+    python -m benchmarks.bench_hog_pool [--images 10000] [--workers 1 2 4 8] [--detector yolo]
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.timing import print_report
+from common.crop_store import CropStore
+from common.hand_detectors import available_detectors
+from HOG_SVM.fused_classifier import load_hog_bundle
+from HOG_SVM.hog_pool import CHUNK_SIZE, get_pool, iter_predict_files, shutdown_pools
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--images", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--detector", default="yolo", choices=available_detectors())
+    args = parser.parse_args()
+
+    folder = [
+        p for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+    paths = (folder * (args.images // len(folder) + 1))[:args.images]
+    bundle = load_hog_bundle()
+
+    report = {"images": len(paths), "cores": cores, "detector": args.detector, "runs": {}}
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            run_dir = Path(tmp) / f"w{workers}"
+            run_dir.mkdir()
+            store = CropStore(str(run_dir / "crops.bin"), str(run_dir / "crops.sqlite"))
+
+            if workers > 1:
+                # Pool start-up (spawn + model load) is paid once per server
+                pool = get_pool(bundle["model_file"], args.detector, workers, store.data_path)
+                pool.map(abs, range(workers))
+
+            start = time.perf_counter()
+            results = list(iter_predict_files(paths, bundle, args.detector, workers,
+                                              chunk_size=args.chunk_size, store=store))
+            elapsed = time.perf_counter() - start
+
+            reference = reference or results
+            report["runs"][workers] = {
+                "total_s": elapsed,
+                "images_per_s": len(paths) / elapsed,
+                "matches_single_process": results == reference,
+            }
+            shutdown_pools()
+
+    base = report["runs"][args.workers[0]]["images_per_s"]
+    for run in report["runs"].values():
+        run["speedup"] = run["images_per_s"] / base
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
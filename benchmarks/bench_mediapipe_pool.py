@@ -0,0 +1,59 @@
+"""
+Per-frame latency of MediaPipe hand cropping: a fresh Hands graph per call
+(previous behaviour) versus the pooled instance from common.mediapipe_hands.
+
+    python -m benchmarks.bench_mediapipe_pool [--folder example_signs] [--repeat 3]
+"""
+import argparse
+from pathlib import Path
+
+import cv2
+import mediapipe as mp
+
+from benchmarks.timing import print_report, summarize, time_calls
+from common.mediapipe_hands import close_hands, crop_hand_mediapipe, landmarks_bbox
+
+
+def crop_fresh_graph(img, min_detection_confidence=0.5, pad=20):
+    """The per-call `with mp_hands.Hands(...)` pattern the crop helpers used."""
+    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    h, w, _ = img.shape
+    with mp.solutions.hands.Hands(static_image_mode=True,
+                                  max_num_hands=1,
+                                  min_detection_confidence=min_detection_confidence) as hands:
+        results = hands.process(img_rgb)
+        if not results.multi_hand_landmarks:
+            return img_rgb, False
+        x_min, y_min, x_max, y_max = landmarks_bbox(results.multi_hand_landmarks, w, h)
+        x_min, y_min = max(0, x_min - pad), max(0, y_min - pad)
+        x_max, y_max = min(w, x_max + pad), min(h, y_max + pad)
+        return img_rgb[y_min:y_max, x_min:x_max], True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = [
+        cv2.imread(str(p)) for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+    frames = [f for f in frames if f is not None] * args.repeat
+
+    before = time_calls(crop_fresh_graph, frames)
+    after = time_calls(lambda f: crop_hand_mediapipe(f, min_detection_confidence=0.5), frames)
+    close_hands()
+
+    before_s, after_s = summarize(before), summarize(after)
+    print_report({
+        "frames": len(frames),
+        "fresh_graph_per_call": before_s,
+        "pooled_graph": after_s,
+        "speedup_p50": before_s["p50_ms"] / after_s["p50_ms"],
+    })
+
+
+if __name__ == "__main__":
+    main()
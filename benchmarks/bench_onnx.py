@@ -0,0 +1,82 @@
+"""
+ONNX Runtime against fastai for the CNN classifier: parity of the class
+probabilities on example_signs and single / batched latency.
+
+    python -m benchmarks.bench_onnx [--folder example_signs] [--detector yolo]
+                                    [--model CNN/weights/arabic_sign_resnet342.pkl]
+                                    [--onnx CNN/weights/arabic_sign_resnet342.onnx]
+
+The .onnx file is exported first if it does not exist. Parity reports the
+largest absolute probability difference and top-1 / top-3 agreement.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.timing import print_report, summarize, time_calls
+from CNN.learner import CNN_MODEL_FILE, read_learner
+from CNN.onnx_model import ONNX_MODEL_FILE, OnnxLearner, export_onnx
+from CNN.predict_sign import _forward, predict_crop
+from common.hand_detectors import get_hand_detector
+
+BATCH = 16
+
+
+def parity(reference, candidate):
+    """Probability and ranking agreement between two (N, C) arrays."""
+    ref, cand = np.asarray(reference, dtype=np.float32), np.asarray(candidate, dtype=np.float32)
+    top3_ref = np.argsort(-ref, axis=1)[:, :3]
+    top3_cand = np.argsort(-cand, axis=1)[:, :3]
+    return {
+        "max_abs_prob_diff": float(np.abs(ref - cand).max()),
+        "top1_agreement": float((ref.argmax(1) == cand.argmax(1)).mean()),
+        "top3_agreement": float(np.mean([set(a) == set(b) for a, b in zip(top3_ref, top3_cand)])),
+    }
+
+
+def latency(learn, crops):
+    batches = [crops[i:i + BATCH] for i in range(0, len(crops) - BATCH + 1, BATCH)] or [crops]
+    single = summarize(time_calls(lambda c: predict_crop(c, learn), crops))
+    batched = summarize(time_calls(lambda b: _forward(b, learn), batches))
+    batched["images_per_s"] = batched["per_sec"] * len(batches[0])
+    return {"single": single, "batch": batched}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--detector", default="yolo")
+    parser.add_argument("--model", default=CNN_MODEL_FILE)
+    parser.add_argument("--onnx", default=ONNX_MODEL_FILE)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    learn = read_learner(args.model)
+    if not Path(args.onnx).exists():
+        export_onnx(learn, args.onnx)
+    onnx_learn = OnnxLearner(args.onnx)
+
+    detector = get_hand_detector(args.detector)
+    crops = [detector.crop(str(p))[0] for p in sorted(Path(args.folder).iterdir())
+             if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}]
+
+    report = {
+        "images": len(crops),
+        "parity": parity(_forward(crops, learn), _forward(crops, onnx_learn)),
+        "fastai": latency(learn, crops * args.repeat),
+        "onnxruntime": latency(onnx_learn, crops * args.repeat),
+    }
+    for mode in ("single", "batch"):
+        report[f"speedup_{mode}_p50"] = (report["fastai"][mode]["p50_ms"]
+                                         / report["onnxruntime"][mode]["p50_ms"])
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+INT8 against FP32 for the CNN classifier (both on ONNX Runtime): top-1 /
+top-3 agreement on cropped hands, single / batched latency, model size and
+the resident memory a loaded, warmed-up session adds.
+
+    python -m benchmarks.bench_quantized [--folder example_signs] [--detector yolo]
+                                         [--fp32 CNN/weights/arabic_sign_resnet342.onnx]
+                                         [--int8 CNN/weights/arabic_sign_resnet342.int8.onnx]
+
+Create the models first with python -m CNN.onnx_model and python -m CNN.quantize.
+Memory is measured in a fresh process per model so the two do not share
+allocator state.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import multiprocessing
+import os
+
+from benchmarks.bench_onnx import latency, parity
+from benchmarks.timing import print_report
+from CNN.onnx_model import INT8_MODEL_FILE, ONNX_MODEL_FILE, OnnxLearner
+from CNN.quantize import calibration_crops
+
+
+def rss_mb():
+    """Resident set size of this process (Linux /proc; 0 elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return 0.0
+
+
+def _session_memory(path, crops):
+    import onnxruntime  # noqa: F401  (library pages are not the model's)
+
+    before = rss_mb()
+    learn = OnnxLearner(path)
+    loaded = rss_mb()
+    learn.predict_batch(crops)
+    return {"load_mb": loaded - before, "after_batch_mb": rss_mb() - before}
+
+
+def session_memory(path, crops):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_session_memory, (path, crops))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--detector", default="yolo")
+    parser.add_argument("--fp32", default=ONNX_MODEL_FILE)
+    parser.add_argument("--int8", default=INT8_MODEL_FILE)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    crops = calibration_crops(args.folder, args.detector)
+    if not crops:
+        raise SystemExit(f"no hands detected in {args.folder}")
+
+    fp32, int8 = OnnxLearner(args.fp32), OnnxLearner(args.int8)
+    report = {
+        "images": len(crops),
+        "agreement": parity(fp32.predict_batch(crops), int8.predict_batch(crops)),
+        "latency": {"fp32": latency(fp32, crops * args.repeat),
+                    "int8": latency(int8, crops * args.repeat)},
+        "model_mb": {"fp32": os.path.getsize(args.fp32) / 1e6,
+                     "int8": os.path.getsize(args.int8) / 1e6},
+        "memory": {"fp32": session_memory(args.fp32, crops[:16]),
+                   "int8": session_memory(args.int8, crops[:16])},
+    }
+    lat = report["latency"]
+    report["speedup_p50"] = {mode: lat["fp32"][mode]["p50_ms"] / lat["int8"][mode]["p50_ms"]
+                             for mode in ("single", "batch")}
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
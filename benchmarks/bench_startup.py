@@ -0,0 +1,140 @@
+"""
+App startup cost, each scenario measured in a fresh interpreter:
+
+  * import time of the modules each Model / Input Mode pulls in
+  * time to first render of streamlit.py (AppTest) per mode, webcam idle
+  * first-inference latency of each model on a synthetic frame, cold vs warm
+
+    python -m benchmarks.bench_startup [--skip-cnn]
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.timing import print_report
+from common.entrypoint import REPO_ROOT
+
+PRELUDE = """
+import json, sys, time
+sys.path.append({root!r})
+t0 = time.perf_counter()
+"""
+
+IMPORTS = {
+    "app_shell": "import streamlit, common.warmup",
+    "cnn_batch": "import CNN.batch_prediction",
+    "cnn_webcam": "import CNN.webcam",
+    "hog_batch": "import HOG_SVM.hog_batch_prediction",
+    "hog_webcam": "import HOG_SVM.hog_webcam",
+}
+
+RENDER = """
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=600)
+at.session_state["input_mode"] = {input_mode!r}
+at.session_state["model_mode"] = {model_mode!r}
+at.run()
+print(json.dumps({{"seconds": time.perf_counter() - t0, "exceptions": len(at.exception)}}))
+"""
+
+FIRST_INFERENCE = {
+    "cnn": """
+from fastai.vision.all import PILImage, load_learner
+from common.warmup import synthetic_frame
+learn = load_learner("CNN/weights/arabic_sign_resnet342.pkl", cpu=True)
+load = time.perf_counter() - t0
+img = PILImage.create(synthetic_frame(224, 224))
+t1 = time.perf_counter(); learn.predict(img); cold = time.perf_counter() - t1
+t1 = time.perf_counter(); learn.predict(img); warm = time.perf_counter() - t1
+print(json.dumps({"load_s": load, "first_s": cold, "second_s": warm}))
+""",
+    "yolo": """
+from CNN.crop_hand import crop_hand, get_detector
+from common.warmup import synthetic_frame
+get_detector()
+load = time.perf_counter() - t0
+frame = synthetic_frame()
+t1 = time.perf_counter(); crop_hand(frame); cold = time.perf_counter() - t1
+t1 = time.perf_counter(); crop_hand(frame); warm = time.perf_counter() - t1
+print(json.dumps({"load_s": load, "first_s": cold, "second_s": warm}))
+""",
+    "mediapipe": """
+from CNN.crop_hand_cam import crop_hand_cam
+from common.warmup import synthetic_frame
+frame = synthetic_frame()
+load = time.perf_counter() - t0
+t1 = time.perf_counter(); crop_hand_cam(frame); cold = time.perf_counter() - t1
+t1 = time.perf_counter(); crop_hand_cam(frame); warm = time.perf_counter() - t1
+print(json.dumps({"load_s": load, "first_s": cold, "second_s": warm}))
+""",
+    "hog": """
+from HOG_SVM.hog_bundle import read_hog_bundle
+from HOG_SVM.fused_classifier import compile_fused_classifier, fused_decision_function
+from HOG_SVM.fast_hog import extract_hog_features_fast
+from common.warmup import synthetic_frame
+bundle = read_hog_bundle(); fused = compile_fused_classifier(bundle)
+load = time.perf_counter() - t0
+crop = synthetic_frame(200, 200)
+t1 = time.perf_counter()
+fused_decision_function(fused, extract_hog_features_fast(crop, bundle["hog_params"]))
+cold = time.perf_counter() - t1
+t1 = time.perf_counter()
+fused_decision_function(fused, extract_hog_features_fast(crop, bundle["hog_params"]))
+warm = time.perf_counter() - t1
+print(json.dumps({"load_s": load, "first_s": cold, "second_s": warm}))
+""",
+}
+
+
+def run_snippet(body):
+    code = PRELUDE.format(root=str(REPO_ROOT)) + body
+    proc = subprocess.run(
+        [sys.executable, "-P", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+        env={"SIGN_APP_WARMUP": "0", **os.environ},
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skip-cnn", action="store_true",
+                        help="skip scenarios that need fastai / torch")
+    args = parser.parse_args()
+
+    report = {"import_s": {}, "first_render_s": {}, "first_inference": {}}
+
+    for name, stmt in IMPORTS.items():
+        if args.skip_cnn and name.startswith("cnn"):
+            continue
+        report["import_s"][name] = run_snippet(
+            stmt + '\nprint(json.dumps({"seconds": time.perf_counter() - t0}))'
+        )
+
+    for model_mode in ("CNN", "HOG + SVM"):
+        if args.skip_cnn and model_mode == "CNN":
+            continue
+        for input_mode in ("Webcam", "Batch Prediction"):
+            report["first_render_s"][f"{model_mode} / {input_mode}"] = run_snippet(
+                RENDER.format(script=str(REPO_ROOT / "streamlit.py"),
+                              input_mode=input_mode, model_mode=model_mode)
+            )
+
+    for name, body in FIRST_INFERENCE.items():
+        if args.skip_cnn and name == "cnn":
+            continue
+        report["first_inference"][name] = run_snippet(body)
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Server-side cost and bytes per prediction card: the original file (which
+Streamlit decodes, resizes to the card width and re-encodes on every
+rerun) against the cached thumbnail (shipped as-is once written).
+
+    python -m benchmarks.bench_thumbnails [--folder example_signs]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+import common.thumbnails as thumbnails
+from benchmarks.timing import print_report, summarize
+
+
+def streamlit_resize(data, width):
+    """What st.image does with an image wider than `width`."""
+    im = Image.open(io.BytesIO(data))
+    if im.size[0] <= width:
+        return data
+    im = im.resize((width, int(im.size[1] * width / im.size[0])), resample=Image.BILINEAR)
+    out = io.BytesIO()
+    im.convert("RGB").save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folder", default="example_signs")
+    args = parser.parse_args()
+
+    paths = [
+        p for p in sorted(Path(args.folder).iterdir())
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    ]
+    width = thumbnails.THUMB_WIDTH
+
+    original_s, original_bytes = [], 0
+    for p in paths:
+        start = time.perf_counter()
+        original_bytes += len(streamlit_resize(p.read_bytes(), width))
+        original_s.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        thumbnails.THUMB_DIR = tmp
+        cold_s, warm_s, thumb_bytes = [], [], 0
+        for p in paths:
+            start = time.perf_counter()
+            thumbnails.thumbnail(p)
+            cold_s.append(time.perf_counter() - start)
+        for p in paths:
+            start = time.perf_counter()
+            out = thumbnails.thumbnail(p)
+            with open(out, "rb") as f:
+                data = f.read()
+            # st.image still opens the header to check size and format
+            assert streamlit_resize(data, width) is data
+            warm_s.append(time.perf_counter() - start)
+            thumb_bytes += os.path.getsize(out)
+
+    print_report({
+        "images": len(paths),
+        "card_width": width,
+        "original_per_rerun": {**summarize(original_s), "bytes": original_bytes},
+        "thumbnail_first_run": summarize(cold_s),
+        "thumbnail_per_rerun": {**summarize(warm_s), "bytes": thumb_bytes},
+    })
+
+
+if __name__ == "__main__":
+    main()
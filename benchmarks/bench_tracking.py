@@ -0,0 +1,61 @@
+"""
+Webcam FPS and per-frame hand detection latency for static (detect every
+frame) versus tracking MediaPipe modes.
+
+    python -m benchmarks.bench_tracking [--source 0 | --source clip.mp4] [--frames 300]
+"""
+import argparse
+import time
+
+import cv2
+
+from benchmarks.timing import print_report, summarize
+from common.mediapipe_hands import HandTracker, close_hands, crop_hand_mediapipe
+
+
+def run_mode(source, frames, static_image_mode):
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    detect_times = []
+    hands_found = 0
+    tracker = None if static_image_mode else HandTracker(min_detection_confidence=0.3)
+
+    start = time.perf_counter()
+    while len(detect_times) < frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        t0 = time.perf_counter()
+        _, found = crop_hand_mediapipe(frame, min_detection_confidence=0.3,
+                                       tracker=tracker)
+        detect_times.append(time.perf_counter() - t0)
+        hands_found += found
+    elapsed = time.perf_counter() - start
+
+    cap.release()
+    close_hands()
+    if tracker is not None:
+        tracker.close()
+
+    return {
+        "frames": len(detect_times),
+        "fps": len(detect_times) / elapsed if elapsed else 0.0,
+        "hand_rate": hands_found / max(1, len(detect_times)),
+        "detection": summarize(detect_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    print_report({
+        "source": args.source,
+        "static": run_mode(args.source, args.frames, static_image_mode=True),
+        "tracking": run_mode(args.source, args.frames, static_image_mode=False),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Recall and latency of the YOLO hand detector per export format, input size
+and precision, on example_signs (every image there shows a hand).
+
+    python -m benchmarks.bench_yolo_export [--formats pt onnx openvino]
+                                           [--imgsz 320 416 640] [--int8] [--export]
+
+recall is the share of images with a detected hand; iou is the mean IoU of
+the best box with the one the .pt model finds at 640 (the current
+detector), over images where both found a hand. Exports that do not exist
+are skipped unless --export creates them (python -m CNN.yolo_export).
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.timing import print_report, summarize, time_calls
+from CNN.crop_hand import YOLO_MODEL_FILE, YOLOv8HandDetector
+from CNN.yolo_export import export, exported_model_path
+
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def best_boxes(detector, images):
+    boxes = []
+    for img in images:
+        result = detector.detect(img)
+        found = result and result["num_hands_detected"]
+        boxes.append(result["boxes"][result["confidences"].argmax()].tolist() if found else None)
+    return boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--formats", nargs="+", default=["pt", "onnx", "openvino"])
+    parser.add_argument("--imgsz", type=int, nargs="+", default=[320, 416, 640])
+    parser.add_argument("--int8", action="store_true", help="also run the INT8 exports")
+    parser.add_argument("--export", action="store_true", help="create missing exports")
+    args = parser.parse_args()
+
+    images = [cv2.imread(str(p)) for p in sorted(Path(args.folder).iterdir())
+              if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}]
+
+    reference = YOLOv8HandDetector(YOLO_MODEL_FILE, 640)
+    if not reference.available:
+        raise SystemExit("ultralytics / YOLO weights not available")
+    ref_boxes = best_boxes(reference, images)
+
+    rows, skipped = [], {}
+    for fmt in args.formats:
+        for imgsz in args.imgsz:
+            for int8 in ((False, True) if args.int8 and fmt != "pt" else (False,)):
+                name = f"{fmt}@{imgsz}{' int8' if int8 else ''}"
+                path = YOLO_MODEL_FILE if fmt == "pt" else exported_model_path(fmt, imgsz, int8)
+                if not Path(path).exists():
+                    if not args.export:
+                        skipped[name] = f"{path} not found"
+                        continue
+                    path = export(fmt, imgsz, int8, calibration=args.folder)
+
+                detector = YOLOv8HandDetector(path, imgsz)
+                boxes = best_boxes(detector, images)
+                ious = [iou(a, b) for a, b in zip(boxes, ref_boxes) if a and b]
+                rows.append({
+                    "model": name,
+                    "recall": sum(b is not None for b in boxes) / len(images),
+                    "iou_vs_pt640": float(np.mean(ious)) if ious else None,
+                    **summarize(time_calls(detector.detect, images)),
+                })
+
+    print("| model | recall | IoU vs pt@640 | p50 ms | p95 ms | img/s |")
+    print("|---|---:|---:|---:|---:|---:|")
+    for r in rows:
+        iou_text = f"{r['iou_vs_pt640']:.3f}" if r["iou_vs_pt640"] is not None else "—"
+        print(f"| {r['model']} | {r['recall']:.1%} | {iou_text} | {r['p50_ms']:.1f} "
+              f"| {r['p95_ms']:.1f} | {r['per_sec']:.1f} |")
+    print_report({"images": len(images), "results": rows, "skipped": skipped})
+
+
+if __name__ == "__main__":
+    main()
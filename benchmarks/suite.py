@@ -0,0 +1,299 @@
+"""
+End-to-end benchmark suite for both pipelines, stage by stage.
+
+Runs over example_signs and synthetic 720p frames and times each stage on
+its own, single-item and batched: decode, hand detection (YOLO .pt and
+CPU export, MediaPipe), crop, HOG (skimage and vectorized),
+scaler/selector/SVM (sklearn and fused), fastai preprocessing, ResNet
+forward (fastai, ONNX Runtime FP32 / INT8), overlay rendering, display
+encoding (downscale + JPEG), and the end-to-end single-image calls. Every
+stage reports p50/p95/p99 latency and throughput. Stages whose dependency
+or weights are missing are listed as skipped.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json [--tolerance 0.15]
+    python -m benchmarks.suite --current new.json --compare bench.json
+
+--compare flags stages whose p50 or p95 grew by more than --tolerance over
+the baseline and exits with status 1 if there is any.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.timing import print_report, summarize, time_calls
+from common.warmup import synthetic_frame
+
+BATCH = 16
+COMPARED = ("p50_ms", "p95_ms")
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+def _stage(samples, mode="single", items_per_call=1):
+    stats = summarize(samples)
+    stats["mode"] = mode
+    stats["items_per_s"] = stats["per_sec"] * items_per_call
+    return stats
+
+
+def _batches(items, size=BATCH):
+    return [items[i:i + size] for i in range(0, len(items) - size + 1, size)] or [items]
+
+
+def _overlay(frame, label="alef", conf=87.5):
+    """Per-frame drawing of the webcam views (mirror, text, confidence bar, RGB)."""
+    display = cv2.flip(frame, 1)
+    color = (0, 165, 255)
+    cv2.putText(display, f"✓ {label} ({conf:.1f}%)", (10, 40),
+                cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+    h, w = display.shape[:2]
+    cv2.rectangle(display, (0, h - 20), (int(w * conf / 100), h - 10), color, -1)
+    cv2.rectangle(display, (0, h - 20), (w, h - 10), (200, 200, 200), 2)
+    return cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
+
+
+def _meta():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+
+
+# ===========================================
+# STAGES
+# ===========================================
+def run_suite(folder, n_frames, repeat):
+    stages, skipped = {}, {}
+    paths = [str(p) for p in sorted(Path(folder).iterdir())
+             if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}] * repeat
+    frames = [synthetic_frame(seed=i) for i in range(n_frames)]
+
+    # --- Decode ---
+    stages["decode"] = _stage(time_calls(cv2.imread, paths))
+    images = [cv2.imread(p) for p in paths]
+
+    # --- Hand detection ---
+    from common.hand_detectors import get_hand_detector
+
+    crops = []
+    for name in ("yolo", "yolo_export", "mediapipe", "mediapipe_track"):
+        detector = get_hand_detector(name)
+        if name.startswith("yolo") and not detector.model.available:
+            skipped[f"detect_{name}"] = f"ultralytics / {detector.model_path} not available"
+            continue
+        stages[f"detect_{name}"] = _stage(time_calls(detector.detect, images))
+        stages[f"detect_{name}_720p"] = _stage(time_calls(detector.detect, frames))
+        if name.startswith("yolo"):
+            stages[f"detect_{name}_batch"] = _stage(
+                time_calls(detector.detect_batch, _batches(images)), "batch", BATCH)
+
+        if name == "mediapipe":
+            # --- Crop (colour conversion + padded slice of a found hand) ---
+            found = [(img, r.best.bbox) for img, r in
+                     ((img, detector.detect(img)) for img in images) if r.best]
+
+            def crop(item, pad=20):
+                img, (x1, y1, x2, y2) = item
+                rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                return rgb[max(0, y1 - pad):y2 + pad, max(0, x1 - pad):x2 + pad]
+
+            if found:
+                stages["crop"] = _stage(time_calls(crop, found))
+                crops = [crop(item) for item in found]
+
+    if not crops:
+        skipped["hog"] = skipped["svm"] = "no hands detected to classify"
+    else:
+        _hog_stages(stages, crops)
+
+    cnn_crops = crops or [cv2.cvtColor(i, cv2.COLOR_BGR2RGB) for i in images]
+    _cnn_stages(stages, skipped, cnn_crops)
+    _onnx_stages(stages, skipped, cnn_crops)
+
+    # --- Overlay rendering ---
+    stages["overlay_720p"] = _stage(time_calls(_overlay, frames))
+    from common.frame_display import FrameDisplay
+
+    stages["display_encode_720p"] = _stage(time_calls(FrameDisplay(None).encode, frames))
+
+    # --- End to end, one image at a time ---
+    from HOG_SVM.fused_classifier import load_hog_bundle
+    from HOG_SVM.predict_sign import predict_sign_hog
+
+    b = load_hog_bundle()
+    stages["e2e_hog_mediapipe"] = _stage(time_calls(
+        lambda img: predict_sign_hog(img, b["svm"], b["scaler"], b["selector"],
+                                     b["inv_label_map"], b["hog_params"], mode="cam",
+                                     fused=b["fused"]),
+        images))
+
+    return stages, skipped
+
+
+def _hog_stages(stages, crops):
+    from HOG_SVM.fast_hog import extract_hog_features_batch, extract_hog_features_fast
+    from HOG_SVM.fused_classifier import fused_decision_function, load_hog_bundle
+    from HOG_SVM.hog_features import extract_hog_features
+
+    bundle = load_hog_bundle()
+    params = bundle["hog_params"]
+    svm, scaler, selector, fused = (bundle["svm"], bundle["scaler"],
+                                    bundle["selector"], bundle["fused"])
+
+    # --- HOG extraction ---
+    stages["hog_skimage"] = _stage(time_calls(lambda c: extract_hog_features(c, params), crops))
+    stages["hog_fast"] = _stage(time_calls(lambda c: extract_hog_features_fast(c, params), crops))
+    stages["hog_fast_batch"] = _stage(
+        time_calls(lambda b: extract_hog_features_batch(b, params), _batches(crops)),
+        "batch", BATCH)
+
+    # --- Scaler / selector / SVM ---
+    feats = extract_hog_features_batch(crops, params)
+    rows = [f[None, :] for f in feats]
+
+    def sklearn(x):
+        return svm.decision_function(selector.transform(scaler.transform(x)))
+
+    stages["svm_sklearn"] = _stage(time_calls(sklearn, rows))
+    stages["svm_sklearn_batch"] = _stage(time_calls(sklearn, _batches(feats)), "batch", BATCH)
+    stages["svm_fused"] = _stage(time_calls(lambda x: fused_decision_function(fused, x), rows))
+    stages["svm_fused_batch"] = _stage(
+        time_calls(lambda x: fused_decision_function(fused, x), _batches(feats)), "batch", BATCH)
+
+
+def _cnn_stages(stages, skipped, crops):
+    from CNN.learner import CNN_MODEL_FILE, read_learner
+
+    if not Path(CNN_MODEL_FILE).exists():
+        skipped["cnn"] = f"{CNN_MODEL_FILE} not found"
+        return
+    try:
+        learn = read_learner(CNN_MODEL_FILE)
+    except ImportError as e:
+        skipped["cnn"] = f"fastai not available: {e}"
+        return
+
+    import torch
+    from fastai.vision.all import PILImage
+
+    def preprocess(batch):
+        dl = learn.dls.test_dl([PILImage.create(c) for c in batch], bs=len(batch), num_workers=0)
+        return dl.one_batch()[0]
+
+    def forward(x):
+        with torch.no_grad():
+            return learn.model(x)
+
+    singles = [[c] for c in crops]
+    batches = _batches(crops)
+    stages["cnn_preprocess"] = _stage(time_calls(preprocess, singles))
+    stages["cnn_preprocess_batch"] = _stage(time_calls(preprocess, batches), "batch", BATCH)
+
+    learn.model.eval()
+    stages["cnn_forward"] = _stage(time_calls(forward, [preprocess(b) for b in singles]))
+    stages["cnn_forward_batch"] = _stage(
+        time_calls(forward, [preprocess(b) for b in batches]), "batch", BATCH)
+
+    stages["e2e_cnn_predict"] = _stage(
+        time_calls(lambda c: learn.predict(PILImage.create(c)), crops))
+
+
+def _onnx_stages(stages, skipped, crops):
+    from CNN.onnx_model import INT8_MODEL_FILE, ONNX_MODEL_FILE, OnnxLearner
+
+    for name, path, made_by in (("cnn_onnx", ONNX_MODEL_FILE, "CNN.onnx_model"),
+                                ("cnn_onnx_int8", INT8_MODEL_FILE, "CNN.quantize")):
+        if not Path(path).exists():
+            skipped[name] = f"{path} not found (python -m {made_by})"
+            continue
+        try:
+            learn = OnnxLearner(path)
+        except ImportError as e:
+            skipped[name] = f"onnxruntime not available: {e}"
+            continue
+
+        stages[f"{name}_preprocess"] = _stage(time_calls(lambda c: learn.preprocess([c]), crops))
+        stages[f"{name}_predict"] = _stage(time_calls(learn.predict, crops))
+        stages[f"{name}_predict_batch"] = _stage(
+            time_calls(learn.predict_batch, _batches(crops)), "batch", BATCH)
+
+
+# ===========================================
+# BASELINE COMPARISON
+# ===========================================
+def compare(current, baseline, tolerance):
+    """Per-stage ratios current/baseline; regressions exceed 1 + tolerance."""
+    report, regressions = {}, []
+    for name, stats in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if not base:
+            continue
+        ratios = {m: stats[m] / base[m] for m in COMPARED if base.get(m)}
+        regressed = [m for m, r in ratios.items() if r > 1 + tolerance]
+        report[name] = {m: round(r, 3) for m, r in ratios.items()}
+        if regressed:
+            report[name]["regressed"] = regressed
+            regressions.append(name)
+    return report, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="example_signs")
+    parser.add_argument("--frames", type=int, default=30, help="synthetic 720p frames")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the folder")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--current", help="compare this results file instead of running")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed relative slowdown before a stage is flagged")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current) as f:
+            results = json.load(f)
+    else:
+        stages, skipped = run_suite(args.folder, args.frames, args.repeat)
+        results = {"meta": _meta(), "stages": stages, "skipped": skipped}
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        print_report(results)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report, regressions = compare(results, baseline, args.tolerance)
+        print_report({"baseline": baseline.get("meta", {}), "ratios": report,
+                      "regressions": regressions})
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
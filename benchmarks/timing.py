@@ -0,0 +1,37 @@
+import json
+import time
+
+import numpy as np
+
+
+def summarize(samples):
+    """Latency summary (milliseconds) for a list of durations in seconds."""
+    ms = np.asarray(samples, dtype=np.float64) * 1000.0
+    if ms.size == 0:
+        return {"n": 0}
+    total = float(ms.sum()) / 1000.0
+    return {
+        "n": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "per_sec": ms.size / total if total > 0 else float("inf"),
+    }
+
+
+def time_calls(fn, items, warmup=1):
+    """Call fn(item) for every item and return the per-call durations."""
+    for item in items[:warmup]:
+        fn(item)
+
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_report(report):
+    print(json.dumps(report, indent=2, default=str))
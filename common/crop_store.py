@@ -0,0 +1,302 @@
+"""
+Persistent store of hand detections and crops shared by the CNN and HOG
+batch pipelines.
+
+For every (image sha256, detector cache_key) it keeps the bbox, the
+confidence and the cropped pixels. The pixels of all crops are appended to
+one flat file that is read back through np.memmap, so a stored crop costs
+neither a decode nor a detection and is only paged in when it is used.
+Switching classifiers or re-running a folder therefore skips detection.
+
+The index is SQLite; the data file is append-only. Offsets come from the
+end of the data file at write time, so every append and its index insert
+happen under an exclusive lock on a sidecar .lock file: several processes
+(the Streamlit server, CLI runs, benchmarks) may write the same store.
+Pool workers never write; they send new crops back to their parent.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import cv2
+import numpy as np
+
+from common.file_hash import file_sha256
+from common.prediction_cache import CACHE_DIR
+
+CROP_DATA_FILE = os.path.join(CACHE_DIR, "crops.bin")
+CROP_INDEX_FILE = os.path.join(CACHE_DIR, "crops.sqlite")
+# Images decoded and sent through the detector together on a store miss
+DETECT_BATCH = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crops (
+    image_hash TEXT NOT NULL,
+    detector   TEXT NOT NULL,
+    hand       INTEGER NOT NULL,
+    x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER,
+    confidence REAL,
+    offset     INTEGER NOT NULL,
+    height     INTEGER NOT NULL,
+    width      INTEGER NOT NULL,
+    created    REAL NOT NULL,
+    PRIMARY KEY (image_hash, detector)
+)
+"""
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive inter-process lock held on `path` for the duration of the block."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@dataclass
+class CropRecord:
+    hand_detected: bool
+    bbox: Optional[tuple] = None      # (x1, y1, x2, y2) of the detection
+    confidence: Optional[float] = None
+    offset: int = -1                  # byte offset in the data file, -1 = no crop
+    shape: tuple = (0, 0, 3)
+
+
+class CropReader:
+    """
+    Read-only access to the crop data file. Holds no SQLite handle, so pool
+    workers can read crops the parent looked up in the index.
+    """
+
+    def __init__(self, data_path=CROP_DATA_FILE):
+        self.data_path = data_path
+        self._lock = threading.Lock()
+        self._mmap = None
+
+    def read(self, record):
+        size = int(np.prod(record.shape))
+        end = record.offset + size
+        with self._lock:
+            if self._mmap is None or self._mmap.size < end:
+                # The data file grew since it was mapped
+                self._mmap = np.memmap(self.data_path, dtype=np.uint8, mode="r")
+            mm = self._mmap
+        return mm[record.offset:end].reshape(record.shape)
+
+
+class CropStore:
+    def __init__(self, data_path=CROP_DATA_FILE, index_path=CROP_INDEX_FILE):
+        os.makedirs(os.path.dirname(data_path) or ".", exist_ok=True)
+        self.data_path = data_path
+        self.lock_path = f"{data_path}.lock"
+        open(data_path, "ab").close()
+
+        self._conn = sqlite3.connect(index_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.reader = CropReader(data_path)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, image_hashes, detector):
+        """{image_hash: CropRecord} for the hashes that are stored."""
+        found = {}
+        hashes = list(set(image_hashes))
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT image_hash, hand, x1, y1, x2, y2, confidence, offset, height, width "
+                    "FROM crops WHERE detector = ? "
+                    f"AND image_hash IN ({','.join('?' * len(chunk))})",
+                    (detector, *chunk)
+                ).fetchall()
+                for h, hand, x1, y1, x2, y2, conf, offset, height, width in rows:
+                    found[h] = CropRecord(
+                        bool(hand),
+                        (x1, y1, x2, y2) if hand else None,
+                        conf, offset, (height, width, 3)
+                    )
+        return found
+
+    def put_many(self, entries, detector):
+        """
+        entries: iterable of (image_hash, crop, hand_detected, detection).
+        Only crops of detected hands are stored; the full image of a no-hand
+        result is the source file itself.
+        """
+        now = time.time()
+        rows = []
+        # Thread lock for this process's connection, file lock for other writers
+        with self._lock, _file_lock(self.lock_path):
+            with open(self.data_path, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                for image_hash, crop, hand_detected, detection in entries:
+                    if not hand_detected:
+                        rows.append((image_hash, detector, 0, None, None, None, None,
+                                     None, -1, 0, 0, now))
+                        continue
+                    pixels = np.ascontiguousarray(crop, dtype=np.uint8)
+                    offset = f.tell()
+                    f.write(pixels.tobytes())
+                    rows.append((image_hash, detector, 1, *map(int, detection.bbox),
+                                 float(detection.confidence), offset,
+                                 pixels.shape[0], pixels.shape[1], now))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO crops VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def read(self, record):
+        """Read-only view of a stored crop (no copy until it is modified)."""
+        return self.reader.read(record)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_crop_store():
+    """Process-wide crop store (shared by all Streamlit sessions)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CropStore()
+    return _store
+
+
+def _detect_crops(imgs, detector, pad):
+    """crop_with_detection_batch, falling back to one image at a time to find a failure."""
+    try:
+        return detector.crop_with_detection_batch(imgs, pad)
+    except Exception:
+        crops = []
+        for img in imgs:
+            try:
+                crops.append(detector.crop_with_detection(img, pad))
+            except Exception as e:
+                crops.append(e)
+        return crops
+
+
+def load_crops(paths, records, detector, reader, pad=20):
+    """
+    Crops of image files given their store records (None when not stored).
+    Returns one (loaded, error) per path: loaded is (crop, hand_detected,
+    detection), where detection is a HandDetection only when detection had
+    to run (and found a hand), or None when the image cannot be read or
+    detection failed (error then holds the exception). Images that need
+    detection go through the detector DETECT_BATCH at a time.
+    """
+    out = [None] * len(paths)
+    pending = []
+    for i, (path, record) in enumerate(zip(paths, records)):
+        if record is None:
+            pending.append(i)
+        elif record.hand_detected:
+            out[i] = (reader.read(record), True, None), None
+        else:
+            # Known no-hand image: the "crop" is the full frame
+            img = cv2.imread(str(path))
+            if img is not None and detector.crop_rgb:
+                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            out[i] = (None if img is None else (img, False, None)), None
+
+    for start in range(0, len(pending), DETECT_BATCH):
+        chunk, imgs = [], []
+        for i in pending[start:start + DETECT_BATCH]:
+            img = cv2.imread(str(paths[i]))
+            if img is None:
+                out[i] = None, None
+            else:
+                chunk.append(i)
+                imgs.append(img)
+        if not imgs:
+            continue
+        for i, crop in zip(chunk, _detect_crops(imgs, detector, pad)):
+            out[i] = (None, crop) if isinstance(crop, Exception) else (crop, None)
+    return out
+
+
+def load_crop(path, record, detector, reader, pad=20):
+    """
+    load_crops() for one image: (crop, hand_detected, detection), or None
+    when the image cannot be read. Detection errors propagate.
+    """
+    loaded, error = load_crops([path], [record], detector, reader, pad)[0]
+    if error is not None:
+        raise error
+    return loaded
+
+
+def cached_crops(image_paths, detector, pad=20, store=None, on_error=None):
+    """
+    detector.crop() for many image files, served from the crop store where
+    possible. Returns one (crop, hand_detected) per path, in order, or None
+    where the image could not be read or detection failed.
+
+    on_error(path, exception) is called for failed detections.
+    """
+    store = store or get_crop_store()
+    key = detector.cache_key(pad)
+    hashes = [file_sha256(p) for p in image_paths]
+    records = store.get_many(hashes, key)
+
+    # Byte-identical files are loaded once
+    first = {}
+    for path, h in zip(image_paths, hashes):
+        first.setdefault(h, path)
+    unique = list(first)
+    for h in unique:
+        if h in records:
+            store.hits += 1
+        else:
+            store.misses += 1
+    loaded = dict(zip(unique, load_crops([first[h] for h in unique],
+                                         [records.get(h) for h in unique],
+                                         detector, store.reader, pad)))
+
+    crops = []
+    fresh = {}
+    for path, h in zip(image_paths, hashes):
+        result, error = loaded[h]
+        if error is not None and on_error and path == first[h]:
+            on_error(path, error)
+        if result is None:
+            crops.append(None)
+            continue
+
+        crop, hand_detected, detection = result
+        if h not in records:
+            fresh[h] = (h, crop, hand_detected, detection)
+        crops.append((crop, hand_detected))
+
+    if fresh:
+        store.put_many(fresh.values(), key)
+    return crops
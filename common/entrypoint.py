@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def installed_streamlit_path(path):
+    """
+    Copy of the import path `path` with the repository root moved behind
+    site-packages (see use_installed_streamlit).
+    """
+    root = str(REPO_ROOT)
+    return [p for p in path if p not in ("", ".", root)] + [root]
+
+
+def use_installed_streamlit():
+    """
+    The app entry point at the repository root is called streamlit.py, so
+    running `python -m ...` from the root would import it instead of the
+    installed streamlit package. Move the root behind site-packages; the
+    CNN / HOG_SVM / common packages stay importable from there.
+    """
+    sys.path[:] = installed_streamlit_path(sys.path)
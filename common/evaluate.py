@@ -0,0 +1,327 @@
+"""
+Headless evaluation of the CNN or HOG + SVM pipeline over a folder or a
+manifest: no Streamlit UI, no GUI windows, N worker processes.
+
+    python -m common.evaluate --model hog --folder example_signs --workers 8 --output preds.csv
+    python -m common.evaluate --model cnn --manifest labeled.csv --output preds.jsonl
+
+A manifest is a CSV with a `path` column and an optional `label` column, a
+JSONL file with the same keys, or a plain list of paths, one per line.
+Relative paths are resolved against the manifest's folder. Without a label
+the class is taken from the file name (`<label>_*.jpg`), as in the batch
+views.
+
+One row per image is written, in input order, to CSV or JSONL (by
+extension, or --format). Each row holds the prediction, the score (CNN
+probability or SVM margin), the top-3, hand_detected, whether it is
+correct, and the decode / detect / classify times in ms. A summary goes
+to stderr.
+"""
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
+
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from common.hand_detectors import available_detectors, get_hand_detector
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+# Images per task sent to a worker (and per CNN forward pass)
+CHUNK_SIZE = 16
+
+FIELDS = ["path", "label", "prediction", "score", "correct", "hand_detected",
+          "top3", "decode_ms", "detect_ms", "classify_ms", "error"]
+
+
+# ===========================================
+# INPUTS
+# ===========================================
+def label_from_name(path):
+    return Path(path).stem.split("_")[0].lower()
+
+
+def folder_items(folder, recursive=False):
+    pattern = "**/*" if recursive else "*"
+    return [
+        (str(p), label_from_name(p))
+        for p in sorted(Path(folder).glob(pattern))
+        if p.suffix.lower() in IMAGE_SUFFIXES
+    ]
+
+
+def manifest_items(manifest):
+    """[(path, label)] from a CSV, JSONL or plain path-list manifest."""
+    manifest = Path(manifest)
+    root = manifest.parent
+
+    def item(path, label=None):
+        path = Path(path)
+        path = path if path.is_absolute() else root / path
+        return str(path), (label or label_from_name(path)).lower()
+
+    with open(manifest, newline="", encoding="utf-8") as f:
+        if manifest.suffix.lower() == ".csv":
+            return [item(row["path"], row.get("label")) for row in csv.DictReader(f)]
+        if manifest.suffix.lower() in {".jsonl", ".ndjson"}:
+            rows = (json.loads(line) for line in f if line.strip())
+            return [item(row["path"], row.get("label")) for row in rows]
+        return [item(line.strip()) for line in f if line.strip()]
+
+
+# ===========================================
+# CLASSIFIERS
+# ===========================================
+class HOGClassifier:
+    # HOG rows without a hand are reported as such, never classified
+    classify_without_hand = False
+
+    def __init__(self, model_file=None, threads=None):
+        from HOG_SVM.fused_classifier import load_hog_bundle
+        from HOG_SVM.hog_bundle import HOG_MODEL_FILE
+
+        self.bundle = load_hog_bundle(model_file or HOG_MODEL_FILE)
+
+    def classify(self, crops):
+        """[(prediction, score, top3)] per crop."""
+        from HOG_SVM.predict_sign import predict_sign_hog_batch
+
+        b = self.bundle
+        results = predict_sign_hog_batch(crops, b["svm"], b["scaler"], b["selector"],
+                                         b["inv_label_map"], b["hog_params"], fused=b["fused"])
+        return [(str(r["prediction"]), r["svm_margin"],
+                 [(str(lbl), float(s)) for lbl, s in r["top3"]]) if r else None
+                for r in results]
+
+
+class CNNClassifier:
+    # The CNN views classify the full frame when no hand is found
+    classify_without_hand = True
+
+    def __init__(self, model_file=None, threads=None):
+        from CNN.learner import CNN_MODEL_FILE, read_learner
+
+        model_file = str(model_file or CNN_MODEL_FILE)
+        if model_file.endswith(".onnx"):
+            from CNN.onnx_model import OnnxLearner
+            self.learn = OnnxLearner(model_file, threads=threads)
+            return
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        self.learn = read_learner(model_file)
+
+    def classify(self, crops):
+        from CNN.predict_sign import _forward
+
+        probs = np.asarray(_forward(crops, self.learn))
+        vocab = self.learn.dls.vocab
+        out = []
+        for row in probs:
+            top = np.argsort(-row)[:3]
+            out.append((str(vocab[top[0]]), float(row[top[0]]),
+                        [(str(vocab[i]), float(row[i])) for i in top]))
+        return out
+
+
+CLASSIFIERS = {"hog": HOGClassifier, "cnn": CNNClassifier}
+
+
+# ===========================================
+# WORKERS
+# ===========================================
+_state = {}
+
+
+def _init_worker(model, model_file, detector, threads):
+    if threads:
+        # The pool is the parallelism; one library thread per process
+        cv2.setNumThreads(threads)
+    _state["classifier"] = CLASSIFIERS[model](model_file, threads)
+    _state["detector"] = get_hand_detector(detector)
+
+
+def _ms_since(start):
+    return round((time.perf_counter() - start) * 1000.0, 3)
+
+
+def _evaluate_chunk(items):
+    """items: [(path, label)] -> one output row per item."""
+    classifier, detector = _state["classifier"], _state["detector"]
+
+    rows, decoded = [], []
+    for path, label in items:
+        row = {"path": path, "label": label, "prediction": None, "score": None,
+               "correct": False, "hand_detected": False, "top3": None,
+               "decode_ms": None, "detect_ms": None, "classify_ms": None, "error": None}
+        rows.append(row)
+
+        start = time.perf_counter()
+        img = cv2.imread(path)
+        row["decode_ms"] = _ms_since(start)
+        if img is None:
+            row["error"] = "unreadable image"
+            continue
+        decoded.append((row, img))
+
+    # One detector call for the chunk; per image on failure to find the culprit
+    start = time.perf_counter()
+    try:
+        detections = detector.crop_with_detection_batch([img for _, img in decoded])
+        per_image = round(_ms_since(start) / max(len(decoded), 1), 3)
+        detections = [(d, per_image) for d in detections]
+    except Exception:
+        detections = []
+        for _, img in decoded:
+            start = time.perf_counter()
+            try:
+                detections.append((detector.crop_with_detection(img), _ms_since(start)))
+            except Exception as e:
+                detections.append((e, None))
+
+    crops, crop_rows = [], []
+    for (row, _), (detection, detect_ms) in zip(decoded, detections):
+        if isinstance(detection, Exception):
+            row["error"] = f"detection failed: {detection}"
+            continue
+        crop, hand_detected, _ = detection
+        row["detect_ms"] = detect_ms
+        row["hand_detected"] = bool(hand_detected)
+
+        if hand_detected or classifier.classify_without_hand:
+            crops.append(crop)
+            crop_rows.append(row)
+        else:
+            row["prediction"] = "NO HAND"
+
+    if crops:
+        start = time.perf_counter()
+        try:
+            results = classifier.classify(crops)
+        except Exception as e:
+            results = [None] * len(crops)
+            for row in crop_rows:
+                row["error"] = f"classification failed: {e}"
+        # One batched call; report each image's share of it
+        per_image = round(_ms_since(start) / len(crops), 3)
+
+        for row, res in zip(crop_rows, results):
+            row["classify_ms"] = per_image
+            if res is None:
+                continue
+            row["prediction"], row["score"], row["top3"] = res
+            row["correct"] = res[0].lower() == row["label"]
+
+    return rows
+
+
+def evaluate(items, model="hog", model_file=None, detector="yolo", workers=1,
+             chunk_size=CHUNK_SIZE):
+    """Yield one row per (path, label) item, in order."""
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        # Spawned: forked MediaPipe/PyTorch threads can deadlock
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers, initializer=_init_worker,
+                      initargs=(model, model_file, detector, 1)) as pool:
+            for rows in pool.imap(_evaluate_chunk, chunks):
+                yield from rows
+    else:
+        _init_worker(model, model_file, detector, None)
+        for chunk in chunks:
+            yield from _evaluate_chunk(chunk)
+
+
+# ===========================================
+# OUTPUT
+# ===========================================
+class RowWriter:
+    def __init__(self, f, fmt):
+        self.f, self.fmt = f, fmt
+        if fmt == "csv":
+            self.csv = csv.DictWriter(f, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == "jsonl":
+            self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            top3 = row["top3"]
+            self.csv.writerow({
+                **row,
+                "top3": "|".join(f"{lbl}:{s:.4f}" for lbl, s in top3) if top3 else ""
+            })
+
+
+def _summary(rows, elapsed):
+    n = len(rows)
+    labeled = [r for r in rows if r["label"]]
+    stages = {}
+    for stage in ("decode_ms", "detect_ms", "classify_ms"):
+        values = np.array([r[stage] for r in rows if r[stage] is not None])
+        if values.size:
+            stages[stage] = {"p50": float(np.percentile(values, 50)),
+                             "p95": float(np.percentile(values, 95))}
+    return {
+        "images": n,
+        "accuracy": sum(r["correct"] for r in labeled) / len(labeled) if labeled else None,
+        "no_hand": sum(not r["hand_detected"] for r in rows if not r["error"]),
+        "errors": sum(bool(r["error"]) for r in rows),
+        "wall_s": elapsed,
+        "images_per_s": n / elapsed if elapsed > 0 else None,
+        "stages": stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--folder", help="folder of images")
+    source.add_argument("--manifest", help="CSV / JSONL / path-list manifest")
+    parser.add_argument("--recursive", action="store_true", help="walk sub-folders of --folder")
+    parser.add_argument("--model", choices=sorted(CLASSIFIERS), default="hog")
+    parser.add_argument("--model-file", help="weights to load instead of the default")
+    parser.add_argument("--detector", choices=available_detectors(), default="yolo")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--output", required=True, help="CSV or JSONL file ('-' for stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="output format (default: from the --output extension)")
+    args = parser.parse_args(argv)
+
+    items = (folder_items(args.folder, args.recursive) if args.folder
+             else manifest_items(args.manifest))
+    if not items:
+        parser.error("no images found")
+
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".ndjson")) else "csv")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    rows = []
+    start = time.perf_counter()
+    try:
+        writer = RowWriter(out, fmt)
+        for row in evaluate(items, args.model, args.model_file, args.detector,
+                            args.workers, args.chunk_size):
+            writer.write(row)
+            rows.append({k: row[k] for k in ("label", "correct", "hand_detected", "error",
+                                             "decode_ms", "detect_ms", "classify_ms")})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps(_summary(rows, time.perf_counter() - start), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import hashlib
+import os
+import threading
+
+_memo = {}
+_lock = threading.Lock()
+
+
+def file_sha256(path):
+    """
+    sha256 of a file's bytes. Memoised on (path, size, mtime) so unchanged
+    files are hashed once per process.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+    with _lock:
+        digest = _memo.get(key)
+    if digest is not None:
+        return digest
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    with _lock:
+        _memo[key] = digest
+    return digest
@@ -0,0 +1,91 @@
+"""
+Throttled, downscaled, JPEG-compressed delivery of webcam frames.
+
+st.image(array) re-encodes every frame server-side at JPEG quality 100 at
+full resolution, and the camera loops used to call it on every inference
+iteration. FrameDisplay sends at most `max_fps` frames per second, scaled
+down to the width the video column actually renders, encoded once with
+OpenCV at `quality`. Streamlit forwards JPEG bytes that are no wider than
+its content width untouched.
+
+    display = FrameDisplay(st.empty())
+    if display.due():
+        ...draw overlay...
+        display.show(frame_bgr)
+
+Defaults come from SIGN_APP_DISPLAY_FPS (15), SIGN_APP_DISPLAY_WIDTH (960)
+and SIGN_APP_JPEG_QUALITY (75).
+"""
+import os
+import time
+from collections import deque
+
+import cv2
+
+DISPLAY_FPS = float(os.environ.get("SIGN_APP_DISPLAY_FPS", "15"))
+DISPLAY_WIDTH = int(os.environ.get("SIGN_APP_DISPLAY_WIDTH", "960"))
+JPEG_QUALITY = int(os.environ.get("SIGN_APP_JPEG_QUALITY", "75"))
+
+
+class FrameDisplay:
+    def __init__(self, placeholder, max_fps=DISPLAY_FPS, width=DISPLAY_WIDTH,
+                 quality=JPEG_QUALITY, window_seconds=5.0):
+        self.placeholder = placeholder
+        self.interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.width = width
+        self.quality = quality
+        self.window_seconds = window_seconds
+
+        self._last = float("-inf")
+        self._sent = deque()    # (time, bytes) over the last window_seconds
+        self.frames = 0
+        self.total_bytes = 0
+        self.last_bytes = 0
+
+    def due(self):
+        """True when the next frame may be sent (the FPS cap allows it)."""
+        return time.monotonic() - self._last >= self.interval
+
+    def encode(self, frame_bgr):
+        h, w = frame_bgr.shape[:2]
+        if self.width and w > self.width:
+            # INTER_AREA is several times slower than bilinear at non-integer
+            # ratios and only matters for aliasing below half size
+            interpolation = cv2.INTER_AREA if w >= 2 * self.width else cv2.INTER_LINEAR
+            frame_bgr = cv2.resize(frame_bgr, (self.width, round(h * self.width / w)),
+                                   interpolation=interpolation)
+        ok, buf = cv2.imencode(".jpg", frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return buf.tobytes()
+
+    def show(self, frame_bgr):
+        """Send a BGR frame; returns the number of bytes sent."""
+        data = self.encode(frame_bgr)
+        self.placeholder.image(data, output_format="JPEG", use_container_width=True)
+
+        now = time.monotonic()
+        self._last = now
+        self._sent.append((now, len(data)))
+        while self._sent and now - self._sent[0][0] > self.window_seconds:
+            self._sent.popleft()
+        self.frames += 1
+        self.total_bytes += len(data)
+        self.last_bytes = len(data)
+        return len(data)
+
+    def rate(self):
+        """(frames/s, bytes/s) sent over the recent window."""
+        if len(self._sent) < 2:
+            return 0.0, 0.0
+        span = self._sent[-1][0] - self._sent[0][0]
+        if span <= 0:
+            return 0.0, 0.0
+        # The first frame opens the window; count what was sent after it
+        sent = sum(n for _, n in self._sent) - self._sent[0][1]
+        return (len(self._sent) - 1) / span, sent / span
+
+    def stats_text(self):
+        fps, bps = self.rate()
+        return (f"display {fps:.1f} fps · {bps / 1024:.0f} KB/s "
+                f"({self.total_bytes / 1e6:.1f} MB sent)")
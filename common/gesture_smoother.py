@@ -0,0 +1,154 @@
+"""
+Temporal smoothing of per-frame predictions for the webcam views.
+
+    smoother = GestureSmoother(classes=vocab, **CAMERA_SMOOTHING)
+    label, confidence = smoother.push(pred, conf_percent, scores)
+    smoother.clear()                          # e.g. when the hand disappears
+
+mode="vote" keeps the last `window` (label, confidence) pairs in a ring
+buffer with running vote counts and a running confidence sum, and returns
+the majority label and the mean confidence. With the defaults (window=5,
+hold=1) that is the gesture-lock buffer the camera loops used to keep in a
+list; ties go to the most recently seen label.
+
+mode="ema" keeps an exponential moving average of the full probability /
+decision-score vector instead of the argmax label only: the label is the
+argmax of the average and the confidence confidence_fn(average[label]).
+
+hold=N adds hysteresis: a new label replaces the locked one only after it
+has led for N consecutive frames.
+"""
+import numpy as np
+
+# What the camera views use: the original 5-frame gesture lock. EMA and
+# hysteresis are opt-in, e.g. {"mode": "ema", "alpha": 0.4, "hold": 3}
+CAMERA_SMOOTHING = {"mode": "vote", "window": 5}
+
+
+def _percent(score):
+    return float(score) * 100.0
+
+
+class GestureSmoother:
+    def __init__(self, window=5, mode="vote", alpha=0.5, hold=1, classes=None,
+                 confidence_fn=_percent):
+        """
+        classes: index -> label (list, vocab or {index: label}); needed for "ema"
+        confidence_fn: averaged score -> confidence in percent ("ema" only)
+        """
+        if mode not in ("vote", "ema"):
+            raise ValueError(f"Unknown smoothing mode: {mode}")
+        if mode == "ema" and classes is None:
+            raise ValueError("mode='ema' needs the classes of the score vector")
+        self.window = window
+        self.mode = mode
+        self.alpha = alpha
+        self.hold = hold
+        self.classes = classes
+        self.confidence_fn = confidence_fn
+        if classes is not None:
+            pairs = classes.items() if isinstance(classes, dict) else enumerate(classes)
+            self._class_index = {label: i for i, label in pairs}
+        self.clear()
+
+    def clear(self):
+        # Vote ring buffer
+        self._labels = [None] * self.window
+        self._confs = [0.0] * self.window
+        self._next = 0
+        self._size = 0
+        self._frame = 0
+        self._counts = {}
+        self._last_seen = {}
+        self._conf_sum = 0.0
+        self._leader = None
+        # Moving average
+        self._ema = None
+        # Hysteresis
+        self.locked = None
+        self._pending = None
+        self._pending_frames = 0
+
+    def __len__(self):
+        return self._size
+
+    # ===========================================
+    # VOTE
+    # ===========================================
+    def _push_vote(self, label, confidence):
+        evicted = None
+        if self._size == self.window:
+            evicted = self._labels[self._next]
+            self._conf_sum -= self._confs[self._next]
+            self._counts[evicted] -= 1
+            if not self._counts[evicted]:
+                del self._counts[evicted]
+                del self._last_seen[evicted]
+        else:
+            self._size += 1
+
+        self._labels[self._next] = label
+        self._confs[self._next] = confidence
+        self._next = (self._next + 1) % self.window
+        self._conf_sum += confidence
+        self._counts[label] = self._counts.get(label, 0) + 1
+        self._last_seen[label] = self._frame
+        self._frame += 1
+
+        if self._leader is None or evicted == self._leader:
+            # Only losing a vote can dethrone the leader; rescan (<= window labels)
+            self._leader = max(self._counts, key=lambda l: (self._counts[l], self._last_seen[l]))
+        elif self._counts[label] >= self._counts[self._leader]:
+            # The newest label wins ties
+            self._leader = label
+        return self._leader
+
+    def _vote_confidence(self):
+        return self._conf_sum / self._size if self._size else 0.0
+
+    # ===========================================
+    # EMA
+    # ===========================================
+    def _push_ema(self, scores):
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        if self._ema is None:
+            self._ema = scores.copy()
+        else:
+            self._ema += self.alpha * (scores - self._ema)
+        return self.classes[int(self._ema.argmax())]
+
+    def _ema_confidence(self, label):
+        return self.confidence_fn(self._ema[self._class_index[label]])
+
+    # ===========================================
+    # PUBLIC
+    # ===========================================
+    def push(self, label, confidence, scores=None):
+        """
+        Add one frame's prediction (confidence in percent; scores = the full
+        probability / decision-score vector, used by "ema").
+        Returns the smoothed (label, confidence).
+        """
+        if self.mode == "ema":
+            if scores is None:
+                # Nothing to average (e.g. a failed frame): keep the lock
+                if self.locked is None:
+                    return label, confidence
+                return self.locked, self._ema_confidence(self.locked)
+            candidate = self._push_ema(scores)
+        else:
+            candidate = self._push_vote(label, confidence)
+
+        if self.locked is None or candidate == self.locked or self.hold <= 1:
+            self.locked, self._pending, self._pending_frames = candidate, None, 0
+        else:
+            if candidate == self._pending:
+                self._pending_frames += 1
+            else:
+                self._pending, self._pending_frames = candidate, 1
+            if self._pending_frames >= self.hold:
+                self.locked, self._pending, self._pending_frames = candidate, None, 0
+
+        if self.mode == "ema":
+            return self.locked, self._ema_confidence(self.locked)
+        return self.locked, self._vote_confidence()
@@ -0,0 +1,367 @@
+"""
+Hand detector backends behind one interface.
+
+Both the CNN and HOG pipelines pick a backend by name:
+
+    detector = get_hand_detector("yolo")
+    result = detector.detect(frame)          # DetectionResult
+    results = detector.detect_batch(frames)  # one model call where supported
+    cropped, hand_detected = detector.crop(frame)
+
+get_hand_detector() returns an instance shared by the whole process.
+Backends that carry state from frame to frame (mediapipe_track) need one
+instance per stream: create_hand_detector() builds a private one, and
+reset() / close() drop its state.
+
+New backends subclass HandDetectorBackend, implement _detect() and are
+registered with @register_detector("name").
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from common.file_hash import file_sha256
+from common.mediapipe_hands import HandTracker, get_hands, hand_scores, read_image
+from common.stage_timing import record_stage, timed
+
+
+# ===========================================
+# RESULT TYPES
+# ===========================================
+@dataclass
+class HandDetection:
+    bbox: tuple                              # (x1, y1, x2, y2) in pixels
+    confidence: float
+    landmarks: Optional[np.ndarray] = None   # (21, 2) pixel coordinates, if any
+
+
+@dataclass
+class DetectionResult:
+    backend: str
+    hands: List[HandDetection] = field(default_factory=list)
+    inference_time: float = 0.0              # seconds spent in the backend
+
+    @property
+    def best(self):
+        """Most confident hand, or None."""
+        return max(self.hands, key=lambda h: h.confidence) if self.hands else None
+
+
+# ===========================================
+# BASE CLASS
+# ===========================================
+class HandDetectorBackend:
+    name = None
+    # Colour order of the crops crop() returns. Kept per backend because the
+    # models were trained on what the original crop helpers produced.
+    crop_rgb = True
+
+    def __init__(self, timing_window=500):
+        self._timings = deque(maxlen=timing_window)
+        self._lock = threading.Lock()
+
+    def _detect(self, img_bgr, img_rgb):
+        """Return a list of HandDetection for a BGR image."""
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget state carried between frames; stateless backends have none."""
+
+    def close(self):
+        self.reset()
+
+    def _detect_batch(self, imgs_bgr, imgs_rgb):
+        """_detect() for many images; override when the model can batch."""
+        return [self._detect(b, r) for b, r in zip(imgs_bgr, imgs_rgb)]
+
+    def detect(self, image, img_rgb=None):
+        img = read_image(image)
+        start = time.perf_counter()
+        hands = self._detect(img, img_rgb)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._timings.append(elapsed)
+        record_stage("detect", elapsed)
+        return DetectionResult(self.name, hands, elapsed)
+
+    def detect_batch(self, images, imgs_rgb=None):
+        """detect() for a list of images; each result gets an equal share of the time."""
+        imgs = [read_image(image) for image in images]
+        if not imgs:
+            return []
+        start = time.perf_counter()
+        hands = self._detect_batch(imgs, imgs_rgb or [None] * len(imgs))
+        elapsed = time.perf_counter() - start
+        per_image = elapsed / len(imgs)
+        with self._lock:
+            self._timings.extend([per_image] * len(imgs))
+        record_stage("detect", elapsed)
+        return [DetectionResult(self.name, h, per_image) for h in hands]
+
+    def crop(self, image, pad=20):
+        """
+        Crop the most confident hand (plus padding).
+        Returns (cropped image, hand_detected); the full image when no hand.
+        """
+        cropped, hand_detected, _ = self.crop_with_detection(image, pad)
+        return cropped, hand_detected
+
+    def crop_with_detection(self, image, pad=20):
+        """crop() that also returns the HandDetection it cropped (or None)."""
+        img = read_image(image)
+        with timed("crop"):
+            out = cv2.cvtColor(img, cv2.COLOR_BGR2RGB) if self.crop_rgb else img
+        best = self.detect(img, img_rgb=out if self.crop_rgb else None).best
+        return self._crop_best(img, out, best, pad)
+
+    def crop_with_detection_batch(self, images, pad=20):
+        """crop_with_detection() for a list of images, detected in one batch."""
+        imgs = [read_image(image) for image in images]
+        with timed("crop"):
+            outs = [cv2.cvtColor(i, cv2.COLOR_BGR2RGB) for i in imgs] if self.crop_rgb else imgs
+        results = self.detect_batch(imgs, imgs_rgb=outs if self.crop_rgb else None)
+        return [self._crop_best(img, out, r.best, pad)
+                for img, out, r in zip(imgs, outs, results)]
+
+    @staticmethod
+    def _crop_best(img, out, best, pad):
+        if best is None:
+            return out, False, None
+
+        h, w = img.shape[:2]
+        x1, y1, x2, y2 = best.bbox
+        x1, y1 = max(0, x1 - pad), max(0, y1 - pad)
+        x2, y2 = min(w, x2 + pad), min(h, y2 + pad)
+
+        cropped = out[y1:y2, x1:x2]
+        if cropped.size == 0:
+            return out, False, None
+        return cropped, True, best
+
+    def cache_key(self, pad=20):
+        """Identifies what crop() produces; changes with config or weights."""
+        return f"{self.name}:pad={pad}"
+
+    def reset_timings(self):
+        with self._lock:
+            self._timings.clear()
+
+    def timing_stats(self):
+        """Latency of recent detect() calls in milliseconds."""
+        with self._lock:
+            ms = np.asarray(self._timings) * 1000.0
+        if ms.size == 0:
+            return {"calls": 0}
+        return {
+            "calls": int(ms.size),
+            "mean_ms": float(ms.mean()),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+        }
+
+
+# ===========================================
+# REGISTRY
+# ===========================================
+_BACKENDS = {}
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def register_detector(name):
+    def decorator(cls):
+        cls.name = name
+        _BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def available_detectors():
+    return sorted(_BACKENDS)
+
+
+def get_hand_detector(name, **kwargs):
+    """Shared backend instance for (name, kwargs)."""
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown hand detector '{name}'. Available: {available_detectors()}")
+
+    key = (name, tuple(sorted(kwargs.items())))
+    with _instances_lock:
+        detector = _instances.get(key)
+        if detector is None:
+            detector = _instances[key] = _BACKENDS[name](**kwargs)
+    return detector
+
+
+def create_hand_detector(name, **kwargs):
+    """
+    New backend instance owned by the caller (one webcam loop or video), for
+    backends that track state across frames. Not listed in detector_timings().
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown hand detector '{name}'. Available: {available_detectors()}")
+    return _BACKENDS[name](**kwargs)
+
+
+def detector_timings():
+    """timing_stats() of every backend instance created so far."""
+    return {
+        name + (f"{dict(kwargs)}" if kwargs else ""): detector.timing_stats()
+        for (name, kwargs), detector in list(_instances.items())
+    }
+
+
+# Backend used by the historical predict_sign modes
+MODE_DETECTORS = {
+    "batch": "yolo",
+    "cam": "mediapipe",
+}
+
+
+def detector_for_mode(mode):
+    if mode not in MODE_DETECTORS:
+        raise ValueError(f"Unknown prediction mode: {mode}")
+    return MODE_DETECTORS[mode]
+
+
+def resolve_detector(detector=None, mode="batch"):
+    """
+    Backend for a predict_sign `detector` argument: a backend instance is
+    used as is, a name gives the shared instance, None the one for `mode`.
+    """
+    if isinstance(detector, HandDetectorBackend):
+        return detector
+    return get_hand_detector(detector or detector_for_mode(mode))
+
+
+# ===========================================
+# BACKENDS
+# ===========================================
+@register_detector("yolo")
+class YOLOBackend(HandDetectorBackend):
+    crop_rgb = False  # CNN.crop_hand has always returned BGR crops
+
+    def __init__(self, model_path=None, imgsz=640, **kwargs):
+        super().__init__(**kwargs)
+        from CNN.crop_hand import YOLO_MODEL_FILE, YOLOv8HandDetector, get_detector
+        self.model_path = model_path or YOLO_MODEL_FILE
+        self.imgsz = imgsz
+        if model_path is None and imgsz == 640:
+            self.model = get_detector()
+        else:
+            self.model = YOLOv8HandDetector(self.model_path, imgsz)
+
+    def cache_key(self, pad=20):
+        weights = Path(self.model_path)
+        if weights.is_dir():
+            # OpenVINO exports are a folder; the .bin holds the weights
+            weights = next(weights.glob("*.bin"), weights)
+        digest = file_sha256(weights)[:16] if weights.is_file() else "missing"
+        # Without ultralytics every image comes back as "no hand"; keep those
+        # results apart from real detections
+        state = "" if self.model.available else ":unavailable"
+        size = "" if self.imgsz == 640 else f":imgsz={self.imgsz}"
+        return f"{super().cache_key(pad)}:{self.model_path}:{digest}{size}{state}"
+
+    @staticmethod
+    def _hands(result):
+        if not result:
+            return []
+        return [HandDetection(tuple(box), conf) for box, conf
+                in zip(result["boxes"].tolist(), result["confidences"].tolist())]
+
+    def _detect(self, img_bgr, img_rgb):
+        result = self.model.detect(img_bgr)
+        if result:
+            # Model call alone, without the wrapper's pre/post-processing
+            record_stage("yolo_inference", result["inference_time"])
+        return self._hands(result)
+
+    def _detect_batch(self, imgs_bgr, imgs_rgb):
+        results = self.model.detect_batch(imgs_bgr)
+        if results and results[0]:
+            record_stage("yolo_inference", sum(r["inference_time"] for r in results))
+        return [self._hands(r) for r in results]
+
+
+@register_detector("yolo_export")
+class YOLOExportBackend(YOLOBackend):
+    """
+    YOLO exported for CPU by CNN.yolo_export (ONNX / OpenVINO, fixed input
+    size, optionally INT8). Defaults come from YOLO_EXPORT_FORMAT,
+    YOLO_IMGSZ and YOLO_INT8.
+    """
+
+    def __init__(self, format=None, imgsz=None, int8=None, **kwargs):
+        from CNN.yolo_export import YOLO_EXPORT_FORMAT, YOLO_IMGSZ, YOLO_INT8, exported_model_path
+        imgsz = imgsz or YOLO_IMGSZ
+        path = exported_model_path(format or YOLO_EXPORT_FORMAT, imgsz,
+                                   YOLO_INT8 if int8 is None else int8)
+        super().__init__(model_path=path, imgsz=imgsz, **kwargs)
+
+
+@register_detector("mediapipe")
+class MediaPipeBackend(HandDetectorBackend):
+    def __init__(self, min_detection_confidence=0.3, max_num_hands=1, **kwargs):
+        super().__init__(**kwargs)
+        self.min_detection_confidence = min_detection_confidence
+        self.max_num_hands = max_num_hands
+
+    def cache_key(self, pad=20):
+        return (f"{super().cache_key(pad)}:conf={self.min_detection_confidence}"
+                f":hands={self.max_num_hands}")
+
+    def _detect(self, img_bgr, img_rgb):
+        if img_rgb is None:
+            img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+        results = self._process(img_rgb)
+        if not results.multi_hand_landmarks:
+            return []
+
+        h, w = img_bgr.shape[:2]
+        scores = hand_scores(results) or [1.0] * len(results.multi_hand_landmarks)
+        detections = []
+        for hand_landmarks, score in zip(results.multi_hand_landmarks, scores):
+            points = getattr(hand_landmarks, "landmark", hand_landmarks)
+            landmarks = np.array([(lm.x * w, lm.y * h) for lm in points])
+            x1, y1 = landmarks.min(axis=0).astype(int)
+            x2, y2 = landmarks.max(axis=0).astype(int)
+            detections.append(HandDetection((int(x1), int(y1), int(x2), int(y2)), score, landmarks))
+        return detections
+
+    def _process(self, img_rgb):
+        # Look the pooled graph up on every call: it may have been evicted
+        return get_hands(self.min_detection_confidence, self.max_num_hands).process(img_rgb)
+
+
+@register_detector("mediapipe_track")
+class MediaPipeTrackingBackend(MediaPipeBackend):
+    """
+    MediaPipe with the hand ROI tracked across consecutive frames. The
+    HandTracker belongs to this instance: give every stream its own with
+    create_hand_detector("mediapipe_track").
+    """
+
+    def __init__(self, min_detection_confidence=0.3, max_num_hands=1, **kwargs):
+        super().__init__(min_detection_confidence, max_num_hands, **kwargs)
+        self._tracker = None
+        self._tracker_lock = threading.Lock()
+
+    def _process(self, img_rgb):
+        with self._tracker_lock:
+            if self._tracker is None:
+                self._tracker = HandTracker(self.min_detection_confidence, self.max_num_hands)
+            return self._tracker.process(img_rgb)
+
+    def reset(self):
+        """Drop the tracked ROI; the next frame runs palm detection again."""
+        with self._tracker_lock:
+            tracker, self._tracker = self._tracker, None
+        if tracker is not None:
+            tracker.close()
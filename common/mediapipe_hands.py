@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+
+# ===========================================
+# PROCESS-WIDE POOL OF MEDIAPIPE HANDS GRAPHS
+# ===========================================
+# Building a Hands graph costs tens of milliseconds, so static-image graphs
+# are created once per process and reused by every thread (Streamlit runs
+# each rerun on a new script thread, and warm-up runs on its own). MediaPipe
+# graphs are not thread-safe: every pooled graph serializes its calls behind
+# its own lock. Only static graphs are pooled: a HandTracker carries the hand
+# ROI of one stream and is owned by that stream.
+MAX_POOL_SIZE = 4
+
+# Optional MediaPipe Tasks model; when present, tracking uses the VIDEO
+# running mode of HandLandmarker, otherwise the legacy solutions graph.
+HAND_LANDMARKER_TASK = "hand_detection_mediapipe/hand_landmarker.task"
+
+_pool = OrderedDict()
+_pool_lock = threading.Lock()
+
+
+def _mediapipe():
+    # Imported on first use: the HOG/CNN batch paths never need MediaPipe
+    import mediapipe as mp
+    return mp
+
+
+class HandTracker:
+    """
+    Streaming hand landmarker that carries the hand ROI from frame to frame.
+    Palm detection only runs again when the tracking confidence drops, so
+    consecutive webcam frames skip the expensive detector.
+
+    process() mirrors Hands.process: it returns an object whose
+    multi_hand_landmarks is None or a list of per-hand landmark lists.
+    Not thread-safe and not shareable: create one per video stream.
+    """
+
+    def __init__(self, min_detection_confidence=0.5, max_num_hands=1,
+                 min_tracking_confidence=0.5, model_path=HAND_LANDMARKER_TASK):
+        mp = _mediapipe()
+        self._last_ts = -1
+
+        if model_path and Path(model_path).exists():
+            vision = mp.tasks.vision
+            options = vision.HandLandmarkerOptions(
+                base_options=mp.tasks.BaseOptions(model_asset_path=str(model_path)),
+                running_mode=vision.RunningMode.VIDEO,
+                num_hands=max_num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+            self._landmarker = vision.HandLandmarker.create_from_options(options)
+            self._hands = None
+            self.backend = "tasks-video"
+        else:
+            self._landmarker = None
+            self._hands = mp.solutions.hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max_num_hands,
+                min_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+            self.backend = "solutions-tracking"
+
+    def _timestamp_ms(self):
+        # VIDEO mode requires strictly increasing timestamps
+        ts = max(int(time.monotonic() * 1000), self._last_ts + 1)
+        self._last_ts = ts
+        return ts
+
+    def process(self, img_rgb):
+        if self._hands is not None:
+            return self._hands.process(img_rgb)
+
+        mp = _mediapipe()
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+        result = self._landmarker.detect_for_video(image, self._timestamp_ms())
+        return SimpleNamespace(
+            multi_hand_landmarks=result.hand_landmarks or None,
+            multi_handedness=result.handedness or None
+        )
+
+    def close(self):
+        if self._hands is not None:
+            self._hands.close()
+        else:
+            self._landmarker.close()
+
+
+def _create_hands(min_detection_confidence, max_num_hands):
+    return _mediapipe().solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=min_detection_confidence
+    )
+
+
+class PooledHands:
+    """
+    A pooled graph shared between threads: process() and close() hold a
+    per-instance lock. A graph closed while a caller still holds this
+    wrapper (pool eviction, close_hands) is rebuilt on its next call.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._lock = threading.Lock()
+        self._graph = _create_hands(*key)
+
+    def process(self, img_rgb):
+        with self._lock:
+            if self._graph is None:
+                self._graph = _create_hands(*self.key)
+            return self._graph.process(img_rgb)
+
+    def close(self):
+        with self._lock:
+            if self._graph is not None:
+                self._graph.close()
+                self._graph = None
+
+
+def get_hands(min_detection_confidence=0.5, max_num_hands=1):
+    """
+    Return the process-wide static-image mp.solutions.hands.Hands graph for
+    this configuration. Instances are keyed by (confidence, max_hands) and
+    kept alive between calls; the least recently used one is closed when
+    the pool is full.
+    """
+    key = (float(min_detection_confidence), int(max_num_hands))
+    with _pool_lock:
+        hands = _pool.get(key)
+        if hands is not None:
+            _pool.move_to_end(key)
+            return hands
+
+        hands = _pool[key] = PooledHands(key)
+        evicted = _pool.popitem(last=False)[1] if len(_pool) > MAX_POOL_SIZE else None
+
+    if evicted is not None:
+        evicted.close()
+    return hands
+
+
+def close_hands():
+    """Close the pooled Hands instances."""
+    with _pool_lock:
+        closed = list(_pool.values())
+        _pool.clear()
+    for hands in closed:
+        hands.close()
+
+
+# ===========================================
+# CROPPING
+# ===========================================
+def read_image(image):
+    """Accept an image path (str / Path) or an OpenCV BGR array."""
+    if isinstance(image, (str, Path)):
+        img = cv2.imread(str(image))
+        if img is None:
+            raise FileNotFoundError(f"Could not read image: {image}")
+        return img
+
+    if image is None or image.size == 0:
+        raise ValueError("Empty image array provided")
+    return image
+
+
+def landmarks_bbox(multi_hand_landmarks, w, h):
+    """Return (x_min, y_min, x_max, y_max) in pixels around all landmarks."""
+    x_min, y_min = w, h
+    x_max, y_max = 0, 0
+
+    for hand_landmarks in multi_hand_landmarks:
+        # solutions results wrap points in .landmark, Tasks results are plain lists
+        for lm in getattr(hand_landmarks, "landmark", hand_landmarks):
+            x, y = int(lm.x * w), int(lm.y * h)
+            x_min, y_min = min(x_min, x), min(y_min, y)
+            x_max, y_max = max(x_max, x), max(y_max, y)
+
+    return x_min, y_min, x_max, y_max
+
+
+def hand_scores(results):
+    """Per-hand detection scores of a Hands / HandTracker result."""
+    scores = []
+    for handedness in results.multi_handedness or []:
+        # solutions: ClassificationList, Tasks: list of Category
+        categories = getattr(handedness, "classification", handedness)
+        scores.append(float(categories[0].score))
+    return scores
+
+
+def crop_hand_mediapipe(image, min_detection_confidence=0.5, pad=20,
+                        max_num_hands=1, tracker=None):
+    """
+    Detect and crop hand from image using a pooled MediaPipe Hands graph.
+    tracker: a HandTracker owned by the caller's stream; the hand is then
+             tracked across calls, which is what webcam loops want.
+    Returns cropped RGB image and hand_detected flag; the full RGB image is
+    returned when no hand is found.
+    """
+    img = read_image(image)
+    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    h, w, _ = img.shape
+
+    hands = tracker or get_hands(min_detection_confidence, max_num_hands)
+    results = hands.process(img_rgb)
+
+    if not results.multi_hand_landmarks:
+        return img_rgb, False
+
+    x_min, y_min, x_max, y_max = landmarks_bbox(results.multi_hand_landmarks, w, h)
+
+    # Add padding & clamp
+    x_min, y_min = max(0, x_min - pad), max(0, y_min - pad)
+    x_max, y_max = min(w, x_max + pad), min(h, y_max + pad)
+
+    cropped_rgb = img_rgb[y_min:y_max, x_min:x_max]
+    if cropped_rgb.size == 0:
+        return img_rgb, False
+
+    return cropped_rgb, True
@@ -0,0 +1,75 @@
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap change detector placed in front of hand detection + classification.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with the
+    thumbnail of the frame the last prediction was computed on. While the mean
+    absolute difference stays under `threshold` (0-255 intensity levels) the
+    previous result is reused. A fresh prediction is forced after
+    `max_reuse_frames` reused frames or `max_reuse_seconds`, whichever comes
+    first, so a slowly drifting scene is still re-evaluated.
+    """
+
+    def __init__(self, threshold=3.0, size=(64, 36), max_reuse_frames=30, max_reuse_seconds=1.0):
+        self.threshold = threshold
+        self.size = size
+        self.max_reuse_frames = max_reuse_frames
+        self.max_reuse_seconds = max_reuse_seconds
+
+        self._ref = None
+        self._ref_time = 0.0
+        self._result = None
+        self._reused = 0
+
+        # Counters
+        self.inferred = 0
+        self.skipped = 0
+
+    def _signature(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def motion(self, signature):
+        """Mean absolute difference to the reference frame, in intensity levels."""
+        return float(np.abs(signature - self._ref).mean())
+
+    def run(self, frame, predict_fn, now=None):
+        """
+        Return predict_fn(frame), or the previous result if nothing moved.
+        now: frame time in seconds (e.g. the position in a video file);
+             defaults to the wall clock
+        """
+        signature = self._signature(frame)
+        if now is None:
+            now = time.monotonic()
+
+        if (
+            self._ref is not None
+            and self._reused < self.max_reuse_frames
+            and now - self._ref_time < self.max_reuse_seconds
+            and self.motion(signature) < self.threshold
+        ):
+            self._reused += 1
+            self.skipped += 1
+            return self._result
+
+        self._result = predict_fn(frame)
+        self._ref, self._ref_time, self._reused = signature, now, 0
+        self.inferred += 1
+        return self._result
+
+    def reset(self):
+        self._ref = None
+        self._result = None
+        self._reused = 0
+
+    def stats_text(self):
+        total = self.inferred + self.skipped
+        skipped_pct = 100.0 * self.skipped / total if total else 0.0
+        return f"inference skipped on {skipped_pct:.0f}% of frames (static scene)"
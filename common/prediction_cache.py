@@ -0,0 +1,186 @@
+"""
+Content-addressed on-disk cache of per-image batch predictions.
+
+Entries are keyed by (image sha256, model artifact sha256, detector config),
+so renamed files and byte-identical duplicates hit the same row, and a new
+weights file never serves results of the old one. Rows of a model whose
+artifact hash changed are purged when the cache is opened for it.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from common.file_hash import file_sha256
+
+CACHE_DIR = ".cache"
+CACHE_FILE = os.path.join(CACHE_DIR, "predictions.sqlite")
+# Computed results buffered before they are written to SQLite
+FLUSH_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    image_hash TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    model_hash TEXT NOT NULL,
+    detector   TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    compute_s  REAL NOT NULL,
+    created    REAL NOT NULL,
+    PRIMARY KEY (image_hash, model_hash, detector)
+)
+"""
+
+
+class PredictionCache:
+    def __init__(self, path=CACHE_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._known_models = set()
+
+    def invalidate_stale(self, model, model_hash):
+        """Drop rows of `model` computed with a different artifact."""
+        if (model, model_hash) in self._known_models:
+            return
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM predictions WHERE model = ? AND model_hash != ?",
+                (model, model_hash)
+            )
+            self._conn.commit()
+        self._known_models.add((model, model_hash))
+
+    def get_many(self, image_hashes, model_hash, detector):
+        """{image_hash: (result, compute_s)} for the hashes that are cached."""
+        found = {}
+        hashes = list(set(image_hashes))
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT image_hash, result, compute_s FROM predictions "
+                    "WHERE model_hash = ? AND detector = ? "
+                    f"AND image_hash IN ({','.join('?' * len(chunk))})",
+                    (model_hash, detector, *chunk)
+                ).fetchall()
+                for image_hash, result, compute_s in rows:
+                    found[image_hash] = (json.loads(result), compute_s)
+        return found
+
+    def put_many(self, entries, model, model_hash, detector):
+        """entries: iterable of (image_hash, result, compute_s)."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(h, model, model_hash, detector, json.dumps(r), s, now)
+                 for h, r, s in entries]
+            )
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """Process-wide cache instance (shared by all Streamlit sessions)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PredictionCache()
+    return _cache
+
+
+def iter_cached_predictions(image_paths, model_file, detector_key, compute_fn,
+                            cache=None, stats=None):
+    """
+    Streaming form of cached_predictions. Yields (index, result) pairs:
+    cached images first, then the others as compute_fn(paths) (an iterable,
+    e.g. a generator) produces them. New results are written to the cache as
+    they arrive. The stats dict, when given, is filled in at the end.
+    """
+    cache = cache or get_prediction_cache()
+    model_hash = file_sha256(model_file)
+    cache.invalidate_stale(str(model_file), model_hash)
+
+    hashes = [file_sha256(p) for p in image_paths]
+    cached = cache.get_many(hashes, model_hash, detector_key)
+
+    # Byte-identical images share one entry
+    positions = {}
+    for i, h in enumerate(hashes):
+        positions.setdefault(h, []).append(i)
+
+    saved_s = 0.0
+    for h, (result, compute_s) in cached.items():
+        saved_s += compute_s * len(positions[h])
+        for i in positions[h]:
+            yield i, result
+
+    todo = [h for h in positions if h not in cached]
+    compute_s = 0.0
+    pending = []
+
+    def flush():
+        cache.put_many([e for e in pending if e[1] is not None],
+                       str(model_file), model_hash, detector_key)
+        pending.clear()
+
+    try:
+        results = iter(compute_fn([image_paths[positions[h][0]] for h in todo]))
+        for h in todo:
+            # Time only the computation, not what the consumer does between items
+            start = time.perf_counter()
+            result = next(results)
+            elapsed = time.perf_counter() - start
+            compute_s += elapsed
+            # duplicates of a freshly computed image are not recomputed either
+            saved_s += elapsed * (len(positions[h]) - 1)
+
+            pending.append((h, result, elapsed))
+            if len(pending) >= FLUSH_EVERY:
+                flush()
+            for i in positions[h]:
+                yield i, result
+    finally:
+        if pending:
+            flush()
+
+    if stats is not None:
+        served = len(hashes) - len(todo)
+        stats.update({
+            "images": len(hashes),
+            "hits": served,
+            "computed": len(todo),
+            "hit_rate": served / len(hashes) if hashes else 0.0,
+            "compute_s": compute_s,
+            "saved_s": saved_s,
+        })
+
+
+def cached_predictions(image_paths, model_file, detector_key, compute_fn, cache=None):
+    """
+    Serve per-image results from the cache and compute only the rest.
+
+    compute_fn(paths) must return one JSON-serialisable result (or None on
+    failure) per path; None results are not cached. Byte-identical images
+    are computed once. Returns (results in input order, stats).
+    """
+    stats = {}
+    results = [None] * len(image_paths)
+    for i, result in iter_cached_predictions(image_paths, model_file, detector_key,
+                                             compute_fn, cache, stats):
+        results[i] = result
+    return results, stats
+
+
+def cache_stats_text(stats):
+    return (f"Prediction cache: {stats['hits']}/{stats['images']} served from cache "
+            f"({stats['hit_rate']:.0%}) · computed {stats['computed']} in "
+            f"{stats['compute_s']:.1f}s · saved ≈{stats['saved_s']:.1f}s")
@@ -0,0 +1,62 @@
+"""
+Streaming, paginated gallery for batch prediction results.
+
+Results are shown while they are being computed: a progress bar tracks the
+run and only the cards of the selected page are drawn, each into its own
+slot as soon as its result arrives. Rows keep the image path, never pixels,
+so memory stays flat however large the folder is.
+"""
+import math
+
+import streamlit as st
+
+# Cards drawn per page
+PAGE_SIZE = 24
+# Refresh the progress bar every N results
+PROGRESS_EVERY = 8
+
+
+def page_selector(total, key, page_size=PAGE_SIZE):
+    """Page picker; returns the (start, end) index range of the selected page."""
+    pages = max(1, math.ceil(total / page_size))
+    if pages == 1:
+        return 0, total
+
+    # The folder may have shrunk since the page was picked
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+
+    page = st.number_input(
+        f"Page (1–{pages}, {page_size} images per page)",
+        min_value=1, max_value=pages, value=1, step=1, key=key
+    )
+    start = (page - 1) * page_size
+    return start, min(total, start + page_size)
+
+
+def stream_results(pairs, total, build_row, card, page, label="Predicting"):
+    """
+    Consume (index, result) pairs in completion order.
+
+    build_row(index, result) turns a result into the row a card shows.
+    Cards of rows inside page = (start, end) are drawn as they arrive, in
+    their final position. Returns all rows in input order.
+    """
+    start, end = page
+    progress = st.progress(0.0, text=f"{label}: 0/{total}")
+    slots = [st.empty() for _ in range(end - start)]
+
+    rows = [None] * total
+    done = 0
+    for index, result in pairs:
+        rows[index] = row = build_row(index, result)
+        if start <= index < end:
+            with slots[index - start].container():
+                card(row)
+
+        done += 1
+        if done % PROGRESS_EVERY == 0 or done == total:
+            progress.progress(done / total, text=f"{label}: {done}/{total}")
+
+    progress.empty()
+    return rows
@@ -0,0 +1,173 @@
+"""
+Per-stage latency instrumentation.
+
+Pipeline code marks its stages with
+
+    with timed("detect"):
+        ...
+
+which costs a context-variable lookup when no timer is active. A webcam
+view keeps one StageTimer per Streamlit session, activates it around its
+loop and marks its own steps with timer.lap("display"). The timer keeps a
+rolling window of durations per stage, the frame rate, and optionally
+appends one JSON line per frame to the file named by the SIGN_APP_TRACE
+environment variable; the file is open only while the timer is active.
+
+A lap covers everything since the previous one, so the timed() stages
+recorded during the "predict" lap (detect, classify, ...) are part of it.
+The panel shows such a lap as a total with its nested stages under it.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# SIGN_APP_TRACE=/path/trace.jsonl writes a per-frame stage trace
+TRACE_FILE = os.environ.get("SIGN_APP_TRACE")
+
+_active = contextvars.ContextVar("stage_timer", default=None)
+
+
+def record_stage(name, seconds):
+    """Add a duration measured elsewhere to the active timer (if any)."""
+    timer = _active.get()
+    if timer is not None:
+        timer.record(name, seconds)
+
+
+@contextmanager
+def timed(name):
+    timer = _active.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(name, time.perf_counter() - start)
+
+
+class StageTimer:
+    def __init__(self, window=300, trace_path=TRACE_FILE):
+        self.window = window
+        self._stages = {}
+        self._frame = {}
+        self._frame_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._lap = time.perf_counter()
+        self._token = None
+        self.frames = 0
+        # Stages recorded since the last lap, and the lap each one falls in
+        self._nested = set()
+        self._parents = {}
+
+        self.trace_path = trace_path
+        self._trace = None
+
+    def activate(self):
+        """Make this the timer timed() reports to, until deactivate()."""
+        self.deactivate()
+        self._token = _active.set(self)
+        self._lap = time.perf_counter()
+        if self.trace_path:
+            self._trace = open(self.trace_path, "a", encoding="utf-8")
+
+    def deactivate(self):
+        """Stop receiving timed() stages and close the trace file."""
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    def _add(self, name, seconds):
+        if name not in self._stages:
+            self._stages[name] = deque(maxlen=self.window)
+        self._stages[name].append(seconds)
+        self._frame[name] = self._frame.get(name, 0.0) + seconds
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._add(name, seconds)
+            self._nested.add(name)
+
+    def lap(self, name):
+        """Record the time since the previous lap (or frame start) as `name`."""
+        now = time.perf_counter()
+        with self._lock:
+            self._add(name, now - self._lap)
+            for stage in self._nested:
+                self._parents[stage] = name
+            self._nested.clear()
+        self._lap = now
+
+    def frame_done(self, **fields):
+        """Close the current frame: update the FPS window and write the trace line."""
+        now = time.perf_counter()
+        self._lap = now
+        with self._lock:
+            self._frame_times.append(now)
+            self.frames += 1
+            stages, self._frame = self._frame, {}
+            self._nested.clear()
+
+        if self._trace is not None:
+            self._trace.write(json.dumps({
+                "time": time.time(),
+                "frame": self.frames,
+                "stages_ms": {k: round(v * 1000.0, 3) for k, v in stages.items()},
+                **fields,
+            }) + "\n")
+            if self.frames % 30 == 0:
+                self._trace.flush()
+
+    def fps(self):
+        with self._lock:
+            times = list(self._frame_times)
+        if len(times) < 2:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """{stage: {n, p50_ms, p95_ms}} over the rolling window."""
+        with self._lock:
+            windows = {k: np.asarray(v) * 1000.0 for k, v in self._stages.items()}
+        return {
+            name: {
+                "n": int(ms.size),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+            }
+            for name, ms in windows.items() if ms.size
+        }
+
+    def histogram(self, stage, bins=10):
+        """(counts, bin edges in ms) of the stage's rolling window."""
+        with self._lock:
+            ms = np.asarray(self._stages.get(stage, ())) * 1000.0
+        return np.histogram(ms, bins=bins) if ms.size else (np.zeros(0), np.zeros(0))
+
+    def panel_markdown(self):
+        stats = self.stats()
+        with self._lock:
+            parents = {k: v for k, v in self._parents.items() if v in stats}
+        by_p50 = lambda name: -stats[name]["p50_ms"]
+
+        rows = []
+        for name in sorted((n for n in stats if n not in parents), key=by_p50):
+            nested = sorted((n for n, p in parents.items() if p == name and n in stats), key=by_p50)
+            # An enclosing lap already contains its nested stages; don't add them up
+            rows.append((f"{name} (total)" if nested else name, stats[name]))
+            rows += [(f"↳ {n}", stats[n]) for n in nested]
+
+        table = "\n".join(f"| {label} | {s['p50_ms']:.1f} | {s['p95_ms']:.1f} |"
+                          for label, s in rows)
+        return (f"**{self.fps():.1f} FPS** · last {self.window} samples per stage\n\n"
+                f"| stage | p50 ms | p95 ms |\n|---|---:|---:|\n{table}")
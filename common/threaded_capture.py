@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class LatestFrameCapture:
+    """
+    cv2.VideoCapture read on a dedicated thread that keeps only the newest
+    frame. Frames the consumer did not pick up in time are dropped instead of
+    queueing in the driver, so inference always runs on the freshest frame.
+    """
+
+    def __init__(self, source=0, width=1280, height=720, latency_window=120):
+        self.cap = cv2.VideoCapture(source)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._captured_at = None
+        self._seq = 0
+        self._read_seq = 0
+        self._running = True
+        self.failed = False
+
+        # Counters
+        self.captured = 0
+        self.dropped = 0
+        self._latencies = deque(maxlen=latency_window)
+
+        self._thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            captured_at = time.perf_counter()
+            with self._cond:
+                if not ret:
+                    self.failed = True
+                    self._cond.notify_all()
+                    return
+                if self._seq > self._read_seq:
+                    self.dropped += 1  # previous frame was never consumed
+                self._frame = frame
+                self._captured_at = captured_at
+                self._seq += 1
+                self.captured += 1
+                self._cond.notify_all()
+
+    def isOpened(self):
+        return self.cap.isOpened() and not self.failed
+
+    def read(self, timeout=5.0):
+        """
+        Wait for a frame newer than the last one returned.
+        Returns (ret, frame, captured_at) with captured_at from time.perf_counter().
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > self._read_seq or self.failed or not self._running,
+                timeout
+            )
+            if self._seq == self._read_seq:
+                return False, None, None
+            self._read_seq = self._seq
+            return True, self._frame, self._captured_at
+
+    def record_display(self, captured_at):
+        """Call once the frame captured at captured_at has been pushed to the UI."""
+        self._latencies.append(time.perf_counter() - captured_at)
+
+    def stats(self):
+        latencies = np.asarray(self._latencies) * 1000.0
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+        }
+
+    def stats_text(self):
+        s = self.stats()
+        return (f"Frames captured: {s['captured']} · dropped (stale): {s['dropped']} · "
+                f"capture→display p50 {s['latency_p50_ms']:.0f} ms / "
+                f"p95 {s['latency_p95_ms']:.0f} ms")
+
+    def release(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
@@ -0,0 +1,115 @@
+"""
+Cached thumbnails for prediction cards.
+
+st.image(path, width=190) reads the full-resolution original, decodes it,
+resizes and re-encodes it on every rerun. Thumbnails are written once per
+file content (sha256) as JPEGs no wider than the card, which Streamlit then
+ships as-is: it passes through JPEGs that need no resizing but re-encodes
+any other format, so WebP would only move the cost.
+
+Hand-crop previews come from the crop store, keyed by file content and
+detector config.
+"""
+import hashlib
+import os
+
+import cv2
+from PIL import Image
+
+from common.crop_store import get_crop_store
+from common.file_hash import file_sha256
+from common.hand_detectors import get_hand_detector
+from common.prediction_cache import CACHE_DIR
+
+THUMB_DIR = os.path.join(CACHE_DIR, "thumbs")
+# Width of the image column in the prediction cards
+THUMB_WIDTH = 190
+CROP_THUMB_WIDTH = 95
+THUMB_QUALITY = 80
+
+
+def _thumb_path(name):
+    # Two-character shards keep directories small for large folders
+    return os.path.join(THUMB_DIR, name[:2], name)
+
+
+def _write_jpeg(img_bgr, out_path, width, quality):
+    h, w = img_bgr.shape[:2]
+    if w > width:
+        img_bgr = cv2.resize(img_bgr, (width, max(1, round(h * width / w))),
+                             interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", img_bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        return False
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(buf.tobytes())
+    os.replace(tmp, out_path)  # readers never see a partial file
+    return True
+
+
+def _read_reduced(path, width):
+    """Decode at the smallest 1/2, 1/4 or 1/8 scale still at least `width` wide."""
+    try:
+        with Image.open(path) as im:
+            full_width = im.size[0]  # header only, no decode
+    except Exception:
+        return cv2.imread(str(path))
+
+    for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+        if full_width // factor >= width:
+            return cv2.imread(str(path), flag)
+    return cv2.imread(str(path))
+
+
+def thumbnail(path, width=THUMB_WIDTH, quality=THUMB_QUALITY):
+    """Path of a cached JPEG thumbnail of an image file (the original on failure)."""
+    try:
+        out = _thumb_path(f"{file_sha256(path)}_w{width}_q{quality}.jpg")
+    except OSError:
+        return str(path)
+    if os.path.exists(out):
+        return out
+
+    img = _read_reduced(path, width)
+    if img is None or not _write_jpeg(img, out, width, quality):
+        return str(path)
+    return out
+
+
+def crop_thumbnail(path, detector, width=CROP_THUMB_WIDTH, quality=THUMB_QUALITY):
+    """
+    Path of a cached JPEG preview of the hand crop the detector produced for
+    this file, or None when no crop is stored (not run yet, or no hand).
+    """
+    detector_key = detector.cache_key()
+    image_hash = file_sha256(path)
+    key_hash = hashlib.sha256(detector_key.encode()).hexdigest()[:12]
+    out = _thumb_path(f"{image_hash}_crop_{key_hash}_w{width}_q{quality}.jpg")
+    if os.path.exists(out):
+        return out
+
+    store = get_crop_store()
+    record = store.get_many([image_hash], detector_key).get(image_hash)
+    if record is None or not record.hand_detected:
+        return None
+
+    crop = store.read(record)
+    if detector.crop_rgb:
+        crop = cv2.cvtColor(crop, cv2.COLOR_RGB2BGR)
+    return out if _write_jpeg(crop, out, width, quality) else None
+
+
+def hand_preview(result):
+    """Prediction cards: small preview of the detected hand, if the crop store has it."""
+    import streamlit as st
+
+    if not result.get("detector"):
+        return
+    preview = crop_thumbnail(result["path"], get_hand_detector(result["detector"]))
+    if preview:
+        st.image(preview, width=CROP_THUMB_WIDTH, caption="Detected hand")
@@ -0,0 +1,379 @@
+"""
+Offline transcription of recorded videos into timestamped signs.
+
+    python -m common.video_transcription clip.mp4 [more.mp4 ...] --model hog
+                                         [--stride 2] [--output transcripts.jsonl]
+
+Frames are decoded on a background thread; only every `stride`-th frame is
+converted and handed over (SIGN_APP_VIDEO_STRIDE, default 2), the others
+are only grabbed. Each kept frame goes through a MotionGate (the previous
+prediction is reused while the scene holds still, in video time) and the
+chosen pipeline, then through the webcam views' GestureSmoother. Runs of
+the same smoothed sign shorter than --min-duration are dropped, and runs of
+one sign split by such a blip are merged back: by default any gap of up
+to --min-duration between two runs of one sign is closed (--merge-gap).
+Each pipeline owns its hand tracker, reset at the start of every video.
+
+The result per video is a dict with the transcript, the segments
+[{"start", "end", "sign", "confidence", "frames"}] (seconds; confidence in
+percent) and the decode / inference counters, written as one JSON line per
+video. A summary goes to stderr.
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from common.entrypoint import use_installed_streamlit
+from common.gesture_smoother import CAMERA_SMOOTHING, GestureSmoother
+from common.hand_detectors import available_detectors, create_hand_detector
+from common.motion_gate import MotionGate
+
+VIDEO_STRIDE = int(os.environ.get("SIGN_APP_VIDEO_STRIDE", "2"))
+# Shorter runs of one smoothed sign are treated as transitions
+MIN_SIGN_SECONDS = 0.4
+
+VIDEO_SUFFIXES = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
+
+
+# ===========================================
+# DECODING
+# ===========================================
+class VideoFrameReader:
+    """
+    cv2.VideoCapture over a file, decoded on a dedicated thread. Every
+    `stride`-th frame is retrieved and queued as (index, seconds, frame);
+    the frames in between are only grabbed. The bounded queue keeps the
+    decoder at most `buffer` frames ahead of the consumer.
+    """
+
+    def __init__(self, path, stride=VIDEO_STRIDE, buffer=16):
+        self.cap = cv2.VideoCapture(str(path))
+        if not self.cap.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.stride = max(1, int(stride))
+
+        self._queue = queue.Queue(maxsize=buffer)
+        self._stop = threading.Event()
+        self.error = None
+
+        # Counters
+        self.decoded = 0
+        self.retrieved = 0
+
+        self._thread = threading.Thread(target=self._run, name="video-decode", daemon=True)
+        self._thread.start()
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps if self.fps > 0 and self.frame_count > 0 else None
+
+    @property
+    def frame_seconds(self):
+        """Video time between two frames handed over."""
+        return self.stride / self.fps if self.fps > 0 else 0.0
+
+    def _timestamp(self, index):
+        if self.fps > 0:
+            return index / self.fps
+        return self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        index = 0
+        try:
+            while not self._stop.is_set():
+                if index % self.stride:
+                    ok, frame = self.cap.grab(), None
+                else:
+                    ok, frame = self.cap.read()
+                if not ok:
+                    break
+                self.decoded += 1
+                if frame is not None:
+                    self.retrieved += 1
+                    if not self._put((index, self._timestamp(index), frame)):
+                        break
+                index += 1
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(None)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                if self.error:
+                    raise self.error
+                return
+            yield item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ===========================================
+# PIPELINES
+# ===========================================
+def _sigmoid_percent(margin):
+    return 100.0 / (1.0 + np.exp(-margin))
+
+
+class _Pipeline:
+    def __init__(self, detector):
+        # A private backend instance: a tracked hand ROI must not leak into
+        # (or be reset by) another session's stream
+        self.detector = create_hand_detector(detector)
+
+    def reset(self):
+        """Forget state carried between frames: this pipeline's tracked hand ROI."""
+        self.detector.reset()
+
+
+class HOGPipeline(_Pipeline):
+    """frame -> (label, confidence %, decision scores), or None without a hand."""
+
+    def __init__(self, bundle, detector="mediapipe_track"):
+        super().__init__(detector)
+        self.bundle = bundle
+        fused = bundle.get("fused")
+        # Scores are SVM margins; shown as sigmoid(margin) like the webcam view
+        self.smoothing = {
+            "classes": fused["inv_label_map"] if fused else bundle["inv_label_map"],
+            "confidence_fn": _sigmoid_percent,
+        }
+
+    def __call__(self, frame):
+        from HOG_SVM.predict_sign import predict_sign_hog
+
+        b = self.bundle
+        res = predict_sign_hog(frame, b["svm"], b["scaler"], b["selector"], b["inv_label_map"],
+                               b["hog_params"], fused=b.get("fused"), detector=self.detector)
+        if not res or not res["hand_detected"]:
+            return None
+        return res["prediction"], _sigmoid_percent(res["svm_margin"]), res["decision_scores"]
+
+
+class CNNPipeline(_Pipeline):
+    """frame -> (label, confidence %, class probabilities), or None without a hand."""
+
+    def __init__(self, learn, detector="mediapipe_track"):
+        super().__init__(detector)
+        self.learn = learn
+        self.smoothing = {"classes": learn.dls.vocab}
+
+    def __call__(self, frame):
+        from CNN.predict_sign import predict_sign
+
+        res = predict_sign(frame, self.learn, detector=self.detector)
+        # The webcam view classifies the whole frame without a hand; here
+        # that is a pause between signs
+        if not res or not res["hand_detected"]:
+            return None
+        return res["prediction"], res["confidence"] * 100, res["all_probs"]
+
+
+def load_pipeline(model="hog", model_file=None, detector="mediapipe_track"):
+    if model == "hog":
+        from HOG_SVM.fused_classifier import load_hog_bundle
+        from HOG_SVM.hog_bundle import HOG_MODEL_FILE
+        return HOGPipeline(load_hog_bundle(model_file or HOG_MODEL_FILE), detector)
+
+    from CNN.learner import CNN_MODEL_FILE, read_learner
+    return CNNPipeline(read_learner(model_file or CNN_MODEL_FILE), detector)
+
+
+PIPELINES = ("hog", "cnn")
+
+
+# ===========================================
+# SEGMENTS
+# ===========================================
+class SignSegmenter:
+    """Collects the smoothed label of consecutive frames into sign segments."""
+
+    def __init__(self, min_duration=MIN_SIGN_SECONDS, merge_gap=None):
+        """
+        merge_gap: runs of one sign at most this far apart become one segment;
+                   defaults to min_duration, the longest blip that is dropped
+        """
+        self.min_duration = min_duration
+        self.merge_gap = min_duration if merge_gap is None else merge_gap
+        self.segments = []
+        self._current = None
+
+    def update(self, start, end, label, confidence=0.0):
+        """The smoothed label over [start, end) seconds; None = no hand."""
+        current = self._current
+        if current and current["sign"] == label:
+            current["end"] = end
+            current["confidence"] += confidence
+            current["frames"] += 1
+            return
+        self._close()
+        if label is not None:
+            self._current = {"start": start, "end": end, "sign": label,
+                             "confidence": confidence, "frames": 1}
+
+    def _close(self):
+        current, self._current = self._current, None
+        if current is None or current["end"] - current["start"] < self.min_duration:
+            return
+        last = self.segments[-1] if self.segments else None
+        if last and last["sign"] == current["sign"] \
+                and current["start"] - last["end"] <= self.merge_gap:
+            last["end"] = current["end"]
+            last["confidence"] += current["confidence"]
+            last["frames"] += current["frames"]
+        else:
+            self.segments.append(current)
+
+    def finish(self):
+        """Close the open segment; returns the segments with mean confidences."""
+        self._close()
+        return [
+            {"start": round(s["start"], 3), "end": round(s["end"], 3), "sign": str(s["sign"]),
+             "confidence": round(float(s["confidence"]) / s["frames"], 1), "frames": s["frames"]}
+            for s in self.segments
+        ]
+
+
+# ===========================================
+# TRANSCRIPTION
+# ===========================================
+def transcribe_video(path, pipeline, stride=VIDEO_STRIDE, min_duration=MIN_SIGN_SECONDS,
+                     merge_gap=None, motion_threshold=3.0, on_progress=None):
+    """
+    Run `pipeline` over the video at `path`.
+    on_progress(seconds, duration, segments_so_far) is called after every frame.
+    """
+    smoother = GestureSmoother(**pipeline.smoothing, **CAMERA_SMOOTHING)
+    segmenter = SignSegmenter(min_duration, merge_gap)
+    gate = MotionGate(threshold=motion_threshold)
+    processed = hands = 0
+    seconds = 0.0
+    # Don't carry the tracked hand over from the previous video
+    pipeline.reset()
+
+    start = time.perf_counter()
+    try:
+        with VideoFrameReader(path, stride) as reader:
+            step = reader.frame_seconds
+            for _, seconds, frame in reader:
+                out = gate.run(frame, pipeline, now=seconds)
+                processed += 1
+                if out is None:
+                    smoother.clear()
+                    segmenter.update(seconds, seconds + step, None)
+                else:
+                    hands += 1
+                    label, confidence = smoother.push(*out)
+                    segmenter.update(seconds, seconds + step, label, confidence)
+                if on_progress:
+                    on_progress(seconds, reader.duration, segmenter.segments)
+            elapsed = time.perf_counter() - start
+            video_seconds = reader.duration or seconds + step
+            decoded = reader.decoded
+    finally:
+        # Release this pipeline's tracker graph with the video
+        pipeline.reset()
+
+    segments = segmenter.finish()
+    return {
+        "video": str(path),
+        "transcript": " ".join(s["sign"] for s in segments),
+        "segments": segments,
+        "video_s": round(video_seconds, 3),
+        "elapsed_s": round(elapsed, 3),
+        "realtime_factor": round(video_seconds / elapsed, 2) if elapsed > 0 else None,
+        "frames_decoded": decoded,
+        "frames_processed": processed,
+        "frames_inferred": gate.inferred,
+        "frames_with_hand": hands,
+        "stride": max(1, int(stride)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+", help="video files or folders of videos")
+    parser.add_argument("--model", choices=PIPELINES, default="hog")
+    parser.add_argument("--model-file", help="weights to load instead of the default")
+    parser.add_argument("--detector", choices=available_detectors(), default="mediapipe_track")
+    parser.add_argument("--stride", type=int, default=VIDEO_STRIDE,
+                        help="process every N-th frame")
+    parser.add_argument("--min-duration", type=float, default=MIN_SIGN_SECONDS)
+    parser.add_argument("--merge-gap", type=float,
+                        help="merge runs of one sign this close (default: --min-duration)")
+    parser.add_argument("--output", default="-", help="JSONL file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    from pathlib import Path
+
+    videos = []
+    for item in map(Path, args.videos):
+        if item.is_dir():
+            videos += sorted(p for p in item.rglob("*") if p.suffix.lower() in VIDEO_SUFFIXES)
+        else:
+            videos.append(item)
+    if not videos:
+        parser.error("no videos found")
+
+    pipeline = load_pipeline(args.model, args.model_file, args.detector)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    summary = {"videos": 0, "errors": 0, "video_s": 0.0, "elapsed_s": 0.0}
+    try:
+        for video in videos:
+            try:
+                result = transcribe_video(video, pipeline, args.stride,
+                                          args.min_duration, args.merge_gap)
+            except Exception as e:
+                result = {"video": str(video), "error": str(e)}
+                summary["errors"] += 1
+            else:
+                summary["video_s"] += result["video_s"]
+                summary["elapsed_s"] += result["elapsed_s"]
+            summary["videos"] += 1
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if summary["elapsed_s"] > 0:
+        summary["realtime_factor"] = round(summary["video_s"] / summary["elapsed_s"], 2)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Only as a script: the app imports this module, and its sys.path is
+    # not ours to rearrange
+    use_installed_streamlit()
+    main()
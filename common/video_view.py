@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from common.video_transcription import MIN_SIGN_SECONDS, VIDEO_STRIDE, VIDEO_SUFFIXES, \
+    transcribe_video
+from common.warmup import wait_for_warmup
+
+# Seconds between two progress updates sent to the browser
+PROGRESS_EVERY = 0.25
+
+
+def video_transcription(pipeline, key, warmup=None):
+    """
+    Upload a recorded video and transcribe it with `pipeline`
+    (common.video_transcription.HOGPipeline / CNNPipeline).
+    key: prefix of the widget / session keys ("cnn" or "hog")
+    warmup: name of a common.warmup warm-up to wait for before the first frame
+    """
+    st.markdown("### Video Transcription")
+
+    uploaded = st.file_uploader(
+        "Recorded video",
+        type=sorted(s.lstrip(".") for s in VIDEO_SUFFIXES),
+        key=f"{key}_video_file",
+    )
+    col_stride, col_duration = st.columns(2)
+    with col_stride:
+        stride = st.number_input("Process every N-th frame", min_value=1, max_value=30,
+                                 value=VIDEO_STRIDE, key=f"{key}_video_stride")
+    with col_duration:
+        min_duration = st.slider("Minimum sign duration (s)", 0.1, 2.0, MIN_SIGN_SECONDS, 0.1,
+                                 key=f"{key}_video_min_duration")
+
+    result_key = f"{key}_video_result"
+    if uploaded is None:
+        st.info("Upload a video to transcribe it.")
+        st.session_state.pop(result_key, None)
+        return
+
+    if st.button("Transcribe", type="primary", key=f"{key}_video_run"):
+        if warmup:
+            wait_for_warmup(warmup)
+        # OpenCV reads from a path, not from the upload buffer
+        suffix = Path(uploaded.name).suffix or ".mp4"
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(uploaded.getbuffer())
+
+        progress = st.progress(0.0, text="Transcribing...")
+        live = st.empty()
+        last_update = [0.0]
+
+        def on_progress(seconds, duration, segments):
+            now = time.perf_counter()
+            if now - last_update[0] < PROGRESS_EVERY:
+                return
+            last_update[0] = now
+            if duration:
+                progress.progress(min(1.0, seconds / duration),
+                                  text=f"Transcribing... {seconds:.1f} / {duration:.1f} s")
+            live.caption(" ".join(str(s["sign"]) for s in segments) or "—")
+
+        try:
+            st.session_state[result_key] = transcribe_video(
+                tmp.name, pipeline, stride, min_duration, on_progress=on_progress)
+        except Exception as e:
+            st.error(f"Error during transcription: {e}")
+            return
+        finally:
+            os.unlink(tmp.name)
+        progress.empty()
+        live.empty()
+
+    result = st.session_state.get(result_key)
+    if not result:
+        return
+
+    # ============================
+    # Results
+    # ============================
+    st.caption(
+        f"{result['video_s']:.1f} s of video in {result['elapsed_s']:.1f} s "
+        f"({result['realtime_factor']}× real time) · "
+        f"{result['frames_processed']} of {result['frames_decoded']} frames processed, "
+        f"{result['frames_inferred']} inferred"
+    )
+    if not result["segments"]:
+        st.warning("No stable signs found.")
+        return
+
+    st.markdown(f"#### {result['transcript']}")
+    st.dataframe(result["segments"], use_container_width=True)
+    st.download_button(
+        "Download transcript (JSON)",
+        json.dumps(result, ensure_ascii=False, indent=2),
+        file_name=f"{Path(uploaded.name).stem}_transcript.json",
+        mime="application/json",
+        key=f"{key}_video_download",
+    )
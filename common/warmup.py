@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# Set SIGN_APP_WARMUP=0 to disable background warm-up
+WARMUP_ENABLED = os.environ.get("SIGN_APP_WARMUP", "1") != "0"
+
+_threads = {}
+_timings = {}
+_lock = threading.Lock()
+
+
+def synthetic_frame(height=720, width=1280, seed=0):
+    """Deterministic noise frame (BGR uint8) used to exercise a model once."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _run(name, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        print(f"✗ Warm-up '{name}' failed: {e}")
+    _timings[name] = time.perf_counter() - start
+
+
+def start_warmup(name, fn):
+    """
+    Run fn once on a daemon thread (once per process per name), so the first
+    real inference does not pay for lazy initialisation.
+    """
+    if not WARMUP_ENABLED:
+        return
+    with _lock:
+        if name not in _threads:
+            thread = threading.Thread(target=_run, args=(name, fn),
+                                      name=f"warmup-{name}", daemon=True)
+            _threads[name] = thread
+            thread.start()
+
+
+def wait_for_warmup(name, timeout=None):
+    """
+    Block until the warm-up for name has finished. Call before the first
+    inference: models are not safe to run concurrently with their warm-up.
+    """
+    thread = _threads.get(name)
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout)
+
+
+def warmup_timings():
+    """Seconds spent per finished warm-up."""
+    return dict(_timings)
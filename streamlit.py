@@ -1,15 +1,12 @@
 from CNN.components.styled_radio_container import styled_radio_container
 import streamlit as st
-from fastai.vision.all import load_learner
 
 import platform
 import pathlib
 
-from CNN.webcam import webcam
-from CNN.batch_prediction import batch_prediction
-from HOG_SVM.hog_batch_prediction import hog_batch_prediction
-from HOG_SVM.hog_webcam import hog_webcam
-from HOG_SVM.load_hog_model import load_hog_model
+from common.warmup import start_warmup, synthetic_frame, wait_for_warmup
+from CNN.learner import CNN_MODEL_FILE, read_learner
+from CNN.onnx_model import INT8_MODEL_FILE, ONNX_MODEL_FILE
 
 import sys
 
@@ -54,20 +51,70 @@ st.markdown("""
 st.title("Arabic Sign Language Recognition")
 
 # -----------------------------
-# Load CNN model
+# Model loaders (only called for the selected mode)
 # -----------------------------
-MODEL_FILE = "CNN/weights/arabic_sign_resnet342.pkl"
+MODEL_FILE = CNN_MODEL_FILE
+
+# CNN inference backends -> model file (offered when the file exists)
+CNN_BACKENDS = {
+    "fastai (PyTorch)": (CNN_MODEL_FILE, "fastai"),
+    "ONNX Runtime": (ONNX_MODEL_FILE, "onnxruntime"),
+    "ONNX Runtime INT8": (INT8_MODEL_FILE, "onnxruntime"),
+}
+
+
+def available_cnn_backends():
+    import importlib.util
+    from pathlib import Path
+
+    return {
+        name: path for name, (path, module) in CNN_BACKENDS.items()
+        if Path(path).exists() and importlib.util.find_spec(module)
+    }
+
+
+def cnn_warmup_name(path):
+    # One warm-up per weights file: the ONNX / INT8 learners warm up separately
+    return f"cnn:{path}"
+
 
 @st.cache_resource
 def load_model(path):
-    return load_learner(path, cpu=True)
+    # fastai/torch (or onnxruntime) are only imported once the CNN model is actually needed
+    from CNN.predict_sign import predict_crop
+
+    learn = read_learner(path)
+    start_warmup(cnn_warmup_name(path), lambda: predict_crop(synthetic_frame(224, 224), learn))
+    return learn
+
+
+# Hand detector each input mode uses (the webcam views track by default)
+MODE_WARMUP_DETECTORS = {"Batch": "yolo", "Webcam": "mediapipe_track", "Video": "mediapipe_track"}
 
-learn = load_model(MODEL_FILE)
+
+def warm_detector(input_mode_value):
+    """Load & exercise the hand detector the selected input mode uses."""
+    from common.hand_detectors import create_hand_detector, get_hand_detector
+
+    name = MODE_WARMUP_DETECTORS[input_mode_value]
+    frame = synthetic_frame()
+
+    def warm():
+        # Shared backends are warmed in place. A tracker belongs to one stream,
+        # so that one warms MediaPipe (import, model files, delegate set-up)
+        # on a throwaway instance
+        private = name == "mediapipe_track"
+        detector = create_hand_detector(name) if private else get_hand_detector(name)
+        detector.crop(frame)
+        if private:
+            detector.close()
+
+    start_warmup(name, warm)
 
 col1, col2 = st.columns(2)
 
 # -----------------------------
-# Input Mode (Batch / Webcam)
+# Input Mode (Batch / Webcam / Video File)
 # -----------------------------
 folder_icon_svg = """
 <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#00ccff" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
@@ -84,7 +131,7 @@ with col1:
     input_mode = styled_radio_container(
         title="Input Mode",
         icon_svg=folder_icon_svg,
-        options=["Batch Prediction", "Webcam"],
+        options=["Batch Prediction", "Webcam", "Video File"],
         key="input_mode",
     )
 
@@ -106,23 +153,52 @@ st.divider()
 # ======================================================
 
 # Normalize the input_mode to match original logic
-input_mode_value = "Batch" if input_mode == "Batch Prediction" else "Webcam"
+input_mode_value = {"Batch Prediction": "Batch", "Video File": "Video"}.get(input_mode, "Webcam")
 model_mode_value = "CNN" if model_mode == "CNN" else "HOG"
 
+warm_detector(input_mode_value)
+
 if model_mode_value == "CNN":
 
+    backends = available_cnn_backends()
+    if len(backends) > 1:
+        backend = st.selectbox("CNN backend", list(backends), key="cnn_backend")
+        MODEL_FILE = backends[backend]
+
+    # The CNN views wait for this model's warm-up right before their first inference
+    learn = load_model(MODEL_FILE)
+    cnn_warmup = cnn_warmup_name(MODEL_FILE)
+
     if input_mode_value == "Batch":
-        batch_prediction(learn)
+        from CNN.batch_prediction import batch_prediction
+        wait_for_warmup("yolo")
+        batch_prediction(learn, model_file=MODEL_FILE, warmup=cnn_warmup)
 
     elif input_mode_value == "Webcam":
-        webcam(learn)
+        from CNN.webcam import webcam
+        webcam(learn, warmup=cnn_warmup)
+
+    elif input_mode_value == "Video":
+        from common.video_transcription import CNNPipeline
+        from common.video_view import video_transcription
+        video_transcription(CNNPipeline(learn), key="cnn", warmup=cnn_warmup)
 
 elif model_mode_value == "HOG":
 
+    from HOG_SVM.load_hog_model import load_hog_model
+
     hog_bundle = load_hog_model()
     if input_mode_value == "Batch":
+        from HOG_SVM.hog_batch_prediction import hog_batch_prediction
+        wait_for_warmup("yolo")
         hog_batch_prediction(hog_bundle)
 
+    elif input_mode_value == "Video":
+        from common.video_transcription import HOGPipeline
+        from common.video_view import video_transcription
+        video_transcription(HOGPipeline(hog_bundle), key="hog")
+
     else:
+        from HOG_SVM.hog_webcam import hog_webcam
         hog_webcam(hog_bundle)
 
@@ -0,0 +1,5 @@
+# `python -m pytest` puts the repository root first on sys.path, where the
+# app's streamlit.py would shadow the installed package
+from common.entrypoint import use_installed_streamlit
+
+use_installed_streamlit()
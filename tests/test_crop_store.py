@@ -0,0 +1,45 @@
+import multiprocessing
+
+import numpy as np
+
+from common.crop_store import CropStore
+from common.hand_detectors import HandDetection
+
+WRITERS = 4
+CROPS_PER_WRITER = 64
+BATCH = 16
+
+
+def _crop(writer, i):
+    # Different sizes per writer, so misplaced offsets cannot line up by chance
+    return np.full((200 + writer, 150 + i % 7, 3), (writer * CROPS_PER_WRITER + i) % 256,
+                   dtype=np.uint8)
+
+
+def _write(data_path, index_path, writer):
+    store = CropStore(data_path, index_path)
+    for start in range(0, CROPS_PER_WRITER, BATCH):
+        store.put_many([(f"{writer}-{i}", _crop(writer, i), True,
+                         HandDetection((0, 0, 1, 1), 0.9))
+                        for i in range(start, start + BATCH)], "test")
+
+
+def test_concurrent_writers_keep_offsets_consistent(tmp_path):
+    data_path, index_path = str(tmp_path / "crops.bin"), str(tmp_path / "crops.sqlite")
+    CropStore(data_path, index_path)  # create the schema once
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_write, args=(data_path, index_path, w)) for w in range(WRITERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    store = CropStore(data_path, index_path)
+    hashes = [f"{w}-{i}" for w in range(WRITERS) for i in range(CROPS_PER_WRITER)]
+    records = store.get_many(hashes, "test")
+    assert len(records) == len(hashes)
+    for h, record in records.items():
+        writer, i = map(int, h.split("-"))
+        np.testing.assert_array_equal(store.read(record), _crop(writer, i))
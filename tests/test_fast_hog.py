@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from common.entrypoint import REPO_ROOT
+from HOG_SVM.fast_hog import extract_hog_features_batch, extract_hog_features_fast
+from HOG_SVM.hog_bundle import read_hog_bundle
+from HOG_SVM.hog_features import extract_hog_features
+
+HOG_PARAMS = [
+    {"orientations": 9, "pixels_per_cell": (8, 8), "cells_per_block": (3, 3),
+     "block_norm": "L2-Hys"},
+    {"orientations": 12, "pixels_per_cell": (6, 6), "cells_per_block": (2, 2),
+     "block_norm": "L2"},
+    {"orientations": 8, "pixels_per_cell": (8, 4), "cells_per_block": (2, 3),
+     "block_norm": "L1", "transform_sqrt": True},
+    {"orientations": 6, "pixels_per_cell": (10, 10), "cells_per_block": (1, 1),
+     "block_norm": "L1-sqrt"},
+]
+SIZES = [(64, 64), (48, 80), (100, 72)]
+
+
+def random_crops(n, seed=0):
+    # Crops of varying shape, resized to `size` by the extractors
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (rng.integers(24, 200), rng.integers(24, 200), 3),
+                         dtype=np.uint8) for _ in range(n)]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("hog_params", HOG_PARAMS)
+def test_fast_hog_matches_skimage(hog_params, size):
+    crops = random_crops(6)
+    ref = np.stack([extract_hog_features(c, hog_params, size) for c in crops])
+
+    single = np.stack([extract_hog_features_fast(c, hog_params, size) for c in crops])
+    np.testing.assert_allclose(single, ref, rtol=0, atol=1e-6)
+
+    batch = extract_hog_features_batch(crops, hog_params, size)
+    np.testing.assert_allclose(batch, ref, rtol=0, atol=1e-6)
+
+
+def test_fast_hog_matches_skimage_with_the_bundle_params():
+    hog_params = read_hog_bundle(str(REPO_ROOT / "HOG_SVM/weights/svm_hog_selected.pkl"))["hog_params"]
+    crops = random_crops(16, seed=1)
+    ref = np.stack([extract_hog_features(c, hog_params) for c in crops])
+    np.testing.assert_allclose(extract_hog_features_batch(crops, hog_params), ref,
+                               rtol=0, atol=1e-6)
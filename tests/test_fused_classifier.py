@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from common.entrypoint import REPO_ROOT
+from HOG_SVM.fused_classifier import (compile_fused_classifier, fused_decision_function,
+                                      sklearn_decision_function)
+from HOG_SVM.hog_bundle import read_hog_bundle
+from HOG_SVM.hog_features import extract_hog_features
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return read_hog_bundle(str(REPO_ROOT / "HOG_SVM/weights/svm_hog_selected.pkl"))
+
+
+def assert_parity(bundle, feats):
+    fused = compile_fused_classifier(bundle)
+    ref = sklearn_decision_function(bundle, feats)
+    got = fused_decision_function(fused, feats)
+    np.testing.assert_allclose(got, ref, atol=1e-3)
+    np.testing.assert_array_equal(got.argmax(axis=1), ref.argmax(axis=1))
+
+
+def test_parity_on_random_hog_vectors(bundle):
+    rng = np.random.default_rng(0)
+    # L2-Hys normalised HOG values lie in [0, 0.2]-ish
+    feats = rng.uniform(0.0, 0.3, (64, bundle["scaler"].n_features_in_))
+    assert_parity(bundle, feats)
+
+
+def test_parity_on_example_signs(bundle):
+    paths = sorted(Path(REPO_ROOT, "example_signs").glob("*.jpg"))
+    assert paths
+    feats = np.stack([
+        extract_hog_features(cv2.cvtColor(cv2.imread(str(p)), cv2.COLOR_BGR2RGB),
+                             bundle["hog_params"])
+        for p in paths
+    ])
+    assert_parity(bundle, feats)
+
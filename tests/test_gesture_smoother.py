@@ -0,0 +1,25 @@
+import random
+from collections import Counter
+
+import numpy as np
+
+from common.gesture_smoother import CAMERA_SMOOTHING, GestureSmoother
+
+
+def test_camera_default_is_the_original_five_frame_lock():
+    # The list buffer the camera loops kept before the smoother
+    rng = random.Random(0)
+    smoother = GestureSmoother(classes=["a", "b", "c"], **CAMERA_SMOOTHING)
+    buffer = []
+    for _ in range(5000):
+        label, conf = rng.choice("abc"), rng.uniform(0, 100)
+        buffer.append((label, conf))
+        if len(buffer) > 5:
+            buffer.pop(0)
+
+        locked, locked_conf = smoother.push(label, conf, np.zeros(3))
+        counts = Counter(p[0] for p in buffer).most_common()
+        if len(counts) == 1 or counts[0][1] > counts[1][1]:
+            # The old set iteration broke ties arbitrarily
+            assert locked == counts[0][0]
+        assert np.isclose(locked_conf, np.mean([p[1] for p in buffer]))
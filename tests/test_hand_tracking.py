@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from common.hand_detectors import create_hand_detector
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "example_signs"
+
+
+def frames(names):
+    return [cv2.imread(str(EXAMPLES / name)) for name in names]
+
+
+def boxes(detector, images):
+    return [r.best.bbox if r.best else None for r in map(detector.detect, images)]
+
+
+def test_tracking_streams_do_not_share_the_hand_roi():
+    first = frames(["al.jpg"] * 3 + ["aleff.jpg"] * 3)
+    second = frames(["dal.jpg"] * 3 + ["dhad.jpg"] * 3)
+    alone = boxes(create_hand_detector("mediapipe_track"), first)
+    assert any(alone)
+
+    a, b = create_hand_detector("mediapipe_track"), create_hand_detector("mediapipe_track")
+    interleaved = []
+    for frame_a, frame_b in zip(first, second):
+        interleaved.append(boxes(a, [frame_a])[0])
+        b.detect(frame_b)
+    assert interleaved == alone
+
+
+def test_reset_only_drops_its_own_tracker():
+    a, b = create_hand_detector("mediapipe_track"), create_hand_detector("mediapipe_track")
+    image = frames(["al.jpg"])[0]
+    a.detect(image)
+    b.detect(image)
+
+    a.reset()
+    assert a._tracker is None
+    assert b._tracker is not None
+    # The next frame detects from scratch
+    assert a.detect(image).best is not None
+    np.testing.assert_array_equal(a.detect(image).best.bbox, b.detect(image).best.bbox)
@@ -0,0 +1,84 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+from common.entrypoint import REPO_ROOT
+from HOG_SVM import hog_pool
+
+# Run as `streamlit run` does: the installed streamlit is imported first,
+# then the script's folder (the repo root) is put first on sys.path
+SCRIPT = textwrap.dedent("""
+    import json, sys, tempfile
+    from pathlib import Path
+
+    if __name__ != "__main__":
+        # Workers must not re-run the parent's __main__ (the app, under streamlit run)
+        open({marker!r}, "a").write(__name__ + "\\n")
+
+    import streamlit
+
+    sys.path.insert(0, {root!r})
+    from common.crop_store import CropStore
+    from HOG_SVM.fused_classifier import load_hog_bundle
+    from HOG_SVM.hog_pool import predict_files, shutdown_pools
+
+    if __name__ == "__main__":
+        path_before = list(sys.path)
+        paths = sorted(Path({root!r}, "example_signs").glob("*.jpg"))[:8]
+        bundle = load_hog_bundle(str(Path({root!r}, "HOG_SVM/weights/svm_hog_selected.pkl")))
+        with tempfile.TemporaryDirectory() as tmp:
+            results = {{}}
+            for workers in (1, 2):
+                store = CropStore(f"{{tmp}}/crops{{workers}}.bin", f"{{tmp}}/crops{{workers}}.sqlite")
+                results[workers] = predict_files(paths, bundle, "mediapipe", workers,
+                                                 chunk_size=4, store=store)
+            shutdown_pools()
+        results["path_unchanged"] = sys.path == path_before
+        print(json.dumps(results))
+""")
+
+
+def test_pool_with_repo_root_first_on_sys_path(tmp_path):
+    script = tmp_path / "run_pool.py"
+    marker = tmp_path / "reran_main"
+    script.write_text(SCRIPT.format(root=str(REPO_ROOT), marker=str(marker)))
+
+    out = subprocess.run([sys.executable, str(script)], cwd=tmp_path, capture_output=True,
+                         text=True, timeout=300)
+    assert out.returncode == 0, out.stderr[-2000:]
+
+    results = json.loads(out.stdout.strip().splitlines()[-1])
+    serial, pooled = results["1"], results["2"]
+    assert len(pooled) == 8
+    assert pooled == serial
+    assert any(r and r["hand_detected"] for r in pooled)
+    assert results["path_unchanged"]
+    assert not marker.exists()
+
+
+class FakePool:
+    def __init__(self, *args):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def terminate(self):
+        self.closed = True
+
+
+def test_pool_is_replaced_and_closed_when_the_weights_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(hog_pool, "_new_pool", FakePool)
+    monkeypatch.setattr(hog_pool, "_pools", {})
+    weights = tmp_path / "model.pkl"
+    weights.write_bytes(b"old")
+
+    old = hog_pool.get_pool(weights, "mediapipe", 2)
+    assert hog_pool.get_pool(weights, "mediapipe", 2) is old
+
+    weights.write_bytes(b"retrained")
+    new = hog_pool.get_pool(weights, "mediapipe", 2)
+    assert new is not old
+    assert old.closed and not new.closed
+    assert len(hog_pool._pools) == 1
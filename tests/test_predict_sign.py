@@ -0,0 +1,6 @@
+from CNN.predict_sign import predict_sign_batch
+
+
+def test_auto_batch_size_on_empty_input():
+    # Nothing to sample, so no model or detector is touched
+    assert predict_sign_batch([], learn=None, batch_size="auto") == []
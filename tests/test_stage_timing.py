@@ -0,0 +1,46 @@
+import json
+
+from common.stage_timing import StageTimer, timed
+
+
+def run_frame(timer):
+    timer.lap("capture")
+    with timed("detect"):
+        pass
+    with timed("classify"):
+        pass
+    timer.lap("predict")
+    timer.frame_done()
+
+
+def test_trace_file_is_only_open_while_active(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    timer = StageTimer(trace_path=str(trace))
+    assert timer._trace is None
+
+    timer.activate()
+    handle = timer._trace
+    run_frame(timer)
+    timer.deactivate()
+    assert handle.closed and timer._trace is None
+
+    timer.activate()
+    run_frame(timer)
+    timer.deactivate()
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [line["frame"] for line in lines] == [1, 2]
+    assert "detect" in lines[0]["stages_ms"]
+
+
+def test_panel_shows_predict_as_the_total_of_its_nested_stages():
+    timer = StageTimer(trace_path=None)
+    timer.activate()
+    try:
+        run_frame(timer)
+    finally:
+        timer.deactivate()
+
+    labels = [row.split("|")[1].strip() for row in timer.panel_markdown().splitlines()[4:]]
+    at = labels.index("predict (total)")
+    assert sorted(labels[at + 1:at + 3]) == ["↳ classify", "↳ detect"]
+    assert "capture" in labels and "detect" not in labels
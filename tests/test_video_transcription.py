@@ -0,0 +1,36 @@
+import importlib
+import sys
+
+from common import video_transcription
+from common.video_transcription import SignSegmenter
+
+FRAME = 0.05
+
+
+def segment(labels, **kwargs):
+    segmenter = SignSegmenter(**kwargs)
+    for k, label in enumerate(labels):
+        segmenter.update(k * FRAME, (k + 1) * FRAME, label, 50.0)
+    return [(s["sign"], s["start"], s["end"]) for s in segmenter.finish()]
+
+
+def test_blip_just_under_min_duration_is_merged_back():
+    # 0.35 s of B inside A, with the default 0.4 s minimum
+    assert segment(["A"] * 20 + ["B"] * 7 + ["A"] * 20) == [("A", 0.0, 2.35)]
+
+
+def test_signs_held_long_enough_are_kept():
+    assert segment(["A"] * 20 + ["B"] * 10 + ["A"] * 20) == \
+        [("A", 0.0, 1.0), ("B", 1.0, 1.5), ("A", 1.5, 2.5)]
+
+
+def test_pause_longer_than_merge_gap_splits_a_sign():
+    assert segment(["A"] * 20 + [None] * 12 + ["A"] * 20) == [("A", 0.0, 1.0), ("A", 1.6, 2.6)]
+
+
+def test_import_leaves_sys_path_alone(monkeypatch):
+    # streamlit.py imports the module inside the running app server
+    monkeypatch.setattr(sys, "path", ["", *sys.path])
+    before = list(sys.path)
+    importlib.reload(video_transcription)
+    assert sys.path == before